@@ -0,0 +1,38 @@
+"""Create indexing_outbox table
+
+Revision ID: 5a1d2c9e7b40
+Revises: fc7fb8272d56
+Create Date: 2026-10-18 09:12:04.118372
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a1d2c9e7b40'
+down_revision: Union[str, None] = 'fc7fb8272d56'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('indexing_outbox',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('entry_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('available_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['entry_id'], ['journal_entries.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_indexing_outbox_available_at'), 'indexing_outbox', ['available_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_indexing_outbox_available_at'), table_name='indexing_outbox')
+    op.drop_table('indexing_outbox')
@@ -0,0 +1,52 @@
+"""Create indexing_dead_letters table
+
+Revision ID: 6c8e2f4a9d13
+Revises: d41a7c3e5b18
+Create Date: 2026-10-18 21:04:37.512930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c8e2f4a9d13'
+down_revision: Union[str, None] = 'd41a7c3e5b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# OUTBOX_MAX_ATTEMPTS at the time of this migration; outbox rows that used up
+# their attempts used to stay in the outbox and are moved to the new table.
+MAX_ATTEMPTS = 10
+
+
+def upgrade() -> None:
+    op.create_table('indexing_dead_letters',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('entry_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('failed_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['entry_id'], ['journal_entries.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_indexing_dead_letters_entry_id'), 'indexing_dead_letters', ['entry_id'],
+                    unique=False)
+    op.execute(
+        "INSERT INTO indexing_dead_letters (id, entry_id, attempts, last_error) "
+        "SELECT id, entry_id, attempts, last_error FROM indexing_outbox "
+        f"WHERE attempts >= {MAX_ATTEMPTS}"
+    )
+    op.execute(f"DELETE FROM indexing_outbox WHERE attempts >= {MAX_ATTEMPTS}")
+
+
+def downgrade() -> None:
+    op.execute(
+        "INSERT INTO indexing_outbox (id, entry_id, attempts, last_error) "
+        "SELECT id, entry_id, attempts, last_error FROM indexing_dead_letters"
+    )
+    op.drop_index(op.f('ix_indexing_dead_letters_entry_id'), table_name='indexing_dead_letters')
+    op.drop_table('indexing_dead_letters')
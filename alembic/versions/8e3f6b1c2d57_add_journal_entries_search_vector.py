@@ -0,0 +1,39 @@
+"""Add generated search_vector column with GIN index to journal_entries
+
+Revision ID: 8e3f6b1c2d57
+Revises: 5a1d2c9e7b40
+Create Date: 2026-10-18 11:40:52.603118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e3f6b1c2d57'
+down_revision: Union[str, None] = '5a1d2c9e7b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('journal_entries', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(content, ''))",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+    op.create_index('ix_journal_entries_search_vector', 'journal_entries', ['search_vector'],
+                    unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_journal_entries_search_vector', table_name='journal_entries',
+                  postgresql_using='gin')
+    op.drop_column('journal_entries', 'search_vector')
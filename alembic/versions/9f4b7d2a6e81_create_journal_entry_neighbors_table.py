@@ -0,0 +1,47 @@
+"""Create journal_entry_neighbors table and add related_hash to journal_entries
+
+Revision ID: 9f4b7d2a6e81
+Revises: 6c8e2f4a9d13
+Create Date: 2026-10-18 22:41:09.186204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f4b7d2a6e81'
+down_revision: Union[str, None] = '6c8e2f4a9d13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('journal_entry_neighbors',
+    sa.Column('source_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('neighbor_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['source_id'], ['journal_entries.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['neighbor_id'], ['journal_entries.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('source_id', 'neighbor_id')
+    )
+    op.create_index('ix_journal_entry_neighbors_source_id_score', 'journal_entry_neighbors',
+                    ['source_id', 'score'], unique=False)
+    op.create_index(op.f('ix_journal_entry_neighbors_neighbor_id'), 'journal_entry_neighbors',
+                    ['neighbor_id'], unique=False)
+    # Existing rows start without related entries; the first refresh computes them all.
+    op.add_column('journal_entries', sa.Column('related_hash', sa.String(length=64), nullable=True))
+    op.create_index('ix_journal_entries_unrelated', 'journal_entries', ['id'], unique=False,
+                    postgresql_where=sa.text('related_hash IS NULL OR related_hash <> content_hash'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_journal_entries_unrelated', table_name='journal_entries')
+    op.drop_column('journal_entries', 'related_hash')
+    op.drop_index(op.f('ix_journal_entry_neighbors_neighbor_id'), table_name='journal_entry_neighbors')
+    op.drop_index('ix_journal_entry_neighbors_source_id_score', table_name='journal_entry_neighbors')
+    op.drop_table('journal_entry_neighbors')
@@ -0,0 +1,38 @@
+"""Add content_hash, indexed_hash and indexed_at to journal_entries
+
+Revision ID: b27c4e9a1f06
+Revises: 8e3f6b1c2d57
+Create Date: 2026-10-18 13:05:27.441950
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b27c4e9a1f06'
+down_revision: Union[str, None] = '8e3f6b1c2d57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('journal_entries', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.add_column('journal_entries', sa.Column('indexed_hash', sa.String(length=64), nullable=True))
+    op.add_column('journal_entries', sa.Column('indexed_at', sa.DateTime(), nullable=True))
+    # Same digest as backend.models.journal.hash_content. Existing rows start
+    # unindexed, so the first incremental sync sends them once.
+    op.execute(
+        "UPDATE journal_entries SET content_hash = encode(sha256(convert_to(content, 'UTF8')), 'hex')"
+    )
+    op.create_index('ix_journal_entries_unindexed', 'journal_entries', ['id'], unique=False,
+                    postgresql_where=sa.text('indexed_hash IS NULL OR indexed_hash <> content_hash'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_journal_entries_unindexed', table_name='journal_entries')
+    op.drop_column('journal_entries', 'indexed_at')
+    op.drop_column('journal_entries', 'indexed_hash')
+    op.drop_column('journal_entries', 'content_hash')
@@ -0,0 +1,42 @@
+"""Create tags and entry_tags tables
+
+Revision ID: c5e1a8f3b027
+Revises: 9f4b7d2a6e81
+Create Date: 2026-10-18 23:37:52.604118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e1a8f3b027'
+down_revision: Union[str, None] = '9f4b7d2a6e81'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('tags',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_table('entry_tags',
+    sa.Column('entry_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('tag_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['entry_id'], ['journal_entries.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('entry_id', 'tag_id')
+    )
+    op.create_index('ix_entry_tags_tag_id_entry_id', 'entry_tags', ['tag_id', 'entry_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_entry_tags_tag_id_entry_id', table_name='entry_tags')
+    op.drop_table('entry_tags')
+    op.drop_table('tags')
@@ -0,0 +1,34 @@
+"""Add created_at index to journal_entries and journal_activity_daily rollup
+
+Revision ID: d41a7c3e5b18
+Revises: b27c4e9a1f06
+Create Date: 2026-10-18 15:22:09.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41a7c3e5b18'
+down_revision: Union[str, None] = 'b27c4e9a1f06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_journal_entries_created_at_id', 'journal_entries', ['created_at', 'id'],
+                    unique=False)
+    op.create_table('journal_activity_daily',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('entries', sa.Integer(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('day')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('journal_activity_daily')
+    op.drop_index('ix_journal_entries_created_at_id', table_name='journal_entries')
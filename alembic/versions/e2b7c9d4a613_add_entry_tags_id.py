@@ -0,0 +1,34 @@
+"""Add an auto-incremented id to entry_tags
+
+Revision ID: e2b7c9d4a613
+Revises: c5e1a8f3b027
+Create Date: 2026-10-19 10:12:40.318562
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b7c9d4a613'
+down_revision: Union[str, None] = 'c5e1a8f3b027'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The id versions tag membership (backend.models.tags.tag_version_columns);
+    # existing links are numbered as the column is added.
+    op.add_column('entry_tags', sa.Column('id', sa.Integer(), sa.Identity(), nullable=False))
+    op.drop_constraint('entry_tags_pkey', 'entry_tags', type_='primary')
+    op.create_primary_key('entry_tags_pkey', 'entry_tags', ['id'])
+    op.create_unique_constraint('uq_entry_tags_entry_id_tag_id', 'entry_tags', ['entry_id', 'tag_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_entry_tags_entry_id_tag_id', 'entry_tags', type_='unique')
+    op.drop_constraint('entry_tags_pkey', 'entry_tags', type_='primary')
+    op.create_primary_key('entry_tags_pkey', 'entry_tags', ['entry_id', 'tag_id'])
+    op.drop_column('entry_tags', 'id')
@@ -0,0 +1,35 @@
+"""Make journal_entries.created_at NOT NULL
+
+Revision ID: f3a9d6c1b824
+Revises: e2b7c9d4a613
+Create Date: 2026-10-19 14:37:05.204118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a9d6c1b824'
+down_revision: Union[str, None] = 'e2b7c9d4a613'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Entries without a creation time have no keyset position, so pagination
+    # and time ranges skipped them; date them to the migration instead.
+    op.execute("UPDATE journal_entries SET created_at = now() WHERE created_at IS NULL")
+    op.alter_column('journal_entries', 'created_at',
+                    existing_type=sa.DateTime(),
+                    nullable=False,
+                    existing_server_default=sa.text('now()'))
+
+
+def downgrade() -> None:
+    op.alter_column('journal_entries', 'created_at',
+                    existing_type=sa.DateTime(),
+                    nullable=True,
+                    existing_server_default=sa.text('now()'))
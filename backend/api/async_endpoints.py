@@ -0,0 +1,248 @@
+"""
+API endpoints for journal entries (async variant).
+
+This module serves the same routes as backend.api.endpoints, but every route
+is a coroutine that talks to the database through an AsyncSession. Requests
+waiting on the database no longer hold a threadpool slot, so concurrency is
+bound by the connection pool rather than by the threadpool.
+
+It is used when USE_ASYNC_DB is enabled.
+"""
+
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.api.utils import (
+    chunk_errors, chunk_results, entry_response, ingest_bulk, list_item, listing_etag, ndjson_line,
+    not_modified, page_response, parse_entry_id, parse_list_fields, related_item, search_error,
+)
+from backend.api.responses import ORJSONResponse
+from backend.database import async_read_session, get_async_db, get_async_read_db
+from backend.schemas.journal import (
+    ActivityCounts, JournalEntryCreate, JournalEntryListItem, JournalEntryOut, RelatedEntry,
+    SearchResult,
+)
+from backend.services.async_journal_service import (
+    activity_counts,
+    create_journal_entry,
+    bulk_create_journal_entries,
+    collection_version,
+    get_journal_entry,
+    list_journal_entries,
+    iter_journal_entries,
+    related_entries,
+    search_journal_entries,
+)
+from backend.services.weaviate_client import WeaviateError
+
+router = APIRouter()
+
+@router.post("/add_entry/")
+async def add_entry(entry_data: JournalEntryCreate,
+                    db_secondbrain: AsyncSession = Depends(get_async_db)):
+    """
+    Create a new journal entry and enqueue its indexing.
+
+    Args:
+        entry_data (JournalEntryCreate): Data containing title and content for the new entry.
+        db_secondbrain (AsyncSession): Async session instance provided by dependency injection.
+
+    Returns:
+        dict: A dictionary with a success message and the new entry's ID.
+    """
+    entry = await create_journal_entry(db_secondbrain, entry_data.title, entry_data.content)
+
+    return {"message": "Journal entry added!", "id": entry.id}
+
+async def _insert_bulk_chunk(db_secondbrain: AsyncSession, chunk: list) -> list:
+    """Insert one chunk of validated items and return their per-item results."""
+    try:
+        entry_ids = await bulk_create_journal_entries(
+            db_secondbrain, [(item.title, item.content) for _, item in chunk]
+        )
+    except SQLAlchemyError as exc:
+        await db_secondbrain.rollback()
+        return chunk_errors(chunk, exc)
+    return chunk_results(chunk, entry_ids)
+
+@router.post("/entries/bulk", response_class=ORJSONResponse)
+async def add_entries_bulk(request: Request,
+                           db_secondbrain: AsyncSession = Depends(get_async_db)):
+    """
+    Create many journal entries in one request.
+
+    See backend.api.endpoints.add_entries_bulk for the request and response format.
+
+    Args:
+        request (Request): The incoming request carrying the items.
+        db_secondbrain (AsyncSession): Async session instance provided by dependency injection.
+
+    Returns:
+        dict: Counts of inserted and failed items, and per-item results.
+    """
+    return await ingest_bulk(request, lambda chunk: _insert_bulk_chunk(db_secondbrain, chunk))
+
+async def _stream_entries_ndjson(names: tuple, columns: list, since: Optional[datetime] = None,
+                                 until: Optional[datetime] = None, tags: Optional[list] = None):
+    """
+    Yield the requested fields of every journal entry, optionally within a time range, as one NDJSON line.
+
+    The generator owns its session because it runs while the response is
+    being sent, after request-scoped dependencies may have been closed.
+    """
+    async with await async_read_session() as db_secondbrain:
+        async for row in iter_journal_entries(db_secondbrain, since=since, until=until, columns=columns,
+                                              tags=tags):
+            yield ndjson_line(list_item(row, names))
+
+@router.get("/entries/", response_model=list[JournalEntryListItem], response_model_exclude_unset=True)
+async def get_entries(request: Request,
+                      response: Response,
+                      limit: int = Query(100, ge=1, le=1000),
+                      cursor: Optional[str] = None,
+                      since: Optional[datetime] = None,
+                      until: Optional[datetime] = None,
+                      fields: Optional[str] = None,
+                      excerpt_len: Optional[int] = Query(None, ge=1, le=10000),
+                      format: str = Query("json", pattern="^(json|ndjson)$"),
+                      tag: list[str] = Query([]),
+                      db_secondbrain: AsyncSession = Depends(get_async_read_db)):
+    """
+    Retrieve journal entries, one keyset-paginated page at a time.
+
+    See backend.api.endpoints.get_entries for the pagination, time range, tag and NDJSON modes.
+
+    Args:
+        request (Request): The incoming request, checked for ``If-None-Match``.
+        response (Response): Response used to set the pagination and ETag headers.
+        limit (int): Maximum number of entries in the page.
+        cursor (str, optional): Cursor from the previous page's ``X-Next-Cursor`` header.
+        since (datetime, optional): Only entries created at or after this time.
+        until (datetime, optional): Only entries created before this time.
+        fields (str, optional): Comma-separated fields returned per entry, from
+            ``id``, ``title``, ``content`` and ``created_at``; all of them by default.
+        excerpt_len (int, optional): Add an ``excerpt`` of the first excerpt_len characters of the content.
+        format (str): ``json`` for a paginated array, ``ndjson`` for a full stream.
+        tag (list): Only entries carrying every one of these tags.
+        db_secondbrain (AsyncSession): Async session instance provided by dependency injection.
+
+    Returns:
+        list: A page of journal entries, or a streaming NDJSON response.
+    """
+    names, columns = parse_list_fields(fields, excerpt_len)
+    version = await collection_version(db_secondbrain, since, until, tag)
+    etag = listing_etag(request, version)
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged
+    if format == "ndjson":
+        return StreamingResponse(_stream_entries_ndjson(names, columns, since, until, tag),
+                                 media_type="application/x-ndjson", headers={"ETag": etag})
+
+    try:
+        entries, next_cursor = await list_journal_entries(
+            db_secondbrain, limit=limit, cursor=cursor, since=since, until=until, columns=columns,
+            tags=tag,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return page_response(response, entries, next_cursor, etag, names)
+
+@router.get("/stats/activity", response_model=ActivityCounts)
+async def get_activity(bucket: str = Query("day", pattern="^(day|week|month)$"),
+                       since: Optional[datetime] = None,
+                       until: Optional[datetime] = None,
+                       db_secondbrain: AsyncSession = Depends(get_async_read_db)):
+    """
+    Count journal entries per day, week or month.
+
+    See backend.api.endpoints.get_activity for the response format.
+
+    Args:
+        bucket (str): ``day``, ``week`` (starting on Monday) or ``month``.
+        since (datetime, optional): Only entries created at or after this time.
+        until (datetime, optional): Only entries created before this time.
+        db_secondbrain (AsyncSession): Async session instance provided by dependency injection.
+
+    Returns:
+        dict: The bucket size and the ``start`` date and ``count`` of every bucket with entries.
+    """
+    return {"bucket": bucket, "counts": await activity_counts(db_secondbrain, bucket, since, until)}
+
+@router.get("/entries/{entry_id}/", response_model=JournalEntryOut)
+async def get_entry(request: Request, response: Response, entry_id: str,
+                    db_secondbrain: AsyncSession = Depends(get_async_read_db)):
+    """
+    Retrieve a single journal entry by its UUID.
+
+    See backend.api.endpoints.get_entry for the conditional GET support.
+    """
+    entry = await get_journal_entry(db_secondbrain, parse_entry_id(entry_id))
+    return entry_response(request, response, entry)
+
+@router.get("/entries/{entry_id}/related", response_model=list[RelatedEntry],
+            response_model_exclude_unset=True)
+async def get_related_entries(entry_id: str,
+                              limit: Optional[int] = Query(None, ge=1, le=100),
+                              fields: Optional[str] = None,
+                              excerpt_len: Optional[int] = Query(None, ge=1, le=10000),
+                              db_secondbrain: AsyncSession = Depends(get_async_read_db)):
+    """
+    Retrieve the entries related to a journal entry, closest first.
+
+    See backend.api.endpoints.get_related_entries.
+
+    Args:
+        entry_id (str): The UUID of the entry.
+        limit (int, optional): Maximum number of related entries; RELATED_ENTRIES_LIMIT by default.
+        fields (str, optional): Comma-separated fields returned per related entry,
+            as for ``/entries/``; all of them by default.
+        excerpt_len (int, optional): Add an ``excerpt`` of the first excerpt_len characters of the content.
+        db_secondbrain (AsyncSession): Async session instance provided by dependency injection.
+
+    Returns:
+        list: Related entries with their ``score`` and ``entry``; empty until
+        the entry's related entries have been computed.
+    """
+    entry_id = parse_entry_id(entry_id)
+    names, columns = parse_list_fields(fields, excerpt_len)
+    rows = await related_entries(db_secondbrain, entry_id, limit, columns)
+    if not rows and not await get_journal_entry(db_secondbrain, entry_id):
+        raise HTTPException(status_code=404, detail="Entry not found")
+    return [related_item(row, names) for row in rows]
+
+@router.get("/search", response_model=list[SearchResult])
+async def search(q: str = Query(..., min_length=1),
+                 k: int = Query(10, ge=1, le=100),
+                 certainty: Optional[float] = Query(None, ge=0, le=1),
+                 mode: str = Query("semantic", pattern="^(semantic|keyword|hybrid)$"),
+                 tag: list[str] = Query([]),
+                 db_secondbrain: AsyncSession = Depends(get_async_read_db)):
+    """
+    Search journal entries.
+
+    ``semantic`` mode sends one nearText query to Weaviate and loads the top
+    ``k`` entries with a single ``WHERE id IN (...)`` query. ``keyword`` mode
+    runs a Postgres full-text query ranked by ``ts_rank``. ``hybrid`` mode
+    combines both rankings with reciprocal rank fusion. Repeated ``tag``
+    parameters restrict every mode to entries carrying all of those tags.
+
+    Args:
+        q (str): The search text.
+        k (int): Maximum number of results.
+        certainty (float, optional): Minimum certainty of vector search hits.
+        mode (str): ``semantic``, ``keyword`` or ``hybrid``.
+        tag (list): Only entries carrying every one of these tags.
+        db_secondbrain (AsyncSession): Session instance provided by dependency injection.
+
+    Returns:
+        list: Results with ``rank``, ``score`` and ``entry``, best match first.
+    """
+    try:
+        return await search_journal_entries(db_secondbrain, q, k=k, certainty=certainty, mode=mode,
+                                            tags=tag)
+    except WeaviateError as exc:
+        raise search_error(exc)
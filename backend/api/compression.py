@@ -0,0 +1,142 @@
+"""
+Response compression middleware.
+
+This module compresses response bodies with brotli when the client accepts it
+and the optional ``brotli`` package is installed, and with gzip otherwise. Responses smaller than the
+configured threshold, responses that are already encoded, and bodiless
+responses such as ``304 Not Modified`` are sent as they are.
+
+Streamed responses, such as the NDJSON listing, are compressed chunk by chunk
+and flushed after each chunk, so clients still receive lines as they are
+produced.
+"""
+
+import zlib
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli  # Optional dependency, only needed for ``br`` encoding
+except ImportError:
+    brotli = None
+
+
+def accepted_encodings(header: str) -> set:
+    """
+    Parse an Accept-Encoding header into the set of acceptable codings.
+
+    Codings sent with ``q=0`` are refused and left out.
+
+    Args:
+        header (str): The raw header value.
+
+    Returns:
+        set: Lower-cased coding names.
+    """
+    accepted = set()
+    for item in header.split(","):
+        name, _, params = item.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name.strip() and quality > 0:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+class _GzipEncoder:
+    name = "gzip"
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        flush_mode = zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        return self._compressor.compress(data) + self._compressor.flush(flush_mode)
+
+
+class _BrotliEncoder:
+    name = "br"
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        body = self._compressor.process(data)
+        return body + (self._compressor.finish() if final else self._compressor.flush())
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses with brotli or gzip.
+
+    Attributes:
+        minimum_size (int): Bodies smaller than this many bytes are not compressed.
+        gzip_level (int): zlib compression level, 1 to 9.
+        brotli_quality (int): Brotli quality, 0 to 11.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _encoder(self, scope):
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if brotli is not None and "br" in accepted:
+            return lambda: _BrotliEncoder(self.brotli_quality)
+        if "gzip" in accepted:
+            return lambda: _GzipEncoder(self.gzip_level)
+        return None
+
+    async def __call__(self, scope, receive, send):
+        make_encoder = self._encoder(scope) if scope["type"] == "http" else None
+        if make_encoder is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        encoder = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, encoder, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                headers = Headers(raw=message["headers"])
+                passthrough = "content-encoding" in headers or message["status"] in (204, 206, 304)
+                if passthrough:
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoder is None:
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                encoder = make_encoder()
+                headers = MutableHeaders(raw=start_message["headers"])
+                headers["Content-Encoding"] = encoder.name
+                headers.add_vary_header("Accept-Encoding")
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+                body = encoder.compress(body, final=not more_body)
+                if not more_body:
+                    headers["Content-Length"] = str(len(body))
+                await send(start_message)
+            else:
+                body = encoder.compress(body, final=not more_body)
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
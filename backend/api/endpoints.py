@@ -1,34 +1,61 @@
 """
-API endpoints for journal entries.
+API endpoints for journal entries (sync variant).
 
 This module defines endpoints for creating and retrieving journal entries.
-It leverages FastAPI for building the API, SQLAlchemy for database operations,
-and background tasks to asynchronously send new entries for indexing.
+It leverages FastAPI for building the API and SQLAlchemy for database operations.
+New entries are indexed asynchronously by the outbox worker in backend.tasks.worker.
+Listing is keyset-paginated, with an NDJSON mode that streams the whole
+journal from a server-side cursor; both can be restricted to a creation time
+range, and ``/stats/activity`` counts entries per day, week or month.
+
+These routes run in FastAPI's threadpool and are used when USE_ASYNC_DB is
+disabled; backend.api.async_endpoints serves the same routes otherwise.
 """
 
-from fastapi import APIRouter, Depends, BackgroundTasks, HTTPException
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from backend.database import get_db
-from backend.models.journal import JournalEntry
-from backend.schemas.journal import JournalEntryCreate
-from backend.services.weaviate_client import WeaviateClient
-from backend.services.journal_service import create_journal_entry
+from backend.api.utils import (
+    chunk_errors, chunk_results, entry_response, ingest_bulk, list_item, listing_etag, ndjson_line,
+    not_modified, page_response, parse_entry_id, parse_list_fields, related_item, search_error,
+)
+from backend.api.responses import ORJSONResponse
+from backend.database import get_db, get_read_db, read_session
+from backend.schemas.journal import (
+    ActivityCounts, JournalEntryCreate, JournalEntryListItem, JournalEntryOut, RelatedEntry,
+    SearchResult,
+)
+from backend.services.activity import activity_counts
+from backend.services.journal_service import (
+    create_journal_entry,
+    bulk_create_journal_entries,
+    collection_version,
+    get_journal_entry,
+    list_journal_entries,
+    iter_journal_entries,
+    search_journal_entries,
+)
+from backend.services.related import related_entries
+from backend.services.weaviate_client import WeaviateError
 
 router = APIRouter()
 
 @router.post("/add_entry/")
 def add_entry(entry_data: JournalEntryCreate,
-              background_tasks: BackgroundTasks,
               db_secondbrain: Session = Depends(get_db)):
     """
-    Create a new journal entry and schedule its indexing.
+    Create a new journal entry and enqueue its indexing.
 
-    This endpoint creates a new journal entry in the database and schedules
-    a background task to send the entry for indexing via Weaviate.
+    This endpoint creates a new journal entry in the database together with an
+    indexing outbox row. The outbox worker sends the entry to Weaviate, so the
+    request does not wait on Weaviate.
 
     Args:
         entry_data (JournalEntryCreate): Data containing title and content for the new entry.
-        background_tasks (BackgroundTasks): Manager for scheduling background tasks.
         db_secondbrain (Session): SQLAlchemy session instance provided by dependency injection.
 
     Returns:
@@ -36,32 +63,220 @@ def add_entry(entry_data: JournalEntryCreate,
     """
     entry = create_journal_entry(db_secondbrain, entry_data.title, entry_data.content)
 
-    # Schedule the background task for Weaviate indexing.
-    background_tasks.add_task(
-        WeaviateClient.send_entry_to_weaviate, str(entry.id), entry.content
+    return {"message": "Journal entry added!", "id": entry.id}
+
+def _insert_bulk_chunk(db_secondbrain: Session, chunk: list) -> list:
+    """Insert one chunk of validated items and return their per-item results."""
+    try:
+        entry_ids = bulk_create_journal_entries(
+            db_secondbrain, [(item.title, item.content) for _, item in chunk]
+        )
+    except SQLAlchemyError as exc:
+        db_secondbrain.rollback()
+        return chunk_errors(chunk, exc)
+    return chunk_results(chunk, entry_ids)
+
+@router.post("/entries/bulk", response_class=ORJSONResponse)
+async def add_entries_bulk(request: Request, db_secondbrain: Session = Depends(get_db)):
+    """
+    Create many journal entries in one request.
+
+    The body is either a JSON array of ``{"title", "content"}`` objects or an
+    NDJSON stream of them. Valid items are inserted with multi-row inserts in
+    chunks of settings.BULK_INSERT_CHUNK_SIZE and enqueued for batched
+    indexing. Invalid items are reported without failing the rest.
+
+    Args:
+        request (Request): The incoming request carrying the items.
+        db_secondbrain (Session): SQLAlchemy session instance provided by dependency injection.
+
+    Returns:
+        dict: Counts of inserted and failed items, and per-item ``id`` or ``error``
+        results ordered by their index in the input.
+    """
+    return await ingest_bulk(
+        request, lambda chunk: run_in_threadpool(_insert_bulk_chunk, db_secondbrain, chunk)
     )
 
-    return {"message": "Journal entry added!", "id": entry.id}
+def _stream_entries_ndjson(names: tuple, columns: list, since: Optional[datetime] = None,
+                           until: Optional[datetime] = None, tags: Optional[list] = None):
+    """
+    Yield the requested fields of every journal entry, optionally within a time range, as one NDJSON line.
+
+    The generator owns its session because it runs while the response is
+    being sent, after request-scoped dependencies may have been closed.
+    """
+    db_secondbrain = read_session()
+    try:
+        for row in iter_journal_entries(db_secondbrain, since=since, until=until, columns=columns,
+                                        tags=tags):
+            yield ndjson_line(list_item(row, names))
+    finally:
+        db_secondbrain.close()
 
-@router.get("/entries/")
-def get_entries(db_secondbrain: Session = Depends(get_db)):
+@router.get("/entries/", response_model=list[JournalEntryListItem], response_model_exclude_unset=True)
+def get_entries(request: Request,
+                response: Response,
+                limit: int = Query(100, ge=1, le=1000),
+                cursor: Optional[str] = None,
+                since: Optional[datetime] = None,
+                until: Optional[datetime] = None,
+                fields: Optional[str] = None,
+                excerpt_len: Optional[int] = Query(None, ge=1, le=10000),
+                format: str = Query("json", pattern="^(json|ndjson)$"),
+                tag: list[str] = Query([]),
+                db_secondbrain: Session = Depends(get_read_db)):
     """
-    Retrieve all journal entries.
+    Retrieve journal entries, one keyset-paginated page at a time.
+
+    Entries are ordered by (created_at, id). When more entries follow, the
+    cursor for the next page is returned in the ``X-Next-Cursor`` header.
+    With ``format=ndjson`` the whole journal is streamed instead, one entry
+    per line, and ``limit`` and ``cursor`` are ignored. ``since`` and
+    ``until`` restrict both modes to entries created in ``[since, until)``;
+    timezone-aware values are converted to UTC. ``fields`` and ``excerpt_len``
+    choose what each entry carries, and only those columns are selected, with
+    the excerpt cut in SQL, so listing views never fetch full content.
+    Repeated ``tag`` parameters keep only entries carrying all of those tags,
+    looked up through the tag index.
+
+    Both modes carry an ``ETag`` derived from the newest ``created_at`` and
+    the entry count of the range, plus the query; a request whose
+    ``If-None-Match`` still matches gets an empty ``304 Not Modified``
+    without any entries being read.
 
     Args:
+        request (Request): The incoming request, checked for ``If-None-Match``.
+        response (Response): Response used to set the pagination and ETag headers.
+        limit (int): Maximum number of entries in the page.
+        cursor (str, optional): Cursor from the previous page's ``X-Next-Cursor`` header.
+        since (datetime, optional): Only entries created at or after this time.
+        until (datetime, optional): Only entries created before this time.
+        fields (str, optional): Comma-separated fields returned per entry, from
+            ``id``, ``title``, ``content`` and ``created_at``; all of them by default.
+        excerpt_len (int, optional): Add an ``excerpt`` of the first excerpt_len characters of the content.
+        format (str): ``json`` for a paginated array, ``ndjson`` for a full stream.
+        tag (list): Only entries carrying every one of these tags.
         db_secondbrain (Session): SQLAlchemy session instance provided by dependency injection.
 
     Returns:
-        list: A list of all journal entries from the database.
+        list: A page of journal entries, or a streaming NDJSON response.
     """
-    return db_secondbrain.query(JournalEntry).all()
+    names, columns = parse_list_fields(fields, excerpt_len)
+    version = collection_version(db_secondbrain, since, until, tag)
+    etag = listing_etag(request, version)
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged
+    if format == "ndjson":
+        return StreamingResponse(_stream_entries_ndjson(names, columns, since, until, tag),
+                                 media_type="application/x-ndjson", headers={"ETag": etag})
 
-@router.get("/entries/{entry_id}/")
-def get_entry(entry_id: str, db_secondbrain: Session = Depends(get_db)):
+    try:
+        entries, next_cursor = list_journal_entries(
+            db_secondbrain, limit=limit, cursor=cursor, since=since, until=until, columns=columns,
+            tags=tag,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return page_response(response, entries, next_cursor, etag, names)
+
+@router.get("/stats/activity", response_model=ActivityCounts)
+def get_activity(bucket: str = Query("day", pattern="^(day|week|month)$"),
+                 since: Optional[datetime] = None,
+                 until: Optional[datetime] = None,
+                 db_secondbrain: Session = Depends(get_read_db)):
+    """
+    Count journal entries per day, week or month.
+
+    The counts are computed in SQL, so timeline views no longer need to fetch
+    the whole journal.
+
+    Args:
+        bucket (str): ``day``, ``week`` (starting on Monday) or ``month``.
+        since (datetime, optional): Only entries created at or after this time.
+        until (datetime, optional): Only entries created before this time.
+        db_secondbrain (Session): SQLAlchemy session instance provided by dependency injection.
+
+    Returns:
+        dict: The bucket size and the ``start`` date and ``count`` of every
+        bucket with entries, oldest first.
+    """
+    return {"bucket": bucket, "counts": activity_counts(db_secondbrain, bucket, since, until)}
+
+@router.get("/entries/{entry_id}/", response_model=JournalEntryOut)
+def get_entry(request: Request, response: Response, entry_id: str,
+              db_secondbrain: Session = Depends(get_read_db)):
     """
     Retrieve a single journal entry by its UUID.
+
+    The response carries an ``ETag``; a request whose ``If-None-Match``
+    still matches it gets an empty ``304 Not Modified``.
+    """
+    entry = get_journal_entry(db_secondbrain, parse_entry_id(entry_id))
+    return entry_response(request, response, entry)
+
+@router.get("/entries/{entry_id}/related", response_model=list[RelatedEntry],
+            response_model_exclude_unset=True)
+def get_related_entries(entry_id: str,
+                        limit: Optional[int] = Query(None, ge=1, le=100),
+                        fields: Optional[str] = None,
+                        excerpt_len: Optional[int] = Query(None, ge=1, le=10000),
+                        db_secondbrain: Session = Depends(get_read_db)):
+    """
+    Retrieve the entries related to a journal entry, closest first.
+
+    Related entries are precomputed by backend.services.related, so this runs
+    one query on the neighbours table's (source_id, score) index and no
+    vector search.
+
+    Args:
+        entry_id (str): The UUID of the entry.
+        limit (int, optional): Maximum number of related entries; RELATED_ENTRIES_LIMIT by default.
+        fields (str, optional): Comma-separated fields returned per related entry,
+            as for ``/entries/``; all of them by default.
+        excerpt_len (int, optional): Add an ``excerpt`` of the first excerpt_len characters of the content.
+        db_secondbrain (Session): Session instance provided by dependency injection.
+
+    Returns:
+        list: Related entries with their ``score`` and ``entry``; empty until
+        the entry's related entries have been computed.
     """
-    entry = db_secondbrain.query(JournalEntry).filter(JournalEntry.id == entry_id).first()
-    if not entry:
+    entry_id = parse_entry_id(entry_id)
+    names, columns = parse_list_fields(fields, excerpt_len)
+    rows = related_entries(db_secondbrain, entry_id, limit, columns)
+    if not rows and not get_journal_entry(db_secondbrain, entry_id):
         raise HTTPException(status_code=404, detail="Entry not found")
-    return entry
+    return [related_item(row, names) for row in rows]
+
+@router.get("/search", response_model=list[SearchResult])
+def search(q: str = Query(..., min_length=1),
+           k: int = Query(10, ge=1, le=100),
+           certainty: Optional[float] = Query(None, ge=0, le=1),
+           mode: str = Query("semantic", pattern="^(semantic|keyword|hybrid)$"),
+           tag: list[str] = Query([]),
+           db_secondbrain: Session = Depends(get_read_db)):
+    """
+    Search journal entries.
+
+    ``semantic`` mode sends one nearText query to Weaviate and loads the top
+    ``k`` entries with a single ``WHERE id IN (...)`` query. ``keyword`` mode
+    runs a Postgres full-text query ranked by ``ts_rank``. ``hybrid`` mode
+    combines both rankings with reciprocal rank fusion. Repeated ``tag``
+    parameters restrict every mode to entries carrying all of those tags.
+
+    Args:
+        q (str): The search text.
+        k (int): Maximum number of results.
+        certainty (float, optional): Minimum certainty of vector search hits.
+        mode (str): ``semantic``, ``keyword`` or ``hybrid``.
+        tag (list): Only entries carrying every one of these tags.
+        db_secondbrain (Session): Session instance provided by dependency injection.
+
+    Returns:
+        list: Results with ``rank``, ``score`` and ``entry``, best match first.
+    """
+    try:
+        return search_journal_entries(db_secondbrain, q, k=k, certainty=certainty, mode=mode, tags=tag)
+    except WeaviateError as exc:
+        raise search_error(exc)
@@ -0,0 +1,103 @@
+"""
+Monitoring endpoints.
+
+This module defines endpoints that report on the running service rather than
+on journal data, such as the cache hit and miss counters and the Prometheus
+metrics. The same router is mounted for the sync and async paths; ``/metrics``
+reads the indexing backlog through the sync engine, at most once every
+settings.METRICS_QUERY_TTL seconds.
+"""
+
+from fastapi import APIRouter, Response
+from sqlalchemy import func, select
+from backend.api.responses import ORJSONResponse
+from backend.core.config import settings
+from backend.database import (
+    SessionLocal, engine, async_engine, replica_engine, async_replica_engine, replica_health,
+)
+from backend.models.journal import JournalEntry, unindexed_filter
+from backend.models.outbox import IndexingDeadLetter, IndexingOutbox
+from backend.services.cache import get_cache
+from backend.services.metrics import CONTENT_TYPE, Gauge, render
+from backend.services.weaviate_client import weaviate_breaker
+
+router = APIRouter()
+
+
+def _pool_checked_out():
+    """Yield the connections currently checked out of each engine's pool."""
+    engines = {"sync": engine}
+    if async_engine is not None:
+        engines["async"] = async_engine.sync_engine
+    if replica_engine is not None:
+        engines["replica"] = replica_engine
+    if async_replica_engine is not None:
+        engines["async_replica"] = async_replica_engine.sync_engine
+    for name, bound_engine in engines.items():
+        checkedout = getattr(bound_engine.pool, "checkedout", None)
+        if checkedout is not None:
+            yield {"engine": name}, checkedout()
+
+
+def _outbox_jobs():
+    """Yield the number of indexing jobs per state, with one aggregate query; ``failed`` jobs are dead letters."""
+    max_attempts = settings.OUTBOX_MAX_ATTEMPTS
+    with SessionLocal() as db_session:
+        pending, retrying, failed = db_session.execute(
+            select(
+                func.count().filter(IndexingOutbox.attempts == 0),
+                func.count().filter(IndexingOutbox.attempts > 0, IndexingOutbox.attempts < max_attempts),
+                func.count().filter(IndexingOutbox.attempts >= max_attempts)
+                + select(func.count()).select_from(IndexingDeadLetter).scalar_subquery(),
+            )
+        ).one()
+    yield {"state": "pending"}, pending
+    yield {"state": "retrying"}, retrying
+    yield {"state": "failed"}, failed
+
+
+def _unindexed_entries():
+    """Yield the number of entries whose vector is missing or stale."""
+    with SessionLocal() as db_session:
+        yield {}, db_session.execute(
+            select(func.count()).select_from(JournalEntry).where(unindexed_filter())
+        ).scalar_one()
+
+
+Gauge("db_pool_checked_out_connections", "Database connections currently checked out.",
+      ("engine",), collect=_pool_checked_out)
+Gauge("db_replica_healthy", "1 while reads are routed to the read replica, 0 while they use the primary.",
+      collect=lambda: [({}, int(replica_health.healthy))] if replica_engine is not None else [])
+Gauge("indexing_outbox_jobs", "Indexing jobs, by state; failed jobs are in the dead-letter table.",
+      ("state",), collect=_outbox_jobs, ttl=settings.METRICS_QUERY_TTL)
+Gauge("weaviate_circuit_open", "1 while the Weaviate circuit breaker is open or probing, 0 while it is closed.",
+      collect=lambda: [({}, int(weaviate_breaker.state != weaviate_breaker.CLOSED))])
+Gauge("journal_entries_unindexed", "Journal entries whose vector is missing or stale.",
+      collect=_unindexed_entries, ttl=settings.METRICS_QUERY_TTL)
+
+
+@router.get("/cache/stats", response_class=ORJSONResponse)
+def cache_stats():
+    """
+    Report cache hit and miss counters.
+
+    Returns:
+        dict: The cache backend and, per namespace (``entry``, ``search``),
+        the number of hits, misses and the hit ratio.
+    """
+    return {"backend": settings.CACHE_BACKEND, "namespaces": get_cache().stats()}
+
+
+@router.get("/metrics")
+def metrics():
+    """
+    Expose the service metrics in the Prometheus text format.
+
+    Includes per-route request latency, SQL statement timings, pool checkout
+    waits, connection hold times, opened and checked-out connections, Weaviate
+    latency and failures, indexing retries, and the indexing backlog.
+
+    Returns:
+        Response: The exposition document.
+    """
+    return Response(render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,18 @@
+"""
+Response classes for the API routers.
+
+Routes with a typed response model are serialised by pydantic straight to JSON
+bytes. Routes that return plain dicts and lists, such as the bulk ingest
+results and the monitoring reports, use ORJSONResponse instead of the standard
+library encoder.
+"""
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,253 @@
+"""
+Shared helpers for the API routers.
+
+This module holds request parsing and serialisation helpers used by both the
+sync endpoints in backend.api.endpoints and the async endpoints in
+backend.api.async_endpoints, so the two routers behave identically.
+"""
+
+import hashlib
+import json
+import uuid
+from typing import Optional
+from fastapi import HTTPException, Request, Response
+from pydantic import ValidationError
+from backend.core.config import settings
+from backend.schemas.journal import JournalEntryCreate, JournalEntryListItem
+from backend.services.journal_service import LIST_FIELDS, entry_columns
+from backend.services.weaviate_client import WeaviateError
+
+
+def parse_entry_id(entry_id: str) -> uuid.UUID:
+    """
+    Parse an entry UUID from a path parameter.
+
+    Args:
+        entry_id (str): The raw path parameter.
+
+    Returns:
+        uuid.UUID: The parsed UUID.
+
+    Raises:
+        HTTPException: 404 if the value is not a UUID, since no entry can match it.
+    """
+    try:
+        return uuid.UUID(entry_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Entry not found")
+
+
+def make_etag(*parts) -> str:
+    """
+    Build a weak ETag from the values a response depends on.
+
+    The tag is weak because the same representation may be sent with
+    different content encodings.
+
+    Args:
+        *parts: Values identifying the response, such as a collection version and query.
+
+    Returns:
+        str: The quoted ETag header value.
+    """
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+
+def entry_etag(entry: dict) -> str:
+    """Build the ETag of a serialised journal entry."""
+    return make_etag(entry["id"], entry["created_at"], entry["title"], entry["content"])
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """
+    Answer a conditional GET whose ``If-None-Match`` matches the current ETag.
+
+    Args:
+        request (Request): The incoming request.
+        etag (str): The ETag of the current representation.
+
+    Returns:
+        Response: An empty ``304 Not Modified`` response, or None when the
+        client's copy is missing or stale and the full response must be sent.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    current = etag.removeprefix("W/")
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    if "*" in tags or current in tags:
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+
+def listing_etag(request: Request, version) -> str:
+    """Build the ETag of a listing from its collection version and query parameters."""
+    return make_etag(version, sorted(request.query_params.multi_items()))
+
+
+def entry_response(request: Request, response: Response, entry: Optional[dict]):
+    """
+    Answer a single-entry GET.
+
+    Args:
+        request (Request): The incoming request, checked for ``If-None-Match``.
+        response (Response): Response used to set the ETag header.
+        entry (dict, optional): The serialised entry, or None when it does not exist.
+
+    Returns:
+        The entry with its ETag set, or an empty ``304 Not Modified`` response.
+
+    Raises:
+        HTTPException: 404 if the entry does not exist.
+    """
+    if not entry:
+        raise HTTPException(status_code=404, detail="Entry not found")
+    etag = entry_etag(entry)
+    unchanged = not_modified(request, etag)
+    if unchanged:
+        return unchanged
+    response.headers["ETag"] = etag
+    return entry
+
+
+def page_response(response: Response, entries: list, next_cursor: Optional[str], etag: str,
+                  names) -> list:
+    """Set the pagination and ETag headers of a listing page and build its items."""
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    response.headers["ETag"] = etag
+    return [list_item(row, names) for row in entries]
+
+
+def search_error(exc: WeaviateError) -> HTTPException:
+    """Map a failed vector search to 503 while Weaviate is down or its circuit is open, 502 otherwise."""
+    return HTTPException(status_code=503 if exc.retryable else 502, detail=str(exc))
+
+
+def parse_list_fields(fields: Optional[str], excerpt_len: Optional[int]):
+    """
+    Parse the ``fields`` and ``excerpt_len`` listing parameters.
+
+    Args:
+        fields (str, optional): Comma-separated names from LIST_FIELDS; all of them when omitted.
+        excerpt_len (int, optional): Length of the ``excerpt`` added to each entry.
+
+    Returns:
+        tuple: The names returned for each entry and the columns to select.
+
+    Raises:
+        HTTPException: 400 if a field name is unknown.
+    """
+    names = tuple(name.strip() for name in fields.split(",") if name.strip()) if fields else LIST_FIELDS
+    try:
+        columns = entry_columns(names, excerpt_len)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if excerpt_len:
+        names += ("excerpt",)
+    return names, columns
+
+
+def list_item(row, names) -> JournalEntryListItem:
+    """Build the listing item of a projected row, setting only the requested fields."""
+    mapping = row._mapping
+    return JournalEntryListItem.model_validate({name: mapping[name] for name in names})
+
+
+def related_item(row, names) -> dict:
+    """Build a related entry of a projected row: its ``score`` and the requested entry fields."""
+    return {"score": row.score, "entry": list_item(row, names)}
+
+
+def ndjson_line(item: JournalEntryListItem) -> str:
+    """Serialise one listing item as an NDJSON line, without the fields left unset."""
+    return item.model_dump_json(exclude_unset=True) + "\n"
+
+
+async def iter_bulk_items(request: Request):
+    """
+    Yield raw bulk items from a JSON array or a streamed NDJSON body.
+
+    NDJSON bodies (``Content-Type: application/x-ndjson``) are parsed line by
+    line as they arrive, so the whole upload is never held in memory.
+    """
+    if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield line
+        if buffer.strip():
+            yield buffer
+        return
+
+    try:
+        items = json.loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    for item in items:
+        yield item
+
+
+def parse_bulk_item(item) -> JournalEntryCreate:
+    """Validate one bulk item, given as an NDJSON line or a decoded JSON value."""
+    if isinstance(item, bytes):
+        return JournalEntryCreate.model_validate_json(item)
+    return JournalEntryCreate.model_validate(item)
+
+
+def format_validation_error(exc: ValidationError) -> str:
+    """Flatten a pydantic ValidationError into a single readable message."""
+    messages = []
+    for err in exc.errors():
+        location = ".".join(str(loc) for loc in err["loc"])
+        messages.append(f"{location}: {err['msg']}" if location else err["msg"])
+    return "; ".join(messages)
+
+
+async def ingest_bulk(request: Request, insert_chunk) -> dict:
+    """
+    Validate bulk items and insert the valid ones chunk by chunk.
+
+    Args:
+        request (Request): The incoming request carrying the items.
+        insert_chunk: Async callable taking a list of (index, JournalEntryCreate)
+            pairs and returning their per-item results.
+
+    Returns:
+        dict: Counts of inserted and failed items, and per-item ``id`` or ``error``
+        results ordered by their index in the input.
+    """
+    results = []
+    chunk = []
+    index = 0
+    async for raw_item in iter_bulk_items(request):
+        try:
+            chunk.append((index, parse_bulk_item(raw_item)))
+        except ValidationError as exc:
+            results.append({"index": index, "error": format_validation_error(exc)})
+        index += 1
+        if len(chunk) >= settings.BULK_INSERT_CHUNK_SIZE:
+            results.extend(await insert_chunk(chunk))
+            chunk = []
+    if chunk:
+        results.extend(await insert_chunk(chunk))
+
+    results.sort(key=lambda result: result["index"])
+    failed = sum(1 for result in results if "error" in result)
+    return {"inserted": len(results) - failed, "failed": failed, "results": results}
+
+
+def chunk_results(chunk: list, entry_ids: list) -> list:
+    """Pair the items of an inserted chunk with their new entry ids."""
+    return [{"index": index, "id": str(entry_id)} for (index, _), entry_id in zip(chunk, entry_ids)]
+
+
+def chunk_errors(chunk: list, exc: Exception) -> list:
+    """Report every item of a chunk whose insert failed."""
+    return [{"index": index, "error": str(exc.__cause__ or exc)} for index, _ in chunk]
@@ -4,15 +4,217 @@ Database session management module.
 This module creates a SQLAlchemy engine and sessionmaker based on the
 configured DATABASE_URL, and provides a generator function to obtain
 a database session that is properly closed after use.
+
+When USE_ASYNC_DB is enabled it also creates an AsyncEngine, with an async
+driver URL derived from DATABASE_URL, and an async session generator used by
+the async API endpoints. The sync engine is always available for the worker,
+scripts and the sync endpoints.
+
+When DATABASE_REPLICA_URL is set, matching replica engines serve the read-only
+endpoints through get_read_db / get_async_read_db. Reads fall back to the
+primary while the replica is unreachable or lags more than DB_REPLICA_MAX_LAG.
+Pool size, overflow, pre-ping and statement timeout apply to every engine.
+
+All engines report SQL statement timings, pool checkout waits and
+connection hold times to backend.services.metrics.
 """
 
-from sqlalchemy import create_engine
+import logging
+import threading
+import time
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.ext.declarative import declarative_base
 from backend.core.config import settings
+from backend.services.metrics import instrument_engine, timed_pool_class
+
+logger = logging.getLogger(__name__)
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+# Seconds the replica trails the primary; 0 when it has replayed everything it received.
+REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+def engine_options(url: str, name: str, replica: bool = False) -> dict:
+    """
+    Build the create_engine keyword arguments for a database URL from settings.
+
+    Every engine gets its dialect's default pool class, timing checkouts
+    (timed_pool_class). Pool sizing and the statement timeout only apply to
+    PostgreSQL; SQLite keeps SQLAlchemy's defaults.
+
+    Args:
+        url (str): The database URL, sync or async.
+        name (str): The ``engine`` label of the pool's metrics.
+        replica (bool, optional): Use the replica pool sizes. Defaults to False.
+
+    Returns:
+        dict: Keyword arguments for create_engine / create_async_engine.
+    """
+    database_url = make_url(url)
+    pool_class = database_url.get_dialect().get_pool_class(database_url)
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING, "poolclass": timed_pool_class(pool_class, name)}
+    if database_url.get_backend_name() != "postgresql":
+        return options
+    pool_size, max_overflow = settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+    if replica:
+        pool_size = settings.DB_REPLICA_POOL_SIZE or pool_size
+        if settings.DB_REPLICA_MAX_OVERFLOW is not None:
+            max_overflow = settings.DB_REPLICA_MAX_OVERFLOW
+    options.update(pool_size=pool_size, max_overflow=max_overflow)
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        if database_url.get_driver_name() == "asyncpg":
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+def async_database_url(url: str) -> str:
+    """
+    Derive the async driver URL for a sync database URL.
+
+    For example ``postgresql://user:pw@host/db`` becomes
+    ``postgresql+asyncpg://user:pw@host/db``.
+
+    Args:
+        url (str): The sync database URL.
 
-engine = create_engine(settings.DATABASE_URL)
+    Returns:
+        str: The same URL using an async driver.
+    """
+    sync_url = make_url(url)
+    drivername = ASYNC_DRIVERS.get(sync_url.get_backend_name(), sync_url.drivername)
+    return sync_url.set(drivername=drivername).render_as_string(hide_password=False)
+
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL, "sync"))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+instrument_engine(engine, "sync")
+
+if settings.USE_ASYNC_DB:
+    _async_url = async_database_url(settings.DATABASE_URL)
+    async_engine = create_async_engine(_async_url, **engine_options(_async_url, "async"))
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    instrument_engine(async_engine.sync_engine, "async")
+else:
+    async_engine = None
+    AsyncSessionLocal = None
+
+replica_engine = None
+ReplicaSessionLocal = None
+async_replica_engine = None
+AsyncReplicaSessionLocal = None
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_engine(
+        settings.DATABASE_REPLICA_URL,
+        **engine_options(settings.DATABASE_REPLICA_URL, "replica", replica=True),
+    )
+    ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    instrument_engine(replica_engine, "replica")
+    if settings.USE_ASYNC_DB:
+        _async_replica_url = async_database_url(settings.DATABASE_REPLICA_URL)
+        async_replica_engine = create_async_engine(
+            _async_replica_url, **engine_options(_async_replica_url, "async_replica", replica=True)
+        )
+        AsyncReplicaSessionLocal = async_sessionmaker(
+            async_replica_engine, autoflush=False, expire_on_commit=False
+        )
+        instrument_engine(async_replica_engine.sync_engine, "async_replica")
+
+class ReplicaHealth:
+    """
+    Cached verdict on whether reads may go to the replica.
+
+    The replica is checked at most once per ``interval`` seconds; requests in
+    between reuse the last verdict, so health checks add no per-request cost.
+
+    Attributes:
+        max_lag (float): Replication lag, in seconds, beyond which the replica is not used.
+        interval (float): Seconds a check result is reused.
+    """
+
+    def __init__(self, max_lag: float = None, interval: float = None):
+        self.max_lag = settings.DB_REPLICA_MAX_LAG if max_lag is None else max_lag
+        self.interval = settings.DB_REPLICA_CHECK_INTERVAL if interval is None else interval
+        self.healthy = True
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def claim_check(self) -> bool:
+        """Return True if the caller should run a check now; only one caller per interval does."""
+        with self._lock:
+            now = time.monotonic()
+            if self._checked_at is not None and now - self._checked_at < self.interval:
+                return False
+            self._checked_at = now
+            return True
+
+    def record(self, lag: float = None, error: Exception = None):
+        """
+        Record the outcome of a check.
+
+        Args:
+            lag (float, optional): The measured lag in seconds.
+            error (Exception, optional): The error raised by the check, if it failed.
+        """
+        healthy = error is None and (lag or 0.0) <= self.max_lag
+        if healthy != self.healthy:
+            if healthy:
+                logger.info("Read replica is healthy again; routing reads to it")
+            elif error is not None:
+                logger.warning("Read replica unavailable, reading from the primary: %s", error)
+            else:
+                logger.warning("Read replica lags %.1fs, reading from the primary", lag)
+        self.healthy = healthy
+
+replica_health = ReplicaHealth()
+
+def _lag_statement(bind):
+    """Return the lag query for a replica's dialect; non-PostgreSQL replicas report no lag."""
+    return REPLICA_LAG_SQL if bind.dialect.name == "postgresql" else text("SELECT 0")
+
+def read_session():
+    """
+    Open a session for read-only queries.
+
+    Returns:
+        Session: A replica session while the replica is healthy, a primary session otherwise.
+    """
+    if ReplicaSessionLocal is None:
+        return SessionLocal()
+    if replica_health.claim_check():
+        try:
+            with replica_engine.connect() as connection:
+                replica_health.record(lag=float(connection.execute(_lag_statement(replica_engine)).scalar() or 0))
+        except Exception as excep:  # Any failure to reach the replica means reading from the primary
+            replica_health.record(error=excep)
+    return ReplicaSessionLocal() if replica_health.healthy else SessionLocal()
+
+async def async_read_session():
+    """
+    Open an async session for read-only queries.
+
+    Returns:
+        AsyncSession: A replica session while the replica is healthy, a primary session otherwise.
+    """
+    if AsyncReplicaSessionLocal is None:
+        return AsyncSessionLocal()
+    if replica_health.claim_check():
+        try:
+            async with async_replica_engine.connect() as connection:
+                lag = (await connection.execute(_lag_statement(async_replica_engine))).scalar()
+            replica_health.record(lag=float(lag or 0))
+        except Exception as excep:  # Any failure to reach the replica means reading from the primary
+            replica_health.record(error=excep)
+    return AsyncReplicaSessionLocal() if replica_health.healthy else AsyncSessionLocal()
 
 def get_db():
     """
@@ -30,3 +232,41 @@ def get_db():
         yield db_secondbrain
     finally:
         db_secondbrain.close()
+
+def get_read_db():
+    """
+    Yield a SQLAlchemy session for read-only endpoints.
+
+    The session is bound to the read replica when one is configured and
+    healthy, and to the primary otherwise.
+
+    Yields:
+        Session: A SQLAlchemy session instance.
+    """
+    db_secondbrain = read_session()
+    try:
+        yield db_secondbrain
+    finally:
+        db_secondbrain.close()
+
+async def get_async_db():
+    """
+    Yield a SQLAlchemy async database session.
+
+    The session is closed automatically when the calling context is exited.
+
+    Yields:
+        AsyncSession: A SQLAlchemy async session instance.
+    """
+    async with AsyncSessionLocal() as db_secondbrain:
+        yield db_secondbrain
+
+async def get_async_read_db():
+    """
+    Yield a SQLAlchemy async session for read-only endpoints, replica first.
+
+    Yields:
+        AsyncSession: A SQLAlchemy async session instance.
+    """
+    async with await async_read_session() as db_secondbrain:
+        yield db_secondbrain
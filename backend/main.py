@@ -4,20 +4,62 @@ Main application entry point.
 This module initializes the FastAPI application, configures the database,
 and includes API endpoints. During the startup event, the module creates
 all the necessary database tables as defined by the SQLAlchemy models.
+A middleware records the latency of every request per route for ``/metrics``,
+and responses above COMPRESSION_MINIMUM_SIZE are compressed with brotli or gzip.
 
 Modules:
     - backend.database: Provides the SQLAlchemy engine and Base for model metadata.
-    - backend.api.endpoints: Contains the API endpoint routes.
+    - backend.api.endpoints: Contains the sync API endpoint routes.
+    - backend.api.async_endpoints: Contains the async API endpoint routes, used
+      instead of the sync ones when USE_ASYNC_DB is enabled.
+    - backend.api.monitoring: Contains service monitoring routes such as cache statistics
+      and Prometheus metrics.
     - backend.core.config: Application configuration settings.
     - backend.models.journal: Defines the journal model used in the application.
 """
 
-from fastapi import FastAPI
-from backend.database import engine
+import time
+from fastapi import FastAPI, Request
+from backend.core.config import settings
+from backend.database import engine, async_engine, async_replica_engine
 from backend.models import Base
-from backend.api.endpoints import router
+from backend.api import endpoints, async_endpoints, monitoring
+from backend.api.compression import CompressionMiddleware
+from backend.services.metrics import HTTP_REQUEST_DURATION
+from backend.services.weaviate_client import WeaviateClient, AsyncWeaviateClient
 
 app = FastAPI()
+if settings.COMPRESSION_MINIMUM_SIZE > 0:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """
+    Record the latency of each request, labelled by its route template.
+
+    Requests that match no route share one label, so unknown paths cannot
+    grow the number of series. For streamed responses the time is measured
+    until the headers are sent.
+    """
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        HTTP_REQUEST_DURATION.observe(
+            time.perf_counter() - start,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=status,
+        )
 
 @app.on_event("startup")
 def startup():
@@ -30,4 +72,20 @@ def startup():
     """
     Base.metadata.create_all(bind=engine)
 
-app.include_router(router)
+@app.on_event("shutdown")
+async def shutdown():
+    """
+    Shutdown event handler for FastAPI.
+
+    Closes the pooled Weaviate connections held by the sync and async clients
+    and disposes of the async database engines.
+    """
+    WeaviateClient.close()
+    await AsyncWeaviateClient.close()
+    if async_engine is not None:
+        await async_engine.dispose()
+    if async_replica_engine is not None:
+        await async_replica_engine.dispose()
+
+app.include_router(async_endpoints.router if settings.USE_ASYNC_DB else endpoints.router)
+app.include_router(monitoring.router)
@@ -2,10 +2,15 @@
 Models package.
 
 This package contains all ORM models for the application. It re-exports
-the Base declarative class and the JournalEntry model for easy import.
+the Base declarative class and the application models for easy import.
 """
 
 from .base import Base
 from .journal import JournalEntry
+from .outbox import IndexingOutbox, IndexingDeadLetter
+from .activity import JournalActivityDaily
+from .neighbors import JournalEntryNeighbor
+from .tags import Tag, EntryTag
 
-__all__ = ["Base", "JournalEntry"]
+__all__ = ["Base", "JournalEntry", "IndexingOutbox", "IndexingDeadLetter", "JournalActivityDaily",
+           "JournalEntryNeighbor", "Tag", "EntryTag"]
@@ -0,0 +1,25 @@
+"""
+Activity rollup model.
+
+This module defines the JournalActivityDaily class, an ORM model for the daily
+entry counts that /stats/activity can be served from instead of scanning
+``journal_entries``. Rows are recomputed from the last few days onwards by
+backend.services.activity.refresh_activity_rollup, so a refresh only touches
+recent entries.
+"""
+
+from sqlalchemy import Column, Date, DateTime, Integer, func
+from .base import Base
+
+class JournalActivityDaily(Base):
+    """
+    ORM model for the number of journal entries created on one day.
+    Attributes:
+	    day (date): Primary key, the day the entries were created on.
+	    entries (int): Number of entries created that day.
+	    refreshed_at (datetime): When the row was last recomputed.
+    """
+    __tablename__ = "journal_activity_daily"
+    day = Column(Date, primary_key=True, nullable=False)
+    entries = Column(Integer, nullable=False)
+    refreshed_at = Column(DateTime, default=func.now(), server_default=func.now())
@@ -4,13 +4,47 @@ Journal model.
 This module defines the JournalEntry class, an ORM model for storing
 journal entries in the database. Each journal entry includes an auto-incremented
 ID, title, content, and a timestamp indicating when the entry was created.
+
+On PostgreSQL the table also carries a generated ``search_vector`` tsvector column
+over title and content, with a GIN index, used for keyword search. It is added
+with DDL rather than mapped, so it is never loaded with entries and other
+databases can still create the table.
+
+``content_hash`` is the SHA-256 of the content and ``indexed_hash`` the hash of
+the content last written to the vector store, so entries whose vectors are
+stale can be found through a partial index without re-embedding the journal.
+``related_hash`` is likewise the hash of the content the entry's precomputed
+related entries were last computed for.
+
+The B-tree index on (created_at, id) serves both time-range filters and the
+keyset order used for pagination. created_at is NOT NULL, so every entry has a
+keyset position and a row comparison never skips one. SQLite stores it as text
+to the second, as its CURRENT_TIMESTAMP default writes it, and bound values are
+rendered the same way, so comparing the strings compares the times.
 """
 
+import hashlib
 import uuid
-from sqlalchemy import Column, Integer, String, Text, DateTime, func
+from sqlalchemy import DDL, Column, Index, Integer, String, Text, DateTime, event, func, or_
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.dialects.postgresql import UUID
 from .base import Base
 
+SEARCH_CONFIG = "english"
+
+# The text format of SQLite's CURRENT_TIMESTAMP, without the microseconds
+# SQLAlchemy would otherwise append to bound values.
+SQLITE_TIMESTAMP = sqlite.DATETIME(
+    storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+)
+
+def hash_content(content: str) -> str:
+    """Return the hex SHA-256 of an entry's content, as stored in content_hash."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+def _default_content_hash(context) -> str:
+    return hash_content(context.get_current_parameters()["content"])
+
 class JournalEntry(Base):
     """
     ORM model for a journal entry.
@@ -19,9 +53,70 @@ class JournalEntry(Base):
 	    content (str): The textual content of the journal entry.
 	    title (str): The title of the journal entry.
 	    created_at (datetime): The timestamp when the entry was created.
+	    content_hash (str): SHA-256 of the content, set on insert.
+	    indexed_hash (str): content_hash of the content last indexed in the vector store.
+	    indexed_at (datetime): When the entry was last indexed in the vector store.
+	    related_hash (str): content_hash of the content its related entries were computed for.
     """
     __tablename__ = "journal_entries"
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True, nullable=False)
     content = Column(Text, nullable=False)
     title = Column(String, nullable=False)
-    created_at = Column(DateTime, default=func.now(), server_default=func.now())
+    created_at = Column(DateTime().with_variant(SQLITE_TIMESTAMP, "sqlite"), nullable=False, default=func.now(), server_default=func.now())
+    content_hash = Column(String(64), nullable=True, default=_default_content_hash)
+    indexed_hash = Column(String(64), nullable=True)
+    indexed_at = Column(DateTime, nullable=True)
+    related_hash = Column(String(64), nullable=True)
+
+    __table_args__ = (
+        Index("ix_journal_entries_created_at_id", "created_at", "id"),
+        Index(
+            "ix_journal_entries_unindexed",
+            "id",
+            postgresql_where=or_(indexed_hash.is_(None), indexed_hash != content_hash),
+            sqlite_where=or_(indexed_hash.is_(None), indexed_hash != content_hash),
+        ),
+        Index(
+            "ix_journal_entries_unrelated",
+            "id",
+            postgresql_where=or_(related_hash.is_(None), related_hash != content_hash),
+            sqlite_where=or_(related_hash.is_(None), related_hash != content_hash),
+        ),
+    )
+
+def unindexed_filter():
+    """
+    Return the condition matching entries whose vector is missing or stale.
+
+    It is the predicate of the ``ix_journal_entries_unindexed`` partial index,
+    so queries filtering on it can use the index.
+    """
+    return or_(JournalEntry.indexed_hash.is_(None),
+               JournalEntry.indexed_hash != JournalEntry.content_hash)
+
+def unrelated_filter():
+    """
+    Return the condition matching entries whose related entries are missing or stale.
+
+    It is the predicate of the ``ix_journal_entries_unrelated`` partial index.
+    """
+    return or_(JournalEntry.related_hash.is_(None),
+               JournalEntry.related_hash != JournalEntry.content_hash)
+
+event.listen(
+    JournalEntry.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE journal_entries ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('{SEARCH_CONFIG}', "
+        "coalesce(title, '') || ' ' || coalesce(content, ''))) STORED"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    JournalEntry.__table__,
+    "after_create",
+    DDL(
+        "CREATE INDEX IF NOT EXISTS ix_journal_entries_search_vector "
+        "ON journal_entries USING gin (search_vector)"
+    ).execute_if(dialect="postgresql"),
+)
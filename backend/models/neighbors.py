@@ -0,0 +1,33 @@
+"""
+Related entries model.
+
+This module defines the JournalEntryNeighbor class, an ORM model for the
+precomputed nearest neighbours of each journal entry. Rows are written by
+backend.services.related.refresh_related_entries, so "related entries" are
+read with one indexed query instead of a vector search per page view.
+"""
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, func
+from sqlalchemy.dialects.postgresql import UUID
+from .base import Base
+
+class JournalEntryNeighbor(Base):
+    """
+    ORM model for one precomputed neighbour of a journal entry.
+    Attributes:
+	    source_id (uuid): The journal entry the neighbour belongs to.
+	    neighbor_id (uuid): The related journal entry.
+	    score (float): The vector store certainty of the pair, in [0, 1].
+	    computed_at (datetime): When the pair was last computed.
+    """
+    __tablename__ = "journal_entry_neighbors"
+    source_id = Column(UUID(as_uuid=True), ForeignKey("journal_entries.id", ondelete="CASCADE"),
+                       primary_key=True, nullable=False)
+    neighbor_id = Column(UUID(as_uuid=True), ForeignKey("journal_entries.id", ondelete="CASCADE"),
+                         primary_key=True, nullable=False, index=True)
+    score = Column(Float, nullable=False)
+    computed_at = Column(DateTime, default=func.now(), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_journal_entry_neighbors_source_id_score", "source_id", "score"),
+    )
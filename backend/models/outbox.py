@@ -0,0 +1,54 @@
+"""
+Indexing outbox models.
+
+This module defines the IndexingOutbox class, an ORM model for the transactional
+outbox that records journal entries waiting to be indexed into Weaviate. A row is
+written in the same transaction as its JournalEntry, and deleted by the worker
+once the entry has been indexed.
+
+Jobs that fail permanently, or run out of attempts, are moved to
+IndexingDeadLetter, where they wait to be inspected and replayed.
+"""
+
+import uuid
+from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey, func
+from sqlalchemy.dialects.postgresql import UUID
+from .base import Base
+
+class IndexingOutbox(Base):
+    """
+    ORM model for a pending indexing job.
+    Attributes:
+	    id (uuid): Primary key.
+	    entry_id (uuid): The journal entry to index.
+	    attempts (int): Number of failed indexing attempts so far.
+	    last_error (str): The error message of the last failed attempt.
+	    available_at (datetime): Earliest time the job may be claimed again.
+	    created_at (datetime): The timestamp when the job was enqueued.
+    """
+    __tablename__ = "indexing_outbox"
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
+    entry_id = Column(UUID(as_uuid=True), ForeignKey("journal_entries.id", ondelete="CASCADE"), nullable=False)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    last_error = Column(Text, nullable=True)
+    available_at = Column(DateTime, nullable=False, default=func.now(), server_default=func.now(), index=True)
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
+
+
+class IndexingDeadLetter(Base):
+    """
+    ORM model for an indexing job that was given up on.
+    Attributes:
+	    id (uuid): Primary key.
+	    entry_id (uuid): The journal entry that could not be indexed.
+	    attempts (int): Number of failed indexing attempts.
+	    last_error (str): The error message of the last failed attempt.
+	    failed_at (datetime): The timestamp when the job was given up on.
+    """
+    __tablename__ = "indexing_dead_letters"
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
+    entry_id = Column(UUID(as_uuid=True), ForeignKey("journal_entries.id", ondelete="CASCADE"),
+                      nullable=False, index=True)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    last_error = Column(Text, nullable=True)
+    failed_at = Column(DateTime, nullable=False, default=func.now(), server_default=func.now())
@@ -0,0 +1,105 @@
+"""
+Tag models.
+
+This module defines the Tag and EntryTag classes, ORM models for the tags
+extracted from journal entries (backend.services.tagging). Tag names are
+stored once in ``tags``; ``entry_tags`` links entries to them, with an index
+on (tag_id, entry_id) so filtering entries by tag is an index lookup rather
+than a scan of the journal.
+
+Links are only inserted and deleted, never updated, and each new link gets a
+higher ``id`` than any before it; on SQLite the table is declared AUTOINCREMENT
+for that, as SQLite otherwise reuses the id of a deleted newest link. So the count and the sum of the ids of a
+tag's links change whenever its entries do, which makes them a version of the
+tag's membership (tag_version_columns).
+"""
+
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, UniqueConstraint, func, select
+from sqlalchemy.dialects.postgresql import UUID
+from .base import Base
+from .journal import JournalEntry
+
+MAX_TAG_LENGTH = 64
+
+def normalize_tag(name: str) -> str:
+    """Return the stored form of a tag name: lowercase, without ``#`` or surrounding spaces."""
+    return name.strip().lstrip("#").strip().lower()[:MAX_TAG_LENGTH]
+
+def normalize_tags(tags) -> list:
+    """Normalise tag names with normalize_tag, dropping empty and repeated ones."""
+    return list(dict.fromkeys(name for name in (normalize_tag(tag) for tag in tags or []) if name))
+
+class Tag(Base):
+    """
+    ORM model for a tag name.
+    Attributes:
+	    id (int): Primary key, auto-incremented.
+	    name (str): The normalised tag name, unique.
+    """
+    __tablename__ = "tags"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(MAX_TAG_LENGTH), nullable=False, unique=True)
+
+class EntryTag(Base):
+    """
+    ORM model linking a journal entry to one of its tags.
+    Attributes:
+	    id (int): Primary key, auto-incremented, so newer links have higher ids.
+	    entry_id (uuid): The tagged journal entry.
+	    tag_id (int): The tag.
+    """
+    __tablename__ = "entry_tags"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    entry_id = Column(UUID(as_uuid=True), ForeignKey("journal_entries.id", ondelete="CASCADE"), nullable=False)
+    tag_id = Column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("entry_id", "tag_id", name="uq_entry_tags_entry_id_tag_id"),
+        Index("ix_entry_tags_tag_id_entry_id", "tag_id", "entry_id"),
+        {"sqlite_autoincrement": True},
+    )
+
+def tagged_filter(tags) -> list:
+    """
+    Return the conditions matching entries that carry every one of the given tags.
+
+    Each tag is one ``id IN (...)`` semi-join answered from the unique tag
+    name index and the (tag_id, entry_id) index.
+
+    Args:
+        tags (iterable): Tag names; they are normalised.
+
+    Returns:
+        list: Conditions on JournalEntry, to be combined with AND.
+    """
+    return [
+        JournalEntry.id.in_(
+            select(EntryTag.entry_id).join(Tag, Tag.id == EntryTag.tag_id).where(Tag.name == name)
+        )
+        for name in normalize_tags(tags)
+    ]
+
+
+def tag_version_columns(tags) -> list:
+    """
+    Return scalar subqueries versioning the membership of the given tags.
+
+    Between two reads, removed links had ids up to the highest id of the
+    first read, and added links have higher ids. So if as many links were
+    added as removed, the sum of ids still grows, and the (count, sum) pair
+    changes whenever any of the tags gains or loses an entry.
+
+    Args:
+        tags (iterable): Tag names; they are normalised.
+
+    Returns:
+        list: The count and the sum of the ids of the tags' links; empty without tags.
+    """
+    names = normalize_tags(tags)
+    if not names:
+        return []
+    links = select(EntryTag.id).join(Tag, Tag.id == EntryTag.tag_id).where(Tag.name.in_(names)).subquery()
+    return [
+        select(func.count()).select_from(links).scalar_subquery(),
+        select(func.coalesce(func.sum(links.c.id), 0)).scalar_subquery(),
+    ]
@@ -1,10 +1,14 @@
 """
 Schemas for journal entries.
 
-This module defines the data models for journal entry operations.
+This module defines the data models for journal entry operations, and the
+response models the API serialises entries through.
 """
 
-from pydantic import BaseModel
+import uuid
+from datetime import date, datetime
+from typing import Optional
+from pydantic import BaseModel, ConfigDict
 
 class JournalEntryCreate(BaseModel):
     """
@@ -16,3 +20,87 @@ class JournalEntryCreate(BaseModel):
     """
     title: str
     content: str
+
+class JournalEntryOut(BaseModel):
+    """
+    Schema of a full journal entry in responses.
+
+    Attributes:
+        id (uuid.UUID): The UUID of the journal entry.
+        title (str): The title of the journal entry.
+        content (str): The content of the journal entry.
+        created_at (datetime): The timestamp when the entry was created.
+    """
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    title: str
+    content: str
+    created_at: Optional[datetime] = None
+
+class JournalEntryListItem(BaseModel):
+    """
+    Schema of a journal entry in listings, holding only the requested fields.
+
+    Fields that were not requested are left unset and omitted from responses.
+
+    Attributes:
+        id (uuid.UUID): The UUID of the journal entry.
+        title (str): The title of the journal entry.
+        content (str): The content of the journal entry.
+        created_at (datetime): The timestamp when the entry was created.
+        excerpt (str): The first characters of the content.
+    """
+    model_config = ConfigDict(from_attributes=True)
+
+    id: Optional[uuid.UUID] = None
+    title: Optional[str] = None
+    content: Optional[str] = None
+    created_at: Optional[datetime] = None
+    excerpt: Optional[str] = None
+
+class SearchResult(BaseModel):
+    """
+    Schema of one search hit.
+
+    Attributes:
+        rank (int): The 1-based position of the hit.
+        score (float): The certainty, ``ts_rank`` or fused score, depending on the mode.
+        entry (JournalEntryOut): The matching journal entry.
+    """
+    rank: int
+    score: float
+    entry: JournalEntryOut
+
+class RelatedEntry(BaseModel):
+    """
+    Schema of one related entry.
+
+    Attributes:
+        score (float): The vector store certainty of the pair, in [0, 1].
+        entry (JournalEntryListItem): The related journal entry, with the requested fields.
+    """
+    score: float
+    entry: JournalEntryListItem
+
+class ActivityBucket(BaseModel):
+    """
+    Schema of the entry count of one day, week or month.
+
+    Attributes:
+        start (date): The first day of the bucket.
+        count (int): The number of entries created in the bucket.
+    """
+    start: date
+    count: int
+
+class ActivityCounts(BaseModel):
+    """
+    Schema of the activity report.
+
+    Attributes:
+        bucket (str): The bucket size, ``day``, ``week`` or ``month``.
+        counts (list): The buckets with entries, oldest first.
+    """
+    bucket: str
+    counts: list[ActivityBucket]
@@ -0,0 +1,243 @@
+"""
+Activity module.
+
+This module counts journal entries per day, week or month for
+``/stats/activity``. The counts are computed in SQL, with ``date_trunc`` on
+PostgreSQL and the equivalent ``date()`` / ``strftime()`` calls on SQLite,
+and only the time range asked for is scanned through the (created_at, id)
+index.
+
+With ACTIVITY_ROLLUP enabled, whole days before the newest day of the
+``journal_activity_daily`` rollup are read from the rollup instead of from
+``journal_entries``, and only the days after it are counted live. The rollup
+is refreshed incrementally: each refresh recomputes the last
+ACTIVITY_ROLLUP_SETTLE_DAYS days up to today and leaves older days alone,
+which also picks up entries committed late, just after midnight.
+
+Refresh it periodically, for example from cron, with:
+
+    python -m backend.services.activity [--full]
+"""
+
+import argparse
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import Date, DateTime, cast, delete, func, insert, literal_column, or_, select
+from backend.core.config import settings
+from backend.database import SessionLocal
+from backend.models.activity import JournalActivityDaily
+from backend.models.journal import JournalEntry
+from backend.services.journal_service import created_between, naive_utc
+from backend.services.plans import run_plan
+
+BUCKETS = ("day", "week", "month")
+
+
+def bucket_start(dialect_name: str, bucket: str, column):
+    """
+    Build the SQL expression truncating a timestamp or date column to its bucket.
+
+    Weeks start on Monday, as with PostgreSQL's ``date_trunc('week', ...)``.
+
+    Args:
+        dialect_name (str): The SQLAlchemy dialect name of the session's bind.
+        bucket (str): ``day``, ``week`` or ``month``.
+        column: The column or expression to truncate.
+
+    Returns:
+        ColumnElement: The start of the bucket containing the column's value.
+
+    Raises:
+        ValueError: If bucket is not one of BUCKETS.
+    """
+    if bucket not in BUCKETS:
+        raise ValueError(f"Unknown activity bucket: {bucket}")
+    # The unit is inlined so GROUP BY repeats the exact same expression.
+    if dialect_name == "postgresql":
+        return func.date_trunc(literal_column(f"'{bucket}'"), cast(column, DateTime))
+    if bucket == "week":
+        return func.date(column, literal_column("'weekday 0'"), literal_column("'-6 days'"))
+    if bucket == "month":
+        return func.strftime(literal_column("'%Y-%m-01'"), column)
+    return func.date(column)
+
+
+def day_of(dialect_name: str, column):
+    """Build the SQL expression of the calendar day of a timestamp column."""
+    return cast(column, Date) if dialect_name == "postgresql" else func.date(column)
+
+
+def bucket_label(value) -> str:
+    """Return the ISO date of a bucket start, as returned by either dialect."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()[:10]
+    return str(value)[:10]
+
+
+def midnight(day: date) -> datetime:
+    """Return the first instant of a day, comparable with created_at."""
+    return datetime.combine(day, time())
+
+
+def rollup_days(newest_day: date, since: datetime = None, until: datetime = None):
+    """
+    Choose the whole days of a time range that are answered from the rollup.
+
+    The newest rollup day may still be growing, so only days before it are
+    used, and a day is only used if the range covers all of it.
+
+    Args:
+        newest_day (date): The newest day in the rollup.
+        since (datetime, optional): Inclusive lower bound of the range.
+        until (datetime, optional): Exclusive upper bound of the range.
+
+    Returns:
+        tuple: The [first, end) days read from the rollup, first being None
+        when unbounded, or None when no whole day qualifies.
+    """
+    first = None
+    if since is not None:
+        first = since.date() if since == midnight(since.date()) else since.date() + timedelta(days=1)
+    end = newest_day if until is None else min(newest_day, until.date())
+    if first is not None and first >= end:
+        return None
+    return first, end
+
+
+def activity_statements(dialect_name: str, bucket: str, since: datetime = None,
+                        until: datetime = None, days=None) -> list:
+    """
+    Build the statements counting entries per bucket.
+
+    Args:
+        dialect_name (str): The SQLAlchemy dialect name of the session's bind.
+        bucket (str): ``day``, ``week`` or ``month``.
+        since (datetime, optional): Only entries created at or after this time.
+        until (datetime, optional): Only entries created before this time.
+        days (tuple, optional): The [first, end) days read from the rollup, from rollup_days.
+
+    Returns:
+        list: Statements yielding (bucket start, count) rows; counts of the
+        same bucket from different statements must be added up.
+    """
+    since, until = naive_utc(since), naive_utc(until)
+    start = bucket_start(dialect_name, bucket, JournalEntry.created_at)
+    live = select(start, func.count()).where(*created_between(since, until))
+    if days is None:
+        return [live.group_by(start)]
+
+    first, end = days
+    outside = JournalEntry.created_at >= midnight(end)
+    if first is not None:
+        outside = or_(JournalEntry.created_at < midnight(first), outside)
+    rolled_start = bucket_start(dialect_name, bucket, JournalActivityDaily.day)
+    rolled = select(rolled_start, func.sum(JournalActivityDaily.entries)).where(
+        JournalActivityDaily.day < end
+    )
+    if first is not None:
+        rolled = rolled.where(JournalActivityDaily.day >= first)
+    return [live.where(outside).group_by(start), rolled.group_by(rolled_start)]
+
+
+def merge_counts(row_sets) -> list:
+    """
+    Add up (bucket start, count) rows into one ordered series.
+
+    Args:
+        row_sets (iterable): Row lists returned by the activity statements.
+
+    Returns:
+        list: Dicts with the bucket ``start`` date and its ``count``, oldest first.
+    """
+    counts = {}
+    for rows in row_sets:
+        for start, count in rows:
+            label = bucket_label(start)
+            counts[label] = counts.get(label, 0) + int(count or 0)
+    return [{"start": start, "count": counts[start]} for start in sorted(counts)]
+
+
+def newest_rollup_day_statement():
+    """Return the statement selecting the newest day in the rollup."""
+    return select(func.max(JournalActivityDaily.day))
+
+
+def activity_counts(db_session, bucket: str = "day", since: datetime = None, until: datetime = None,
+                    use_rollup: bool = None) -> list:
+    """
+    Count journal entries per day, week or month.
+
+    Args:
+        db_session: The database session used for the queries.
+        bucket (str, optional): ``day``, ``week`` or ``month``. Defaults to ``day``.
+        since (datetime, optional): Only entries created at or after this time.
+        until (datetime, optional): Only entries created before this time.
+        use_rollup (bool, optional): Read whole past days from the rollup.
+            Defaults to settings.ACTIVITY_ROLLUP.
+
+    Returns:
+        list: Dicts with the bucket ``start`` date and its ``count``, oldest
+        first; buckets without entries are omitted.
+
+    Raises:
+        ValueError: If bucket is not one of BUCKETS.
+    """
+    dialect_name = db_session.get_bind().dialect.name
+    return run_plan(db_session, activity_counts_plan(dialect_name, bucket, since, until, use_rollup))
+
+
+def activity_counts_plan(dialect_name: str, bucket: str = "day", since: datetime = None,
+                         until: datetime = None, use_rollup: bool = None):
+    """Plan of activity_counts, for a session of the given SQLAlchemy dialect."""
+    use_rollup = settings.ACTIVITY_ROLLUP if use_rollup is None else use_rollup
+    days = None
+    if use_rollup:
+        newest_day = (yield newest_rollup_day_statement()).scalar()
+        if newest_day is not None:
+            days = rollup_days(newest_day, naive_utc(since), naive_utc(until))
+    row_sets = []
+    for statement in activity_statements(dialect_name, bucket, since, until, days):
+        row_sets.append((yield statement).all())
+    return merge_counts(row_sets)
+
+
+def refresh_activity_rollup(db_session, full: bool = False) -> int:
+    """
+    Recompute the recent days of the daily activity rollup.
+
+    Days from ACTIVITY_ROLLUP_SETTLE_DAYS before the newest rollup day onwards
+    are deleted and recounted from ``journal_entries`` in one transaction;
+    older days are kept as they are.
+
+    Args:
+        db_session: The database session used for the refresh.
+        full (bool, optional): Rebuild every day, for example after importing
+            backdated entries. Defaults to False.
+
+    Returns:
+        int: The number of days written.
+    """
+    dialect_name = db_session.get_bind().dialect.name
+    newest_day = None if full else db_session.execute(newest_rollup_day_statement()).scalar()
+    stale = delete(JournalActivityDaily)
+    day = day_of(dialect_name, JournalEntry.created_at)
+    counts = select(day, func.count())
+    if newest_day is not None:
+        first = newest_day - timedelta(days=settings.ACTIVITY_ROLLUP_SETTLE_DAYS)
+        stale = stale.where(JournalActivityDaily.day >= first)
+        counts = counts.where(JournalEntry.created_at >= midnight(first))
+    db_session.execute(stale)
+    result = db_session.execute(
+        insert(JournalActivityDaily).from_select(
+            ["day", "entries"], counts.group_by(day)
+        )
+    )
+    db_session.commit()
+    return result.rowcount
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refresh the daily journal activity rollup.")
+    parser.add_argument("--full", action="store_true", help="Rebuild every day instead of the recent ones.")
+    args = parser.parse_args()
+    with SessionLocal() as db_session:
+        print(f"Refreshed {refresh_activity_rollup(db_session, args.full)} days of activity")
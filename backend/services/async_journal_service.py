@@ -0,0 +1,222 @@
+"""
+Async journal service module.
+
+This module mirrors backend.services.journal_service for AsyncSession callers.
+Reads run the same plans (backend.services.plans) as the sync functions,
+through arun_plan, so the async endpoints run exactly the same SQL and result
+shaping as the sync ones, and only await the I/O, without holding a
+threadpool slot while they wait.
+"""
+
+import uuid
+from datetime import datetime
+from sqlalchemy import insert
+
+from backend.models.journal import JournalEntry
+from backend.models.outbox import IndexingOutbox
+from backend.services.activity import activity_counts_plan
+from backend.services.related import related_entries_plan
+from backend.services.journal_service import (
+    bulk_insert_statement,
+    collection_version_plan,
+    entry_rows,
+    get_entry_plan,
+    invalidate_entries_plan,
+    list_entries_plan,
+    outbox_rows,
+    search_plan,
+    select_entries_after,
+)
+from backend.services.plans import arun_plan
+
+
+async def create_journal_entry(db_session, title: str, content: str):
+    """
+    Create a new journal entry and enqueue it for indexing.
+
+    Args:
+        db_session (AsyncSession): The database session used for adding the entry.
+        title (str): The title of the journal entry.
+        content (str): The content of the journal entry.
+
+    Returns:
+        JournalEntry: The created journal entry instance.
+    """
+    entry = JournalEntry(id=uuid.uuid4(), title=title, content=content)
+    db_session.add(entry)
+    db_session.add(IndexingOutbox(entry_id=entry.id))
+    await db_session.commit()
+    await db_session.refresh(entry)
+    await arun_plan(db_session, invalidate_entries_plan([entry.id]))
+
+    return entry
+
+
+async def bulk_create_journal_entries(db_session, entries):
+    """
+    Insert many journal entries and their outbox rows in one transaction.
+
+    Args:
+        db_session (AsyncSession): The database session used for the inserts.
+        entries (list): (title, content) pairs.
+
+    Returns:
+        list: The UUIDs of the created entries, in input order.
+    """
+    if not entries:
+        return []
+    result = await db_session.execute(bulk_insert_statement(), entry_rows(entries))
+    entry_ids = list(result.scalars())
+    await db_session.execute(insert(IndexingOutbox), outbox_rows(entry_ids))
+    await db_session.commit()
+    await arun_plan(db_session, invalidate_entries_plan(entry_ids))
+    return entry_ids
+
+
+async def get_journal_entry(db_session, entry_id):
+    """
+    Fetch a single journal entry by its UUID, reading through the cache.
+
+    Args:
+        db_session (AsyncSession): The database session used on a cache miss.
+        entry_id: The UUID of the entry.
+
+    Returns:
+        dict: The serialised entry, or None if it does not exist.
+    """
+    return await arun_plan(db_session, get_entry_plan(entry_id))
+
+
+async def collection_version(db_session, since: datetime = None, until: datetime = None,
+                             tags: list = None) -> tuple:
+    """
+    Return the version of the journal used for conditional listings.
+
+    Args:
+        db_session (AsyncSession): The database session used for the query.
+        since (datetime, optional): Only entries created at or after this time.
+        until (datetime, optional): Only entries created before this time.
+        tags (list, optional): Only entries carrying every one of these tags.
+
+    Returns:
+        tuple: The newest created_at, or None, and the number of entries,
+        followed by the tags' membership version when filtering by tag.
+    """
+    return await arun_plan(db_session, collection_version_plan(since, until, tags))
+
+
+async def list_journal_entries(db_session, limit: int = 100, cursor: str = None,
+                               since: datetime = None, until: datetime = None, columns: list = None,
+                               tags: list = None):
+    """
+    Return one page of journal entries ordered by (created_at, id).
+
+    Args:
+        db_session (AsyncSession): The database session used for the query.
+        limit (int, optional): Maximum number of entries to return. Defaults to 100.
+        cursor (str, optional): Cursor returned with the previous page.
+        since (datetime, optional): Only entries created at or after this time.
+        until (datetime, optional): Only entries created before this time.
+        columns (list, optional): Columns from entry_columns to fetch instead of whole entries.
+        tags (list, optional): Only entries carrying every one of these tags.
+
+    Returns:
+        tuple: A list of JournalEntry instances, or rows of the given columns,
+        and the cursor for the next page, or None when there are no more entries.
+    """
+    return await arun_plan(db_session, list_entries_plan(limit, cursor, since, until, columns, tags))
+
+
+async def iter_journal_entries(db_session, batch_size: int = 500, cursor: str = None,
+                               since: datetime = None, until: datetime = None, columns: list = None,
+                               tags: list = None):
+    """
+    Stream every journal entry from a server-side cursor.
+
+    Args:
+        db_session (AsyncSession): The database session used for the query.
+        batch_size (int, optional): Number of rows fetched per round trip. Defaults to 500.
+        cursor (str, optional): Only stream entries after this cursor.
+        since (datetime, optional): Only entries created at or after this time.
+        until (datetime, optional): Only entries created before this time.
+        columns (list, optional): Columns from entry_columns to fetch instead of whole entries.
+        tags (list, optional): Only entries carrying every one of these tags.
+
+    Yields:
+        JournalEntry: Journal entries, or rows of the given columns, ordered by (created_at, id).
+    """
+    statement = select_entries_after(cursor, since, until, columns, tags).execution_options(
+        yield_per=batch_size
+    )
+    result = await db_session.stream(statement)
+    async for entry in (result if columns else result.scalars()):
+        yield entry
+
+
+async def search_journal_entries(db_session, query: str, k: int = 10, certainty: float = None,
+                                 mode: str = "semantic", tags: list = None):
+    """
+    Search journal entries, reading through the cache (see search_cache_ttl).
+
+    See backend.services.journal_service.search_journal_entries for the modes.
+
+    Args:
+        db_session (AsyncSession): The database session used to load the entries.
+        query (str): The search text.
+        k (int, optional): Maximum number of results. Defaults to 10.
+        certainty (float, optional): Minimum certainty of vector store hits.
+        mode (str, optional): ``semantic``, ``keyword`` or ``hybrid``. Defaults to ``semantic``.
+        tags (list, optional): Only entries carrying every one of these tags.
+
+    Returns:
+        list: Dicts with ``rank``, ``score`` and ``entry``, best match first.
+
+    Raises:
+        Exception: If the vector store search fails.
+    """
+    dialect_name = db_session.get_bind().dialect.name
+    return await arun_plan(db_session, search_plan(dialect_name, query, k, certainty, mode, tags))
+
+
+async def activity_counts(db_session, bucket: str = "day", since: datetime = None,
+                          until: datetime = None, use_rollup: bool = None) -> list:
+    """
+    Count journal entries per day, week or month.
+
+    See backend.services.activity.activity_counts for the rollup.
+
+    Args:
+        db_session (AsyncSession): The database session used for the queries.
+        bucket (str, optional): ``day``, ``week`` or ``month``. Defaults to ``day``.
+        since (datetime, optional): Only entries created at or after this time.
+        until (datetime, optional): Only entries created before this time.
+        use_rollup (bool, optional): Read whole past days from the rollup.
+            Defaults to settings.ACTIVITY_ROLLUP.
+
+    Returns:
+        list: Dicts with the bucket ``start`` date and its ``count``, oldest first.
+
+    Raises:
+        ValueError: If bucket is not one of BUCKETS.
+    """
+    dialect_name = db_session.get_bind().dialect.name
+    return await arun_plan(db_session, activity_counts_plan(dialect_name, bucket, since, until, use_rollup))
+
+
+async def related_entries(db_session, entry_id, limit: int = None, columns: list = None) -> list:
+    """
+    Return the precomputed related entries of an entry.
+
+    See backend.services.related.related_entries.
+
+    Args:
+        db_session (AsyncSession): The database session used for the query.
+        entry_id: The UUID of the entry.
+        limit (int, optional): Maximum number of related entries. Defaults to
+            settings.RELATED_ENTRIES_LIMIT.
+        columns (list, optional): Entry columns to select; the whole entry by default.
+
+    Returns:
+        list: Rows with the ``score`` and the entry columns, closest first.
+    """
+    return await arun_plan(db_session, related_entries_plan(entry_id, limit, columns))
@@ -0,0 +1,274 @@
+"""
+Cache module.
+
+This module provides the read-through cache used by the service layer for entry
+lookups and search results. Keys are namespaced strings such as
+``entry:<uuid>``; the namespace before the first colon is used for the hit and
+miss counters, so each kind of lookup can be tuned on its own.
+
+Two backends are available, selected with settings.CACHE_BACKEND:
+
+- ``memory``: an in-process LRU with a TTL and a maximum number of keys.
+- ``redis``: a shared Redis backend (needs the ``redis`` package), so several
+  API processes and the worker see the same entries and invalidations.
+
+``none`` disables caching. Namespaces can be invalidated as a whole by bumping
+their version, which callers include in their keys.
+
+Entries become searchable when the worker indexes them, and only a shared
+backend sees the worker's invalidation. So the in-process LRU keeps search
+results for SEARCH_CACHE_TTL only (search_cache_ttl), which bounds how long a
+repeated search can miss newly indexed entries. If Redis is unreachable, reads
+miss and writes are skipped, so requests fall back to the database.
+
+Shared backends do network I/O, so async callers run their calls in a thread
+(see backend.services.plans.CacheCall).
+"""
+
+import abc
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from backend.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Cache(abc.ABC):
+    """
+    Base class for cache backends, keeping per-namespace hit and miss counters.
+
+    Values must be JSON-serialisable.
+
+    Attributes:
+        shared (bool): Whether other processes, such as the worker, see the
+            same entries and invalidations.
+    """
+
+    shared = False
+
+    def __init__(self):
+        self._stats = defaultdict(lambda: {"hits": 0, "misses": 0})
+        self._stats_lock = threading.Lock()
+
+    def get(self, key: str):
+        """
+        Return the cached value for key, or None on a miss.
+
+        Args:
+            key (str): The namespaced cache key.
+
+        Returns:
+            The cached value, or None.
+        """
+        value = self._get(key)
+        with self._stats_lock:
+            self._stats[key.split(":", 1)[0]]["hits" if value is not None else "misses"] += 1
+        return value
+
+    def stats(self) -> dict:
+        """
+        Return the hit and miss counters per namespace.
+
+        Returns:
+            dict: ``{namespace: {"hits": int, "misses": int, "hit_ratio": float}}``.
+        """
+        with self._stats_lock:
+            return {
+                namespace: {
+                    **counts,
+                    "hit_ratio": counts["hits"] / ((counts["hits"] + counts["misses"]) or 1),
+                }
+                for namespace, counts in self._stats.items()
+            }
+
+    @abc.abstractmethod
+    def _get(self, key: str):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def set(self, key: str, value, ttl: float = None):
+        """Store value under key for ttl seconds (settings.CACHE_TTL by default)."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def delete(self, *keys: str):
+        """Remove keys from the cache."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def version(self, namespace: str) -> int:
+        """Return the current version of a namespace, to be embedded in its keys."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def bump(self, namespace: str):
+        """Invalidate every key built with the current version of a namespace."""
+        raise NotImplementedError
+
+
+class NullCache(Cache):
+    """Cache backend that stores nothing."""
+
+    def _get(self, key: str):
+        return None
+
+    def set(self, key: str, value, ttl: float = None):
+        pass
+
+    def delete(self, *keys: str):
+        pass
+
+    def version(self, namespace: str) -> int:
+        return 0
+
+    def bump(self, namespace: str):
+        pass
+
+
+class LRUCache(Cache):
+    """
+    In-process LRU cache with per-key expiry.
+
+    Attributes:
+        maxsize (int): Maximum number of keys; the least recently used key is evicted first.
+        ttl (float): Default time to live of a key, in seconds.
+    """
+
+    def __init__(self, maxsize: int = None, ttl: float = None):
+        super().__init__()
+        self.maxsize = maxsize or settings.CACHE_MAXSIZE
+        self.ttl = ttl or settings.CACHE_TTL
+        self._data = OrderedDict()
+        self._versions = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def _get(self, key: str):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, ttl: float = None):
+        with self._lock:
+            self._data[key] = (time.monotonic() + (ttl or self.ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, *keys: str):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def version(self, namespace: str) -> int:
+        with self._lock:
+            return self._versions[namespace]
+
+    def bump(self, namespace: str):
+        with self._lock:
+            self._versions[namespace] += 1
+
+    def __len__(self):
+        return len(self._data)
+
+
+class RedisCache(Cache):
+    """
+    Shared cache backed by Redis.
+
+    Redis errors are logged and treated as misses, so an outage degrades to
+    uncached reads instead of failing requests.
+
+    Attributes:
+        ttl (float): Default time to live of a key, in seconds.
+    """
+
+    shared = True
+
+    def __init__(self, url: str = None, ttl: float = None):
+        super().__init__()
+        import redis  # Optional dependency, only needed for the shared backend
+
+        self.ttl = ttl or settings.CACHE_TTL
+        self._errors = redis.RedisError
+        self._client = redis.Redis.from_url(
+            url or settings.CACHE_REDIS_URL, socket_timeout=settings.CACHE_REDIS_TIMEOUT
+        )
+
+    def _call(self, method: str, *args, default=None, **kwargs):
+        """Call a Redis client method, returning default if Redis fails."""
+        try:
+            return getattr(self._client, method)(*args, **kwargs)
+        except self._errors as exc:
+            logger.warning("Redis cache %s failed: %s", method, exc)
+            return default
+
+    def _get(self, key: str):
+        raw = self._call("get", key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value, ttl: float = None):
+        self._call("set", key, json.dumps(value), ex=max(1, int(ttl or self.ttl)))
+
+    def delete(self, *keys: str):
+        if keys:
+            self._call("delete", *keys)
+
+    def version(self, namespace: str) -> int:
+        # -1 is never a stored version, so keys built while Redis is down match nothing cached.
+        return int(self._call("get", f"version:{namespace}", default=-1) or 0)
+
+    def bump(self, namespace: str):
+        self._call("incr", f"version:{namespace}")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> Cache:
+    """
+    Return the process-wide cache selected by settings.CACHE_BACKEND.
+
+    Returns:
+        Cache: An LRUCache for ``memory``, a RedisCache for ``redis`` or a NullCache for ``none``.
+
+    Raises:
+        ValueError: If settings.CACHE_BACKEND names an unknown backend.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                if settings.CACHE_BACKEND == "memory":
+                    _cache = LRUCache()
+                elif settings.CACHE_BACKEND == "redis":
+                    _cache = RedisCache()
+                elif settings.CACHE_BACKEND == "none":
+                    _cache = NullCache()
+                else:
+                    raise ValueError(f"Unknown cache backend: {settings.CACHE_BACKEND}")
+    return _cache
+
+
+def search_cache_ttl(cache: Cache):
+    """
+    Return the time to live of search results in a cache.
+
+    Args:
+        cache (Cache): The cache the results are stored in.
+
+    Returns:
+        float: None for a shared backend, which keeps them for its default
+        TTL, and settings.SEARCH_CACHE_TTL otherwise; 0 means they are not cached.
+    """
+    return None if cache.shared else settings.SEARCH_CACHE_TTL
@@ -0,0 +1,118 @@
+"""
+Chunker module.
+
+This module splits journal entry content into overlapping passages, so long
+entries are embedded as several focused vectors instead of one diluted or
+truncated one, and maps vector store hits on passages back to their entries.
+
+Passages are produced lazily from a sliding window of token spans: only the
+window's offsets are held, and each passage is a single slice of the content.
+
+The first passage of an entry is stored under the entry's own UUID and later
+passages under UUIDs derived from it, so a store can always tell whether it
+holds an entry by looking up the entry's id.
+"""
+
+import re
+import uuid
+from collections import deque
+from backend.core.config import settings
+
+TOKEN_PATTERN = re.compile(r"\S+")
+
+
+def iter_passages(content: str, size: int = None, overlap: int = None):
+    """
+    Split content into passages of whitespace-delimited tokens.
+
+    Consecutive passages share ``overlap`` tokens. Content shorter than one
+    passage, including empty content, yields exactly one passage.
+
+    Args:
+        content (str): The text to split.
+        size (int, optional): Tokens per passage. Defaults to settings.CHUNK_SIZE.
+        overlap (int, optional): Tokens shared by consecutive passages.
+            Defaults to settings.CHUNK_OVERLAP.
+
+    Yields:
+        str: The passages, in order.
+
+    Raises:
+        ValueError: If overlap is not smaller than size.
+    """
+    size = size or settings.CHUNK_SIZE
+    overlap = settings.CHUNK_OVERLAP if overlap is None else overlap
+    if not 0 <= overlap < size:
+        raise ValueError(f"Chunk overlap must be in [0, {size}), got {overlap}")
+
+    window = deque()
+    emitted = False
+    for match in TOKEN_PATTERN.finditer(content):
+        window.append(match.span())
+        if len(window) == size:
+            yield content[window[0][0]:window[-1][1]]
+            emitted = True
+            for _ in range(size - overlap):
+                window.popleft()
+    # After a full passage the window only holds its overlap; anything more is new text.
+    if len(window) > (overlap if emitted else 0):
+        yield content[window[0][0]:window[-1][1]]
+    elif not emitted:
+        yield content
+
+
+def chunk_id(entry_id, index: int) -> str:
+    """
+    Return the vector store id of an entry's passage.
+
+    Args:
+        entry_id: The UUID of the entry.
+        index (int): The passage index.
+
+    Returns:
+        str: The entry's UUID for the first passage, a derived UUID otherwise.
+    """
+    entry_uuid = uuid.UUID(str(entry_id))
+    return str(entry_uuid if index == 0 else uuid.uuid5(entry_uuid, str(index)))
+
+
+def iter_entry_chunks(entry_id, content: str):
+    """
+    Split an entry into passages with their ids.
+
+    Args:
+        entry_id: The UUID of the entry.
+        content (str): The content of the entry.
+
+    Yields:
+        tuple: (chunk_id, index, passage) for each passage, in order.
+    """
+    for index, passage in enumerate(iter_passages(content)):
+        yield chunk_id(entry_id, index), index, passage
+
+
+def search_limit(limit: int) -> int:
+    """Return how many passage hits to fetch for limit distinct entries."""
+    return limit * settings.CHUNK_SEARCH_OVERSAMPLE
+
+
+def collapse_hits(hits, limit: int) -> list:
+    """
+    Keep the best passage hit of each entry.
+
+    Args:
+        hits (iterable): Dicts with the parent entry ``id`` and ``certainty``, best match first.
+        limit (int): Maximum number of entries.
+
+    Returns:
+        list: At most limit hits, one per entry, best match first.
+    """
+    seen = set()
+    results = []
+    for hit in hits:
+        if hit["id"] not in seen:
+            seen.add(hit["id"])
+            results.append(hit)
+            if len(results) >= limit:
+                break
+    return results
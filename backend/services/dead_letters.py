@@ -0,0 +1,100 @@
+"""
+Dead-letter module for indexing jobs that were given up on.
+
+Outbox jobs that fail permanently, or use up settings.OUTBOX_MAX_ATTEMPTS, are
+moved from the indexing outbox to the indexing_dead_letters table, so they no
+longer take worker time but are not lost either. Once the cause is fixed, they
+are replayed: put back into the outbox with a fresh attempt count.
+
+List or replay them with:
+
+    python -m backend.services.dead_letters
+    python -m backend.services.dead_letters --replay [--entry <uuid> ...]
+"""
+
+import argparse
+import uuid
+from sqlalchemy import delete, insert, select
+from backend.database import SessionLocal
+from backend.models.outbox import IndexingDeadLetter, IndexingOutbox
+from backend.services.journal_service import outbox_rows
+
+
+def dead_letter(db_session, entry_id, attempts: int, error: str):
+    """
+    Record that indexing an entry was given up on.
+
+    An entry has at most one dead letter; an older one is replaced. The
+    caller commits.
+
+    Args:
+        db_session: The database session used for the writes.
+        entry_id (uuid): The journal entry that could not be indexed.
+        attempts (int): Number of failed attempts.
+        error (str): The error message of the last attempt.
+    """
+    db_session.flush()  # Sessions do not autoflush; an earlier letter may still be pending
+    db_session.execute(delete(IndexingDeadLetter).where(IndexingDeadLetter.entry_id == entry_id))
+    db_session.add(IndexingDeadLetter(entry_id=entry_id, attempts=attempts, last_error=error))
+
+
+def list_dead_letters(db_session, limit: int = 100) -> list:
+    """
+    Return the most recent dead letters.
+
+    Args:
+        db_session: The database session used for the query.
+        limit (int, optional): Maximum number of rows. Defaults to 100.
+
+    Returns:
+        list: IndexingDeadLetter rows, newest first.
+    """
+    return db_session.execute(
+        select(IndexingDeadLetter).order_by(IndexingDeadLetter.failed_at.desc()).limit(limit)
+    ).scalars().all()
+
+
+def replay_dead_letters(db_session, entry_ids=None) -> int:
+    """
+    Move dead letters back into the indexing outbox, with no attempts recorded.
+
+    Args:
+        db_session: The database session used for the move; it is committed.
+        entry_ids (list, optional): Only replay these entries; all of them by default.
+
+    Returns:
+        int: The number of entries put back in the outbox.
+    """
+    query = select(IndexingDeadLetter.entry_id)
+    if entry_ids:
+        query = query.where(IndexingDeadLetter.entry_id.in_(entry_ids))
+    replayed = list(dict.fromkeys(db_session.execute(query).scalars()))
+    if replayed:
+        db_session.execute(insert(IndexingOutbox), outbox_rows(replayed))
+        db_session.execute(
+            delete(IndexingDeadLetter).where(IndexingDeadLetter.entry_id.in_(replayed))
+        )
+    db_session.commit()
+    return len(replayed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List or replay indexing jobs that were given up on.")
+    parser.add_argument("--replay", action="store_true", help="Put the dead letters back in the outbox.")
+    parser.add_argument("--entry", action="append", type=uuid.UUID, default=[],
+                        help="Only replay this entry; may be repeated.")
+    parser.add_argument("--limit", type=int, default=100, help="Maximum number of dead letters listed.")
+    args = parser.parse_args()
+    with SessionLocal() as db_session:
+        if args.replay:
+            print(f"Replayed {replay_dead_letters(db_session, args.entry)} entries into the indexing outbox.")
+            return
+        letters = list_dead_letters(db_session, args.limit)
+        for letter in letters:
+            print(f"{letter.entry_id}  {letter.failed_at}  attempts={letter.attempts}  {letter.last_error}")
+        if not letters:
+            print("No dead letters.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""
+Embeddings module.
+
+This module turns text into fixed-size float32 vectors for the local vector
+store in backend.services.vector_store, and for Weaviate when
+settings.WEAVIATE_CLIENT_VECTORS has the app send precomputed vectors.
+
+HashingEmbedder uses feature hashing over word unigrams and bigrams. It needs
+no model download and is deterministic across processes and machines, which
+makes it suitable for small deployments, offline use and CI. Other embedders
+are plugged in with settings.EMBEDDER as ``package.module:Class``.
+
+EmbeddingPipeline is what the indexing path calls. It skips passages whose
+text was embedded before, looking them up by content hash, and spreads the
+rest over a process pool in batches, so indexing throughput scales with the
+number of CPU cores.
+"""
+
+import hashlib
+import importlib
+import multiprocessing
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from backend.core.config import settings
+from backend.services.metrics import EMBEDDED_PASSAGES
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class HashingEmbedder:
+    """
+    Deterministic feature-hashing text embedder.
+
+    Attributes:
+        dim (int): Dimensionality of the produced vectors.
+    """
+
+    def __init__(self, dim: int = None):
+        self.dim = dim or settings.EMBEDDING_DIM
+
+    def _bucket(self, feature: str):
+        """Return the (index, sign) a feature hashes to."""
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        return value % self.dim, 1.0 if value >> 63 else -1.0
+
+    def embed(self, text: str) -> np.ndarray:
+        """
+        Embed one text.
+
+        Args:
+            text (str): The text to embed.
+
+        Returns:
+            np.ndarray: An L2-normalised float32 vector of length dim.
+        """
+        vector = np.zeros(self.dim, dtype=np.float32)
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        for feature in features:
+            index, sign = self._bucket(feature)
+            vector[index] += sign
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed_many(self, texts) -> np.ndarray:
+        """
+        Embed several texts.
+
+        Args:
+            texts (iterable): The texts to embed.
+
+        Returns:
+            np.ndarray: A float32 matrix with one row per text.
+        """
+        rows = [self.embed(text) for text in texts]
+        return np.vstack(rows) if rows else np.zeros((0, self.dim), dtype=np.float32)
+
+
+def load_embedder(spec: str = None):
+    """
+    Build the embedder named by spec.
+
+    Args:
+        spec (str, optional): ``hashing``, or ``package.module:Class`` for a class
+            built without arguments that has ``dim``, ``embed`` and ``embed_many``.
+            Defaults to settings.EMBEDDER.
+
+    Returns:
+        The embedder.
+
+    Raises:
+        ValueError: If spec is neither ``hashing`` nor an import path.
+    """
+    spec = spec or settings.EMBEDDER
+    if spec == "hashing":
+        return HashingEmbedder()
+    module_name, _, class_name = spec.partition(":")
+    if not module_name or not class_name:
+        raise ValueError(f"Unknown embedder: {spec}")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+_worker_embedder = None
+
+
+def _init_worker(spec: str):
+    """Build the embedder of a pool process once, when the process starts."""
+    global _worker_embedder
+    _worker_embedder = load_embedder(spec)
+
+
+def _embed_in_worker(texts: list) -> np.ndarray:
+    return _worker_embedder.embed_many(texts)
+
+
+def new_process_pool(workers: int, initializer=None, initargs=()) -> ProcessPoolExecutor:
+    """
+    Start a process pool that is safe to use from a threaded process.
+
+    Forking a process that runs threads can copy held locks, so pool
+    processes are started from a clean forkserver, or with spawn where
+    forkserver is unavailable.
+
+    Args:
+        workers (int): Number of processes.
+        initializer (callable, optional): Called in each process on start.
+        initargs (tuple, optional): Arguments of initializer.
+
+    Returns:
+        ProcessPoolExecutor: The pool.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                               initializer=initializer, initargs=initargs)
+
+
+class EmbeddingCache:
+    """
+    Vectors keyed by content hash, kept in an in-process LRU.
+
+    When a path is given, vectors are also stored in a SQLite file there, so
+    the API, the outbox worker and reindex runs share them, across restarts too.
+
+    Attributes:
+        maxsize (int): Maximum number of vectors kept in memory.
+        path (str): The SQLite file, or None to keep vectors in memory only.
+    """
+
+    def __init__(self, maxsize: int = None, path: str = None):
+        self.maxsize = maxsize if maxsize is not None else settings.EMBEDDING_CACHE_SIZE
+        self.path = path
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS vectors (key BLOB PRIMARY KEY, vector BLOB NOT NULL)")
+            self._db.commit()
+
+    def get_many(self, keys: list) -> dict:
+        """Return the cached vectors of keys, leaving out the ones not cached."""
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+            missing = [key for key in keys if key not in found]
+            if self._db is not None and missing:
+                placeholders = ",".join("?" * len(missing))
+                for key, vector in self._db.execute(
+                    f"SELECT key, vector FROM vectors WHERE key IN ({placeholders})", missing
+                ):
+                    found[key] = np.frombuffer(vector, dtype=np.float32)
+                    self._remember(key, found[key])
+        return found
+
+    def set_many(self, vectors: dict):
+        """Cache vectors keyed by content hash."""
+        with self._lock:
+            for key, vector in vectors.items():
+                self._remember(key, vector)
+            if self._db is not None and vectors:
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO vectors (key, vector) VALUES (?, ?)",
+                    [(key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in vectors.items()],
+                )
+                self._db.commit()
+
+    def _remember(self, key: bytes, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._memory)
+
+
+class EmbeddingPipeline:
+    """
+    Embeds passages in batches across a process pool, never embedding the same text twice.
+
+    Texts already in the cache are not embedded again. The others are split
+    into batches of ``batch_size``; a single batch is embedded in the calling
+    thread, and several are spread over ``workers`` processes, each holding
+    its own copy of the embedder. Search queries are embedded inline.
+
+    Attributes:
+        spec (str): The embedder, as accepted by load_embedder.
+        embedder: The embedder used in this process.
+        workers (int): Number of pool processes; 1 embeds everything inline.
+        batch_size (int): Texts sent to a pool process per task.
+        cache (EmbeddingCache): Vectors of texts embedded before.
+    """
+
+    def __init__(self, spec: str = None, workers: int = None, batch_size: int = None,
+                 cache: EmbeddingCache = None):
+        self.spec = spec or settings.EMBEDDER
+        self.embedder = load_embedder(self.spec)
+        self.workers = workers or settings.EMBEDDING_WORKERS or os.cpu_count() or 1
+        self.batch_size = batch_size or settings.EMBEDDING_BATCH_SIZE
+        self.cache = cache if cache is not None else EmbeddingCache(
+            path=settings.EMBEDDING_CACHE_PATH or None
+        )
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def dim(self) -> int:
+        return self.embedder.dim
+
+    def key(self, text: str) -> bytes:
+        """Return the cache key of a text: a hash of the embedder, its dimension and the text."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{self.spec}:{self.dim}\0".encode("utf-8"))
+        digest.update(text.encode("utf-8"))
+        return digest.digest()
+
+    def embed(self, text: str) -> np.ndarray:
+        """Embed one text, such as a search query, in the calling thread."""
+        return self.embedder.embed(text)
+
+    def embed_many(self, texts) -> np.ndarray:
+        """
+        Embed several texts, reusing cached vectors.
+
+        Args:
+            texts (iterable): The texts to embed.
+
+        Returns:
+            np.ndarray: A float32 matrix with one row per text, in input order.
+        """
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        keys = [self.key(text) for text in texts]
+        vectors = self.cache.get_many(list(dict.fromkeys(keys)))
+        missing = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        EMBEDDED_PASSAGES.inc(len(texts) - len(missing), source="cache")
+        if missing:
+            computed = dict(zip(missing, self._compute(list(missing.values()))))
+            EMBEDDED_PASSAGES.inc(len(computed), source="embedder")
+            self.cache.set_many(computed)
+            vectors.update(computed)
+        return np.vstack([vectors[key] for key in keys]).astype(np.float32, copy=False)
+
+    def _compute(self, texts: list) -> np.ndarray:
+        batches = [texts[start:start + self.batch_size] for start in range(0, len(texts), self.batch_size)]
+        if len(batches) == 1 or self.workers <= 1:
+            return self.embedder.embed_many(texts)
+        return np.vstack(list(self._pool().map(_embed_in_worker, batches)))
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = new_process_pool(self.workers, _init_worker, (self.spec,))
+        return self._executor
+
+    def close(self):
+        """Shut the process pool down."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def get_embedding_pipeline() -> EmbeddingPipeline:
+    """
+    Return the process-wide embedding pipeline, creating it on first use.
+
+    Returns:
+        EmbeddingPipeline: The pipeline configured from settings.
+    """
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = EmbeddingPipeline()
+    return _pipeline
@@ -1,21 +1,48 @@
 """
 Journal service module.
 
-This module defines a service function to create a new journal entry.
-It handles creating the journal entry, saving it to the database, and indexing it into weaviate.
+This module defines service functions to create (singly or in bulk), fetch, list and
+search (semantic, keyword or hybrid) journal entries. It handles creating the journal entry and saving it to the database
+together with an indexing outbox row, which the worker in backend.tasks.worker drains
+into weaviate, as well as keyset (cursor) pagination and streaming reads over the
+journal table, optionally restricted to a ``created_at`` time range. Listings
+can select only some columns, and an excerpt of the content, so unused ``Text``
+columns are never fetched.
+
+The SQL statements are built, and their results shaped, by helpers and plans
+(backend.services.plans) shared with the async variants in
+backend.services.async_journal_service, so both paths run identical queries.
+
+Single-entry lookups and search results are read through the cache from
+backend.services.cache; creating entries invalidates the affected keys. The
+in-process cache keeps search results only briefly (search_cache_ttl), as it
+does not see the worker index new entries.
 """
 
-from backend.models.journal import JournalEntry
-from backend.services.indexer import index_journal_entry
+import base64
+import hashlib
+import json
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from sqlalchemy import func, insert, literal, literal_column, or_, select, tuple_
+
+from backend.core.config import settings
+from backend.models.journal import JournalEntry, SEARCH_CONFIG
+from backend.models.outbox import IndexingOutbox
+from backend.models.tags import normalize_tags, tag_version_columns, tagged_filter
+from backend.services.cache import get_cache, search_cache_ttl
+from backend.services.plans import CacheCall, VectorSearch, run_plan
 
 
 def create_journal_entry(db_session, title: str, content: str):
     """
-    Create a new journal entry and index it.
+    Create a new journal entry and enqueue it for indexing.
 
-    This function creates a new JournalEntry instance adds it to the database session, 
-    commits the transaction, and then triggers indexing of the journal entry via the 
-    index_journal_entry function.
+    This function creates a new JournalEntry instance and an IndexingOutbox row for it,
+    and commits both in a single transaction. Indexing into Weaviate happens later in
+    the outbox worker, so the request never waits on Weaviate.
 
     Args:
         db_session: The database session used for adding the entry.
@@ -25,12 +52,558 @@ def create_journal_entry(db_session, title: str, content: str):
     Returns:
         JournalEntry: The created journal entry instance.
     """
-    entry = JournalEntry(title=title, content=content) 
+    entry = JournalEntry(id=uuid.uuid4(), title=title, content=content)
     db_session.add(entry)
+    db_session.add(IndexingOutbox(entry_id=entry.id))
     db_session.commit()
     db_session.refresh(entry)
-
-    # Index entry into Weaviate with the uuid
-    index_journal_entry(entry.id, entry.content)
+    invalidate_entries([entry.id])
 
     return entry
+
+
+def bulk_create_journal_entries(db_session, entries):
+    """
+    Insert many journal entries and their outbox rows in one transaction.
+
+    Entries are written with multi-row ``INSERT ... RETURNING`` statements
+    instead of one round trip per entry, and the outbox worker later indexes
+    them into Weaviate in batches.
+
+    Args:
+        db_session: The database session used for the inserts.
+        entries (list): (title, content) pairs.
+
+    Returns:
+        list: The UUIDs of the created entries, in input order.
+    """
+    if not entries:
+        return []
+    entry_ids = list(db_session.execute(bulk_insert_statement(), entry_rows(entries)).scalars())
+    db_session.execute(insert(IndexingOutbox), outbox_rows(entry_ids))
+    db_session.commit()
+    invalidate_entries(entry_ids)
+    return entry_ids
+
+
+def get_journal_entry(db_session, entry_id):
+    """
+    Fetch a single journal entry by its UUID, reading through the cache.
+
+    Args:
+        db_session: The database session used on a cache miss.
+        entry_id: The UUID of the entry.
+
+    Returns:
+        dict: The serialised entry, or None if it does not exist.
+    """
+    return run_plan(db_session, get_entry_plan(entry_id))
+
+
+def get_entry_plan(entry_id):
+    """Plan of get_journal_entry."""
+    key = entry_cache_key(entry_id)
+    cached = yield CacheCall("get", key)
+    if cached is not None:
+        return cached
+    entry = (yield select(JournalEntry).where(JournalEntry.id == entry_id)).scalar_one_or_none()
+    if entry is None:
+        return None
+    data = entry_to_dict(entry)
+    yield CacheCall("set", key, data)
+    return data
+
+
+def entry_to_dict(entry: JournalEntry) -> dict:
+    """
+    Serialise a journal entry to a JSON-compatible dict.
+
+    Args:
+        entry (JournalEntry): The entry to serialise.
+
+    Returns:
+        dict: The entry's id, title, content and created_at.
+    """
+    return {
+        "id": str(entry.id),
+        "title": entry.title,
+        "content": entry.content,
+        "created_at": entry.created_at.isoformat() if entry.created_at else None,
+    }
+
+
+def entry_cache_key(entry_id) -> str:
+    """Return the cache key of a single entry."""
+    return f"entry:{entry_id}"
+
+
+def search_cache_key(version: int, query: str, k: int, certainty: float = None,
+                     mode: str = "semantic", tags: list = None) -> str:
+    """
+    Return the cache key of a search, scoped to a version of the ``search`` namespace.
+
+    The parameters are JSON-encoded before hashing, so no query or tag can
+    make two different searches share a key.
+    """
+    params = json.dumps([mode, k, certainty, sorted(tags or []), query])
+    digest = hashlib.sha256(params.encode("utf-8")).hexdigest()
+    return f"search:{version}:{digest}"
+
+
+def invalidate_entries(entry_ids):
+    """
+    Drop cached data affected by writes to the given entries.
+
+    The entries' own keys are deleted, and every cached search is invalidated
+    because the written entries may now belong in its results.
+
+    Args:
+        entry_ids (iterable): UUIDs of the written entries.
+    """
+    run_plan(None, invalidate_entries_plan(entry_ids))
+
+
+def invalidate_entries_plan(entry_ids):
+    """Plan of invalidate_entries."""
+    yield CacheCall("delete", *(entry_cache_key(entry_id) for entry_id in entry_ids))
+    yield CacheCall("bump", "search")
+
+
+def bulk_insert_statement():
+    """Return the multi-row ``INSERT ... RETURNING id`` used for bulk creation."""
+    return insert(JournalEntry).returning(JournalEntry.id, sort_by_parameter_order=True)
+
+
+def entry_rows(entries):
+    """Build JournalEntry insert parameters, with fresh UUIDs, from (title, content) pairs."""
+    return [{"id": uuid.uuid4(), "title": title, "content": content} for title, content in entries]
+
+
+def outbox_rows(entry_ids):
+    """Build IndexingOutbox insert parameters for the given entry UUIDs."""
+    return [{"id": uuid.uuid4(), "entry_id": entry_id} for entry_id in entry_ids]
+
+
+def encode_cursor(entry: JournalEntry) -> str:
+    """
+    Encode the keyset position of an entry as an opaque cursor string.
+
+    Args:
+        entry (JournalEntry): The last entry of the current page.
+
+    Returns:
+        str: A URL-safe cursor pointing just after the given entry.
+    """
+    raw = f"{entry.created_at.isoformat()}|{entry.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str):
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor (str): The opaque cursor string.
+
+    Returns:
+        tuple: The (created_at, id) keyset position.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        created_at, entry_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(entry_id)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError(f"Invalid cursor: {cursor}") from exc
+
+
+def naive_utc(value: datetime):
+    """Convert a timezone-aware datetime to naive UTC, as created_at is stored; naive values pass through."""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def created_between(since: datetime = None, until: datetime = None) -> list:
+    """
+    Build the conditions restricting entries to a created_at range.
+
+    Args:
+        since (datetime, optional): Inclusive lower bound.
+        until (datetime, optional): Exclusive upper bound.
+
+    Returns:
+        list: Zero, one or two conditions, served by the (created_at, id) index.
+    """
+    conditions = []
+    if since is not None:
+        conditions.append(JournalEntry.created_at >= naive_utc(since))
+    if until is not None:
+        conditions.append(JournalEntry.created_at < naive_utc(until))
+    return conditions
+
+
+LIST_FIELDS = ("id", "title", "content", "created_at")
+
+
+def entry_columns(fields, excerpt_len: int = None) -> list:
+    """
+    Build the columns selected for a projected listing.
+
+    ``id`` and ``created_at`` are always selected, since the keyset cursor
+    is built from them.
+
+    Args:
+        fields (iterable): Names from LIST_FIELDS.
+        excerpt_len (int, optional): Also select the first excerpt_len
+            characters of the content, computed in SQL, as ``excerpt``.
+
+    Returns:
+        list: The columns, in LIST_FIELDS order.
+
+    Raises:
+        ValueError: If a field is not in LIST_FIELDS.
+    """
+    unknown = set(fields) - set(LIST_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    wanted = set(fields) | {"id", "created_at"}
+    columns = [getattr(JournalEntry, name) for name in LIST_FIELDS if name in wanted]
+    if excerpt_len:
+        columns.append(func.substr(JournalEntry.content, 1, excerpt_len).label("excerpt"))
+    return columns
+
+
+def select_entries_after(cursor: str = None, since: datetime = None, until: datetime = None,
+                         columns: list = None, tags: list = None):
+    """
+    Select journal entries ordered by (created_at, id), starting after cursor.
+
+    Args:
+        cursor (str, optional): Cursor produced by encode_cursor.
+        since (datetime, optional): Only entries created at or after this time.
+        until (datetime, optional): Only entries created before this time.
+        columns (list, optional): Columns from entry_columns to select rows
+            of instead of JournalEntry instances.
+        tags (list, optional): Only entries carrying every one of these tags.
+
+    Returns:
+        Select: The ordered, filtered statement.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    statement = select(*columns) if columns else select(JournalEntry)
+    statement = statement.where(*created_between(since, until), *tagged_filter(tags))
+    if cursor:
+        statement = statement.where(
+            tuple_(JournalEntry.created_at, JournalEntry.id) > decode_cursor(cursor)
+        )
+    return statement.order_by(JournalEntry.created_at, JournalEntry.id)
+
+
+def select_collection_version(since: datetime = None, until: datetime = None, tags: list = None):
+    """
+    Select a cheap version of the journal, or of one time range of it.
+
+    Entries are only ever added, so the newest created_at and the row count
+    change whenever a listing of the range would. Both come from the
+    (created_at, id) index, or the (tag_id, entry_id) index when filtering by tag.
+    Tags can move between entries, so a tag-filtered version also carries
+    the membership version of the tags (tag_version_columns).
+
+    Args:
+        since (datetime, optional): Only entries created at or after this time.
+        until (datetime, optional): Only entries created before this time.
+        tags (list, optional): Only entries carrying every one of these tags.
+
+    Returns:
+        Select: A statement yielding one (max created_at, count) row, followed
+        by the tags' link count and id sum when filtering by tag.
+    """
+    return select(func.max(JournalEntry.created_at), func.count(), *tag_version_columns(tags)).where(
+        *created_between(since, until), *tagged_filter(tags)
+    )
+
+
+def collection_version(db_session, since: datetime = None, until: datetime = None,
+                       tags: list = None) -> tuple:
+    """
+    Return the version of the journal used for conditional listings.
+
+    Args:
+        db_session: The database session used for the query.
+        since (datetime, optional): Only entries created at or after this time.
+        until (datetime, optional): Only entries created before this time.
+        tags (list, optional): Only entries carrying every one of these tags.
+
+    Returns:
+        tuple: The newest created_at, or None, and the number of entries,
+        followed by the tags' membership version when filtering by tag.
+    """
+    return run_plan(db_session, collection_version_plan(since, until, tags))
+
+
+def collection_version_plan(since: datetime = None, until: datetime = None, tags: list = None):
+    """Plan of collection_version."""
+    return tuple((yield select_collection_version(since, until, tags)).one())
+
+
+def paginate(entries, limit: int):
+    """
+    Split a ``limit + 1`` row fetch into a page and the next page's cursor.
+
+    Args:
+        entries (list): Up to limit + 1 entries.
+        limit (int): The page size.
+
+    Returns:
+        tuple: The page and the cursor for the next page, or None.
+    """
+    next_cursor = encode_cursor(entries[limit - 1]) if len(entries) > limit else None
+    return entries[:limit], next_cursor
+
+
+def list_journal_entries(db_session, limit: int = 100, cursor: str = None,
+                         since: datetime = None, until: datetime = None, columns: list = None,
+                         tags: list = None):
+    """
+    Return one page of journal entries ordered by (created_at, id).
+
+    Uses keyset pagination, so the cost of a page does not grow with how far
+    into the journal the client has paged.
+
+    Args:
+        db_session: The database session used for the query.
+        limit (int, optional): Maximum number of entries to return. Defaults to 100.
+        cursor (str, optional): Cursor returned with the previous page.
+        since (datetime, optional): Only entries created at or after this time.
+        until (datetime, optional): Only entries created before this time.
+        columns (list, optional): Columns from entry_columns to fetch instead of whole entries.
+        tags (list, optional): Only entries carrying every one of these tags.
+
+    Returns:
+        tuple: A list of JournalEntry instances, or rows of the given columns,
+        and the cursor for the next page, or None when there are no more entries.
+    """
+    return run_plan(db_session, list_entries_plan(limit, cursor, since, until, columns, tags))
+
+
+def list_entries_plan(limit: int = 100, cursor: str = None, since: datetime = None,
+                      until: datetime = None, columns: list = None, tags: list = None):
+    """Plan of list_journal_entries."""
+    result = yield select_entries_after(cursor, since, until, columns, tags).limit(limit + 1)
+    return paginate(result.all() if columns else result.scalars().all(), limit)
+
+
+def iter_journal_entries(db_session, batch_size: int = 500, cursor: str = None,
+                         since: datetime = None, until: datetime = None, columns: list = None,
+                         tags: list = None):
+    """
+    Stream every journal entry from a server-side cursor.
+
+    Rows are fetched in batches of batch_size, so memory use stays flat
+    regardless of the size of the table.
+
+    Args:
+        db_session: The database session used for the query.
+        batch_size (int, optional): Number of rows fetched per round trip. Defaults to 500.
+        cursor (str, optional): Only stream entries after this cursor.
+        since (datetime, optional): Only entries created at or after this time.
+        until (datetime, optional): Only entries created before this time.
+        columns (list, optional): Columns from entry_columns to fetch instead of whole entries.
+        tags (list, optional): Only entries carrying every one of these tags.
+
+    Yields:
+        JournalEntry: Journal entries, or rows of the given columns, ordered by (created_at, id).
+    """
+    statement = select_entries_after(cursor, since, until, columns, tags).execution_options(
+        yield_per=batch_size
+    )
+    result = db_session.execute(statement)
+    yield from (result if columns else result.scalars())
+
+
+def select_entries_by_ids(entry_ids, tags: list = None):
+    """
+    Select the journal entries with the given UUIDs in a single query.
+
+    Args:
+        entry_ids (list): Entry UUIDs, as strings or UUIDs.
+        tags (list, optional): Only entries carrying every one of these tags.
+
+    Returns:
+        Select: The ``WHERE id IN (...)`` statement.
+    """
+    return select(JournalEntry).where(
+        JournalEntry.id.in_([uuid.UUID(str(i)) for i in entry_ids]), *tagged_filter(tags)
+    )
+
+
+def rank_search_hits(scored_ids, entries):
+    """
+    Join ranked entry ids with their journal entries, keeping the ranking.
+
+    Ids whose entry no longer exists in the database are dropped.
+
+    Args:
+        scored_ids (list): (entry_id, score) pairs, best match first.
+        entries (iterable): The JournalEntry instances loaded for the ids.
+
+    Returns:
+        list: Dicts with ``rank``, ``score`` and the serialised ``entry``.
+    """
+    by_id = {str(entry.id): entry for entry in entries}
+    results = []
+    for entry_id, score in scored_ids:
+        entry = by_id.get(str(entry_id))
+        if entry is not None:
+            results.append({
+                "rank": len(results) + 1, "score": score, "entry": entry_to_dict(entry),
+            })
+    return results
+
+
+def select_keyword_matches(dialect_name: str, query: str, limit: int, tags: list = None):
+    """
+    Select the entries matching a keyword query, with their relevance score.
+
+    On PostgreSQL this uses the GIN-indexed ``search_vector`` column with
+    ``websearch_to_tsquery`` and ranks by ``ts_rank``. Other databases fall
+    back to a case-insensitive substring match, newest first.
+
+    Args:
+        dialect_name (str): The SQLAlchemy dialect name of the session's bind.
+        query (str): The keyword query, in web search syntax.
+        limit (int): Maximum number of rows.
+        tags (list, optional): Only entries carrying every one of these tags.
+
+    Returns:
+        Select: A statement yielding (JournalEntry, score) rows, best match first.
+    """
+    if dialect_name == "postgresql":
+        search_vector = literal_column("journal_entries.search_vector")
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        score = func.ts_rank(search_vector, ts_query)
+        return (
+            select(JournalEntry, score.label("score"))
+            .where(search_vector.op("@@")(ts_query), *tagged_filter(tags))
+            .order_by(score.desc(), JournalEntry.id)
+            .limit(limit)
+        )
+    return (
+        select(JournalEntry, literal(1.0).label("score"))
+        .where(or_(JournalEntry.title.icontains(query, autoescape=True),
+                   JournalEntry.content.icontains(query, autoescape=True)),
+               *tagged_filter(tags))
+        .order_by(JournalEntry.created_at.desc(), JournalEntry.id)
+        .limit(limit)
+    )
+
+
+def keyword_results(rows):
+    """Turn (JournalEntry, score) rows into ranked search results."""
+    return [
+        {"rank": rank, "score": float(score), "entry": entry_to_dict(entry)}
+        for rank, (entry, score) in enumerate(rows, start=1)
+    ]
+
+
+def fuse_rankings(rankings, limit: int, k: int = None):
+    """
+    Combine several rankings with reciprocal rank fusion.
+
+    Each id scores ``1 / (k + rank)`` in every ranking it appears in, and the
+    scores are summed, so ids ranked well by several sources rise to the top.
+
+    Args:
+        rankings (list): Lists of entry ids, best match first.
+        limit (int): Maximum number of fused results.
+        k (int, optional): The RRF damping constant. Defaults to settings.HYBRID_RRF_K.
+
+    Returns:
+        list: (entry_id, score) pairs, best match first.
+    """
+    k = k or settings.HYBRID_RRF_K
+    scores = defaultdict(float)
+    for ranking in rankings:
+        for rank, entry_id in enumerate(ranking, start=1):
+            scores[str(entry_id)] += 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+
+def hybrid_candidates(k: int) -> int:
+    """Return how many candidates each source contributes to a hybrid search for k results."""
+    return max(2 * k, settings.HYBRID_CANDIDATES)
+
+
+def search_journal_entries(db_session, query: str, k: int = 10, certainty: float = None,
+                           mode: str = "semantic", tags: list = None):
+    """
+    Search journal entries, reading through the cache (see search_cache_ttl).
+
+    Three modes are supported:
+
+    - ``semantic``: one query against the vector store (a nearText query for
+      Weaviate); matching entries are loaded with one ``WHERE id IN (...)`` query.
+    - ``keyword``: a Postgres full-text query ranked by ``ts_rank``.
+    - ``hybrid``: both of the above, combined with reciprocal rank fusion.
+
+    Tag filters are applied by each source: through the tag index in
+    Postgres and as a ``where`` filter in the vector store. Vector store hits
+    are checked against the tag index again when their entries are loaded, as
+    Postgres holds the current tags.
+
+    Args:
+        db_session: The database session used to load the entries.
+        query (str): The search text.
+        k (int, optional): Maximum number of results. Defaults to 10.
+        certainty (float, optional): Minimum certainty of vector store hits.
+        mode (str, optional): ``semantic``, ``keyword`` or ``hybrid``. Defaults to ``semantic``.
+        tags (list, optional): Only entries carrying every one of these tags.
+
+    Returns:
+        list: Dicts with ``rank``, ``score`` and ``entry``, best match first.
+
+    Raises:
+        Exception: If the vector store search fails.
+    """
+    dialect_name = db_session.get_bind().dialect.name
+    return run_plan(db_session, search_plan(dialect_name, query, k, certainty, mode, tags))
+
+
+def search_plan(dialect_name: str, query: str, k: int = 10, certainty: float = None,
+                mode: str = "semantic", tags: list = None):
+    """Plan of search_journal_entries, for a session of the given SQLAlchemy dialect."""
+    tags = normalize_tags(tags)
+    ttl = search_cache_ttl(get_cache())
+    if ttl != 0:
+        version = yield CacheCall("version", "search")
+        key = search_cache_key(version, query, k, certainty, mode, tags)
+        cached = yield CacheCall("get", key)
+        if cached is not None:
+            return cached
+
+    if mode == "keyword":
+        results = keyword_results((yield select_keyword_matches(dialect_name, query, k, tags)).all())
+    elif mode == "hybrid":
+        candidates = hybrid_candidates(k)
+        rows = (yield select_keyword_matches(dialect_name, query, candidates, tags)).all()
+        hits = yield VectorSearch(query, candidates, certainty, tags)
+        fused = fuse_rankings([[entry.id for entry, _ in rows], [hit["id"] for hit in hits]], k)
+        entries = [entry for entry, _ in rows]
+        keyword_ids = {str(entry.id) for entry in entries}
+        missing = [entry_id for entry_id, _ in fused if entry_id not in keyword_ids]
+        if missing:
+            entries += (yield select_entries_by_ids(missing, tags)).scalars().all()
+        results = rank_search_hits(fused, entries)
+    else:
+        hits = yield VectorSearch(query, k, certainty, tags)
+        results = []
+        if hits:
+            entries = (yield select_entries_by_ids([hit["id"] for hit in hits], tags)).scalars()
+            results = rank_search_hits([(hit["id"], hit["certainty"]) for hit in hits], entries)
+    if ttl != 0:
+        yield CacheCall("set", key, results, ttl)
+    return results
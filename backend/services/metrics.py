@@ -0,0 +1,387 @@
+"""
+Metrics module.
+
+This module keeps the service's Prometheus metrics and renders them in the
+Prometheus text exposition format for the ``/metrics`` endpoint. It needs no
+client library: counters and histograms are plain thread-safe maps keyed by
+label values, and gauges are computed from callbacks when scraped, optionally
+reusing the last result for a few seconds so scrapes stay cheap.
+
+Instrumentation lives next to what it measures:
+
+- HTTP request latency per route, from the middleware in backend.main.
+- SQL statement timings, connection hold times and new connections, from the
+  engine and pool events listened to by instrument_engine() in backend.database.
+- Pool checkout waits, from the pool classes built by timed_pool_class(),
+  which backend.database passes to every engine.
+- Weaviate call latency and failures, from backend.services.weaviate_client.
+- Indexing retries, from the outbox worker.
+
+Each process keeps its own metrics; the outbox worker can serve its own with
+serve_metrics().
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry = []
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class Metric:
+    """
+    Base class for a named metric with a fixed set of label names.
+
+    Attributes:
+        name (str): The metric name.
+        documentation (str): The HELP text.
+        labelnames (tuple): Names of the labels every sample carries.
+    """
+
+    type_name = None
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> list:
+        """Return the metric's exposition lines."""
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+
+
+class Counter(Metric):
+    """A monotonically increasing count per label set."""
+
+    type_name = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        """Increase the count of a label set by amount."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        """Return the current count of a label set."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> list:
+        with self._lock:
+            values = dict(self._values)
+        return super().render() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+
+class Histogram(Metric):
+    """
+    Observations counted into cumulative buckets per label set.
+
+    Attributes:
+        buckets (tuple): Upper bounds of the buckets, in seconds for timings.
+    """
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value: float, **labels):
+        """Record one observation for a label set."""
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["buckets"][index] += 1
+                    break
+            state["sum"] += value
+            state["count"] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time spent in the block, whether or not it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        """Return the number of observations of a label set."""
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state["count"] if state else 0
+
+    def render(self) -> list:
+        with self._lock:
+            values = {key: {**state, "buckets": list(state["buckets"])} for key, state in self._values.items()}
+        lines = super().render()
+        for key, state in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, state["buckets"]):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state['sum'])}")
+            lines.append(f"{self.name}_count{labels} {state['count']}")
+        return lines
+
+
+class Gauge(Metric):
+    """
+    A value computed when the metrics are scraped.
+
+    Attributes:
+        collect (callable): Returns (labels dict, value) pairs; it is called on
+            scrapes, and a failure only drops this gauge from the output.
+        ttl (float): Seconds the collected samples are reused by later scrapes;
+            0 collects on every scrape.
+    """
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), collect=None, ttl: float = 0.0):
+        super().__init__(name, documentation, labelnames)
+        self.collect = collect
+        self.ttl = ttl
+        self._samples = None
+        self._expires = 0.0
+
+    def _collect(self) -> list:
+        with self._lock:
+            if self._samples is not None and time.monotonic() < self._expires:
+                return self._samples
+            samples = list(self.collect()) if self.collect else []
+            self._samples, self._expires = samples, time.monotonic() + self.ttl
+            return samples
+
+    def render(self) -> list:
+        try:
+            samples = self._collect()
+        except Exception as excep:  # A broken source must not break the whole scrape
+            logger.warning("Could not collect metric %s: %s", self.name, excep)
+            return []
+        return super().render() + [
+            f"{self.name}{_format_labels(self.labelnames, self._key(labels))} {_format_value(value)}"
+            for labels, value in samples
+        ]
+
+
+def render() -> str:
+    """
+    Render every registered metric in the Prometheus text format.
+
+    Returns:
+        str: The exposition document.
+    """
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time until the response headers were sent, per route.",
+    ("method", "route", "status"),
+)
+DB_STATEMENT_DURATION = Histogram(
+    "db_statement_duration_seconds",
+    "Time spent executing SQL statements, per engine and statement type.",
+    ("engine", "operation"),
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent acquiring a pooled database connection, including waiting for one to be returned.",
+    ("engine",),
+)
+DB_POOL_CONNECTION_HOLD = Histogram(
+    "db_pool_connection_hold_seconds",
+    "Time a pooled database connection stayed checked out, from checkout to checkin.",
+    ("engine",),
+)
+DB_POOL_CONNECTIONS_OPENED = Counter(
+    "db_pool_connections_opened_total",
+    "New database connections opened by the pool.",
+    ("engine",),
+)
+WEAVIATE_REQUEST_DURATION = Histogram(
+    "weaviate_request_duration_seconds",
+    "Latency of Weaviate requests, per operation.",
+    ("operation",),
+)
+WEAVIATE_FAILURES = Counter(
+    "weaviate_request_failures_total",
+    "Weaviate requests that failed, per operation.",
+    ("operation",),
+)
+INDEXING_RETRIES = Counter(
+    "indexing_retries_total",
+    "Indexing attempts that failed and were scheduled for another try.",
+    ("source",),
+)
+EMBEDDED_PASSAGES = Counter(
+    "embedded_passages_total",
+    "Passages given a vector, per source: computed by the embedder or reused from the cache.",
+    ("source",),
+)
+
+
+@contextmanager
+def track_weaviate(operation: str):
+    """
+    Time a Weaviate request and count it as failed if the block raises.
+
+    Args:
+        operation (str): The request kind, such as ``batch`` or ``graphql``.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        WEAVIATE_FAILURES.inc(operation=operation)
+        raise
+    finally:
+        WEAVIATE_REQUEST_DURATION.observe(time.perf_counter() - start, operation=operation)
+
+
+def _statement_operation(statement: str) -> str:
+    words = statement.lstrip().split(None, 1)
+    return words[0].upper() if words else ""
+
+
+def timed_pool_class(pool_class, name: str):
+    """
+    Build a subclass of a pool class that times every checkout.
+
+    ``connect()`` covers the whole acquisition: waiting while the pool is
+    exhausted, opening a new connection and the pre-ping. A disposed engine's
+    pool is recreated from the same class, so it keeps being timed.
+
+    Args:
+        pool_class (type): The Pool class the engine would use.
+        name (str): The ``engine`` label of db_pool_checkout_wait_seconds.
+
+    Returns:
+        type: The timed pool class, to be passed as ``poolclass``.
+    """
+    def connect(self):
+        with DB_POOL_CHECKOUT_WAIT.time(engine=name):
+            return pool_class.connect(self)
+
+    return type(f"Timed{pool_class.__name__}", (pool_class,), {"connect": connect})
+
+
+def instrument_engine(engine, name: str):
+    """
+    Record SQL statement timings and connection pool activity for an engine.
+
+    Pool events are listened to on the engine, so they also apply to the new
+    pool that replaces the old one when the engine is disposed.
+
+    Args:
+        engine (Engine): A sync engine, or the ``sync_engine`` of an AsyncEngine.
+        name (str): The ``engine`` label of its metrics.
+    """
+    def observe_statement(conn, statement: str):
+        start = conn.info.pop("query_start_time", None)
+        if start is not None:
+            DB_STATEMENT_DURATION.observe(
+                time.perf_counter() - start, engine=name, operation=_statement_operation(statement)
+            )
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_start_time"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        observe_statement(conn, statement)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        # after_cursor_execute is skipped when a statement fails; time it here,
+        # so its start time does not linger on the connection.
+        if context.connection is not None:
+            observe_statement(context.connection, context.statement or "")
+
+    @event.listens_for(engine, "connect")
+    def connect(dbapi_connection, connection_record):
+        DB_POOL_CONNECTIONS_OPENED.inc(engine=name)
+
+    @event.listens_for(engine, "checkout")
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checkout_time"] = time.perf_counter()
+
+    @event.listens_for(engine, "checkin")
+    def checkin(dbapi_connection, connection_record):
+        start = connection_record.info.pop("checkout_time", None)
+        if start is not None:
+            DB_POOL_CONNECTION_HOLD.observe(time.perf_counter() - start, engine=name)
+
+
+def serve_metrics(port: int):
+    """
+    Serve ``/metrics`` from a background thread, for processes without the API.
+
+    Args:
+        port (int): The TCP port to listen on.
+
+    Returns:
+        ThreadingHTTPServer: The running server.
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("", port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    logger.info("Serving metrics on port %d", port)
+    return server
@@ -0,0 +1,123 @@
+"""
+Query plans module.
+
+Service functions that run queries and shape their results are written once,
+as plans shared by the sync and async service layers. A plan is a generator
+that yields the steps it needs run and receives their results:
+
+- a SQLAlchemy statement receives its ``Result``;
+- a VectorSearch receives the vector store's hits;
+- a CacheCall receives the return value of a method of the process-wide cache.
+
+The value the plan returns is the result of the service function. run_plan
+runs a plan on a Session, and arun_plan on an AsyncSession, awaiting the
+vector store's ``asearch`` and running calls to a shared cache in a thread.
+So both paths run the same statements through the same logic, and the async
+service functions never block the event loop.
+"""
+
+import asyncio
+
+from backend.services.cache import get_cache
+from backend.services.vector_store import get_vector_store
+
+
+class VectorSearch:
+    """
+    Plan step searching the vector store.
+
+    Attributes:
+        query (str): The search text.
+        limit (int): Maximum number of hits.
+        certainty (float): Minimum certainty of returned hits, or None.
+        tags (list): Only entries carrying all of these tags, or None.
+    """
+
+    def __init__(self, query: str, limit: int, certainty: float = None, tags: list = None):
+        self.query = query
+        self.limit = limit
+        self.certainty = certainty
+        self.tags = tags
+
+    def run(self, vector_store) -> list:
+        """Run the search on a vector store."""
+        return vector_store.search(self.query, limit=self.limit, certainty=self.certainty, tags=self.tags)
+
+    async def arun(self, vector_store) -> list:
+        """Run the search on a vector store without blocking the event loop."""
+        return await vector_store.asearch(self.query, limit=self.limit, certainty=self.certainty,
+                                          tags=self.tags)
+
+
+class CacheCall:
+    """
+    Plan step calling a method of the process-wide cache.
+
+    Attributes:
+        method (str): The Cache method, such as ``get`` or ``bump``.
+        args (tuple): Its positional arguments.
+    """
+
+    def __init__(self, method: str, *args):
+        self.method = method
+        self.args = args
+
+    def run(self, cache):
+        """Call the method on a cache."""
+        return getattr(cache, self.method)(*self.args)
+
+    async def arun(self, cache):
+        """Call the method on a cache, in a thread if it is shared, as it then does network I/O."""
+        if cache.shared:
+            return await asyncio.to_thread(self.run, cache)
+        return self.run(cache)
+
+
+def run_plan(db_session, plan):
+    """
+    Run a plan on a synchronous session.
+
+    Args:
+        db_session (Session): The session executing the plan's statements, or
+            None for plans that run none.
+        plan (generator): The plan.
+
+    Returns:
+        The value returned by the plan.
+    """
+    try:
+        step = next(plan)
+        while True:
+            if isinstance(step, VectorSearch):
+                step = plan.send(step.run(get_vector_store()))
+            elif isinstance(step, CacheCall):
+                step = plan.send(step.run(get_cache()))
+            else:
+                step = plan.send(db_session.execute(step))
+    except StopIteration as stop:
+        return stop.value
+
+
+async def arun_plan(db_session, plan):
+    """
+    Run a plan on an AsyncSession.
+
+    Args:
+        db_session (AsyncSession): The session executing the plan's statements, or
+            None for plans that run none.
+        plan (generator): The plan.
+
+    Returns:
+        The value returned by the plan.
+    """
+    try:
+        step = next(plan)
+        while True:
+            if isinstance(step, VectorSearch):
+                step = plan.send(await step.arun(get_vector_store()))
+            elif isinstance(step, CacheCall):
+                step = plan.send(await step.arun(get_cache()))
+            else:
+                step = plan.send(await db_session.execute(step))
+    except StopIteration as stop:
+        return stop.value
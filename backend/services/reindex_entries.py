@@ -1,50 +1,406 @@
-import requests
+"""
+Reindex module for rebuilding the vector index from Postgres.
+
+This module pages through every journal entry in Postgres with the keyset cursor,
+one query per batch, sends the batches as upserts against the configured vector store (Weaviate
+batch import requests by default) and keeps several batches in flight at once. Objects keep the UUID of their journal entry, so a rebuild
+never creates duplicates. Progress is checkpointed to disk after each completed
+batch, so an interrupted rebuild resumes where it stopped.
+
+The incremental mode only sends entries whose ``content_hash`` differs from the
+``indexed_hash`` recorded when they were last indexed, found through a partial
+index. With ``--verify`` it first walks the vector store's ids and the
+journal's ids side by side, in UUID order and in chunks, to re-queue entries
+the store is missing and delete orphaned objects.
+
+Both modes send each entry's stored tags along, so rebuilt objects stay
+filterable by tag.
+
+Run it with:
+
+    python -m backend.services.reindex_entries [--restart]
+    python -m backend.services.reindex_entries --incremental [--verify]
+"""
+
+import argparse
+import json
 import os
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import func, select, update
+from backend.core.config import settings
+from backend.database import SessionLocal
+from backend.models.journal import JournalEntry, unindexed_filter
+from backend.services.journal_service import encode_cursor, list_journal_entries
+from backend.services.tagging import entry_tags
+from backend.services.vector_store import get_vector_store
+
+
+def load_checkpoint(path: str):
+    """
+    Load the reindex checkpoint, if any.
+
+    Args:
+        path (str): Path of the checkpoint file.
+
+    Returns:
+        dict: The checkpoint with ``cursor`` and ``indexed`` keys, or None.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as checkpoint_file:
+        return json.load(checkpoint_file)
+
+
+def save_checkpoint(path: str, cursor: str, indexed: int):
+    """
+    Atomically write the reindex checkpoint.
+
+    Args:
+        path (str): Path of the checkpoint file.
+        cursor (str): Cursor of the last entry of the last completed batch.
+        indexed (int): Number of entries indexed so far.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as checkpoint_file:
+        json.dump({"cursor": cursor, "indexed": indexed}, checkpoint_file)
+    os.replace(tmp_path, path)
+
+
+def iter_entry_batches(db_session, batch_size: int, cursor: str = None):
+    """
+    Read journal entries in batches, one keyset page per query.
+
+    No cursor stays open between batches, so the same session can record
+    index state in between.
+
+    Args:
+        db_session: The database session used for the queries.
+        batch_size (int): Number of entries per batch.
+        cursor (str, optional): Only include entries after this cursor.
+
+    Yields:
+        tuple: A list of (entry_id, content) pairs and the cursor of its last entry.
+    """
+    while True:
+        entries, next_cursor = list_journal_entries(db_session, limit=batch_size, cursor=cursor)
+        if not entries:
+            return
+        cursor = encode_cursor(entries[-1])
+        yield [(entry.id, entry.content) for entry in entries], cursor
+        if next_cursor is None:
+            return
+
+
+def report_batch_errors(errors: dict) -> int:
+    """
+    Print and count the entries that the vector store rejected in a batch.
+
+    Args:
+        errors (dict): Error messages keyed by entry id, as returned by VectorStore.upsert.
+
+    Returns:
+        int: The number of entries with errors.
+    """
+    for entry_id, error in errors.items():
+        print(f"Failed to index entry {entry_id}: {error}")
+    return len(errors)
+
+
+def mark_indexed(db_session, entry_ids):
+    """
+    Record that the current content of the given entries is in the vector store.
+
+    Args:
+        db_session: The database session used for the update; it is committed.
+        entry_ids (list): UUIDs of the entries that were indexed.
+    """
+    if entry_ids:
+        db_session.execute(
+            update(JournalEntry)
+            .where(JournalEntry.id.in_(entry_ids))
+            .values(indexed_hash=JournalEntry.content_hash, indexed_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+    db_session.commit()
+
+
+def upsert_batches(batches, vector_store, concurrency: int, on_batch, tags_for=None):
+    """
+    Upsert batches into the vector store with several requests in flight.
+
+    Batches are submitted in order and at most ``concurrency`` of them are in
+    flight. on_batch and tags_for are called in the calling thread, in
+    submission order.
+
+    Args:
+        batches (iterable): (batch, token) pairs, where batch is a list of
+            (entry_id, content) pairs and token is passed back to on_batch.
+        vector_store (VectorStore): The store to upsert into.
+        concurrency (int): Maximum number of batches in flight.
+        on_batch (callable): Called with (batch, token, errors) once a batch completes.
+        tags_for (callable, optional): Called with a batch before it is
+            submitted; returns the tags of its entries keyed by string id.
+    """
+    in_flight = deque()
+
+    def complete_oldest():
+        future, batch, token = in_flight.popleft()
+        on_batch(batch, token, future.result())
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for batch, token in batches:
+            if len(in_flight) >= concurrency:
+                complete_oldest()
+            tags = tags_for(batch) if tags_for else None
+            in_flight.append((executor.submit(vector_store.upsert, batch, tags), batch, token))
+        while in_flight:
+            complete_oldest()
+
+
+def indexed_ids(batch, errors: dict) -> list:
+    """Return the ids of a batch's entries that the vector store accepted."""
+    return [entry_id for entry_id, _ in batch if str(entry_id) not in errors]
+
+
+def stored_tags(db_session):
+    """Return a tags_for callable for upsert_batches reading the stored tags of each batch."""
+    return lambda batch: entry_tags(db_session, [entry_id for entry_id, _ in batch])
+
+
+def reindex_all_entries(batch_size: int = None, concurrency: int = None,
+                        checkpoint_path: str = None, restart: bool = False):
+    """
+    Re-index every journal entry in the vector store using batch upserts.
+
+    Batches are submitted in order and at most ``concurrency`` of them are in
+    flight. The checkpoint only advances past a batch once it and every batch
+    before it have completed. Accepted entries are marked as indexed, so a
+    later incremental sync skips them.
+
+    Args:
+        batch_size (int, optional): Defaults to settings.REINDEX_BATCH_SIZE.
+        concurrency (int, optional): Defaults to settings.REINDEX_CONCURRENCY.
+        checkpoint_path (str, optional): Defaults to settings.REINDEX_CHECKPOINT_PATH.
+        restart (bool, optional): Ignore any existing checkpoint. Defaults to False.
+
+    Returns:
+        tuple: The number of entries sent and the number the vector store rejected.
+    """
+    batch_size = batch_size or settings.REINDEX_BATCH_SIZE
+    vector_store = get_vector_store()
+    concurrency = concurrency or settings.REINDEX_CONCURRENCY
+    checkpoint_path = checkpoint_path or settings.REINDEX_CHECKPOINT_PATH
+
+    checkpoint = None if restart else load_checkpoint(checkpoint_path)
+    cursor = checkpoint["cursor"] if checkpoint else None
+    indexed = checkpoint["indexed"] if checkpoint else 0
+    failed = 0
+    if checkpoint:
+        print(f"Resuming reindex after {indexed} entries.")
+
+    db_session = SessionLocal()
+
+    def on_batch(batch, batch_cursor, errors):
+        nonlocal indexed, failed
+        failed += report_batch_errors(errors)
+        mark_indexed(db_session, indexed_ids(batch, errors))
+        indexed += len(batch)
+        save_checkpoint(checkpoint_path, batch_cursor, indexed)
+        print(f"Indexed {indexed} entries.")
+
+    try:
+        upsert_batches(iter_entry_batches(db_session, batch_size, cursor),
+                       vector_store, concurrency, on_batch, stored_tags(db_session))
+    finally:
+        db_session.close()
+
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    print(f"Re-indexed {indexed} entries ({failed} failed).")
+    return indexed, failed
+
+
+def iter_entry_ids(db_session, chunk_size: int):
+    """
+    Stream the id of every journal entry in UUID order, one keyset page at a time.
+
+    Args:
+        db_session: The database session used for the queries.
+        chunk_size (int): Number of ids fetched per query.
+
+    Yields:
+        str: Entry ids in ascending order.
+    """
+    last_id = None
+    while True:
+        statement = select(JournalEntry.id).order_by(JournalEntry.id).limit(chunk_size)
+        if last_id is not None:
+            statement = statement.where(JournalEntry.id > last_id)
+        ids = db_session.execute(statement).scalars().all()
+        if not ids:
+            return
+        yield from (str(entry_id) for entry_id in ids)
+        last_id = ids[-1]
+
+
+def diff_index(journal_ids, store_ids):
+    """
+    Compare two ascending id streams with a merge join.
+
+    Args:
+        journal_ids (iterable): Entry ids in Postgres, in ascending order.
+        store_ids (iterable): Entry ids in the vector store, in ascending order.
+
+    Yields:
+        tuple: (``"missing"``, id) for ids only in Postgres and (``"orphan"``, id)
+        for ids only in the vector store.
+    """
+    journal_ids, store_ids = iter(journal_ids), iter(store_ids)
+    journal_id, store_id = next(journal_ids, None), next(store_ids, None)
+    while journal_id is not None or store_id is not None:
+        if store_id is None or (journal_id is not None and journal_id < store_id):
+            yield "missing", journal_id
+            journal_id = next(journal_ids, None)
+        elif journal_id is None or store_id < journal_id:
+            yield "orphan", store_id
+            store_id = next(store_ids, None)
+        else:
+            journal_id, store_id = next(journal_ids, None), next(store_ids, None)
+
+
+def verify_index(db_session, vector_store, chunk_size: int = None):
+    """
+    Reconcile the vector store's ids with Postgres.
+
+    Entries missing from the store get their index state cleared, so the next
+    incremental pass sends them, and orphaned objects are deleted from the
+    store. Both id streams are read and acted on in chunks, so memory use does
+    not grow with the size of the journal.
+
+    Args:
+        db_session: The database session used for the queries; it is committed.
+        vector_store (VectorStore): The store to check.
+        chunk_size (int, optional): Defaults to settings.REINDEX_ID_CHUNK_SIZE.
+
+    Returns:
+        tuple: The number of missing entries and of orphaned objects.
+    """
+    chunk_size = chunk_size or settings.REINDEX_ID_CHUNK_SIZE
+    store_ids = (entry_id for chunk in vector_store.iter_ids(chunk_size) for entry_id in chunk)
+    pending = {"missing": [], "orphan": []}
+    counts = {"missing": 0, "orphan": 0}
+
+    def flush(kind):
+        ids = pending[kind]
+        if kind == "missing":
+            db_session.execute(
+                update(JournalEntry)
+                .where(JournalEntry.id.in_([uuid.UUID(entry_id) for entry_id in ids]))
+                .values(indexed_hash=None, indexed_at=None)
+                .execution_options(synchronize_session=False)
+            )
+            db_session.commit()
+        else:
+            vector_store.delete(ids)
+        counts[kind] += len(ids)
+        pending[kind] = []
+
+    for kind, entry_id in diff_index(iter_entry_ids(db_session, chunk_size), store_ids):
+        pending[kind].append(entry_id)
+        if len(pending[kind]) >= chunk_size:
+            flush(kind)
+    for kind in pending:
+        if pending[kind]:
+            flush(kind)
+    print(f"Vector store is missing {counts['missing']} entries and has {counts['orphan']} orphans.")
+    return counts["missing"], counts["orphan"]
+
+
+def iter_unindexed_batches(db_session, batch_size: int):
+    """
+    Group the entries whose vector is missing or stale into batches.
+
+    Pages are read by id through the partial ``ix_journal_entries_unindexed``
+    index, each with its own query, so marking batches as indexed in between
+    does not disturb the scan and failed entries are not retried in the same run.
+
+    Args:
+        db_session: The database session used for the queries.
+        batch_size (int): Number of entries per batch.
+
+    Yields:
+        tuple: A list of (entry_id, content) pairs and None.
+    """
+    last_id = None
+    while True:
+        statement = (
+            select(JournalEntry.id, JournalEntry.content)
+            .where(unindexed_filter())
+            .order_by(JournalEntry.id)
+            .limit(batch_size)
+        )
+        if last_id is not None:
+            statement = statement.where(JournalEntry.id > last_id)
+        batch = [tuple(row) for row in db_session.execute(statement)]
+        if not batch:
+            return
+        yield batch, None
+        last_id = batch[-1][0]
+
+
+def sync_entries(batch_size: int = None, concurrency: int = None, verify: bool = False):
+    """
+    Index only the entries that changed since they were last indexed.
+
+    Args:
+        batch_size (int, optional): Defaults to settings.REINDEX_BATCH_SIZE.
+        concurrency (int, optional): Defaults to settings.REINDEX_CONCURRENCY.
+        verify (bool, optional): First reconcile the vector store's ids with
+            Postgres, re-queueing missing entries and deleting orphans. Defaults to False.
+
+    Returns:
+        tuple: The number of entries sent and the number the vector store rejected.
+    """
+    batch_size = batch_size or settings.REINDEX_BATCH_SIZE
+    concurrency = concurrency or settings.REINDEX_CONCURRENCY
+    vector_store = get_vector_store()
+    indexed = failed = 0
+
+    db_session = SessionLocal()
+
+    def on_batch(batch, _, errors):
+        nonlocal indexed, failed
+        failed += report_batch_errors(errors)
+        mark_indexed(db_session, indexed_ids(batch, errors))
+        indexed += len(batch)
+        print(f"Indexed {indexed} changed entries.")
+
+    try:
+        if verify:
+            verify_index(db_session, vector_store)
+        upsert_batches(iter_unindexed_batches(db_session, batch_size),
+                       vector_store, concurrency, on_batch, stored_tags(db_session))
+    finally:
+        db_session.close()
+
+    print(f"Synced {indexed} entries ({failed} failed).")
+    return indexed, failed
+
 
-# Use your environment variables or hard-code for testing
-SECOND_BRAIN_API = "http://localhost:8000"
-WEAVIATE_URL = os.getenv("WEAVIATE_URL", "http://localhost:8080")
-
-def fetch_all_entries():
-    """Fetch all journal entries from Second Brain."""
-    url = f"{SECOND_BRAIN_API}/entries/"
-    response = requests.get(url)
-    response.raise_for_status()
-    return response.json()
-
-def index_entry_in_weaviate(entry_id: str, content: str):
-    """
-    Send the entry content to Weaviate for vectorization and indexing.
-    Adjust the payload format as needed by your Weaviate client.
-    """
-    # Depending on your indexing implementation, this could be a POST to your custom endpoint,
-    # or using the Weaviate REST API for objects.
-    # For example, let's assume you use Weaviate's v1/objects endpoint:
-    url = f"{WEAVIATE_URL}/v1/objects"
-    
-    # Build the payload. Here we assume your JournalEntry class only has the 'content' field.
-    payload = {
-        "class": "JournalEntry",
-        "properties": {
-            "content": content
-        }
-    }
-    response = requests.post(url, json=payload)
-    response.raise_for_status()
-    print(f"Indexed entry {entry_id}: {response.json()}")
-
-def reindex_all_entries():
-    """Fetch all entries and re-index them in Weaviate."""
-    entries = fetch_all_entries()
-    print(f"Found {len(entries)} entries to re-index.")
-    for entry in entries:
-        entry_id = entry.get("id")
-        content = entry.get("content")
-        if entry_id and content:
-            try:
-                index_entry_in_weaviate(entry_id, content)
-            except Exception as e:
-                print(f"Failed to index entry {entry_id}: {e}")
-
-if __name__ == "__main__": #TODO change this in the future when weaviate is persistant 
-    reindex_all_entries()
+if __name__ == "__main__": #TODO change this in the future when weaviate is persistant
+    parser = argparse.ArgumentParser(description="Rebuild the vector index from Postgres.")
+    parser.add_argument("--batch-size", type=int, help="Objects per batch import request.")
+    parser.add_argument("--concurrency", type=int, help="Batch requests kept in flight.")
+    parser.add_argument("--checkpoint", help="Checkpoint file used to resume.")
+    parser.add_argument("--restart", action="store_true", help="Ignore any existing checkpoint.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only index entries changed since they were last indexed.")
+    parser.add_argument("--verify", action="store_true",
+                        help="With --incremental, reconcile vector store ids with Postgres first.")
+    args = parser.parse_args()
+    if args.incremental:
+        sync_entries(args.batch_size, args.concurrency, args.verify)
+    else:
+        reindex_all_entries(args.batch_size, args.concurrency, args.checkpoint, args.restart)
@@ -0,0 +1,244 @@
+"""
+Related entries module.
+
+This module precomputes the RELATED_ENTRIES_LIMIT nearest neighbours of every
+journal entry into the ``journal_entry_neighbors`` table, so
+``/entries/{id}/related`` is served by one query on its (source_id, score)
+index and page views never run a vector search.
+
+Neighbours are found through the vector store in batches of
+RELATED_BATCH_SIZE entries, one request per batch. A refresh is incremental:
+only entries whose vectors are current but whose neighbours were computed for
+other content (``related_hash`` differs from ``content_hash``), found through a
+partial index, are recomputed. Each recomputed entry is also offered to the
+neighbour lists of its own neighbours, replacing their weakest neighbour if it
+is closer, so new entries show up next to older ones without recomputing them.
+A full refresh recomputes every entry.
+
+Refresh it periodically, for example from cron, with:
+
+    python -m backend.services.related [--full]
+"""
+
+import argparse
+import logging
+import uuid
+from collections import defaultdict
+from sqlalchemy import delete, insert, select, tuple_, update
+from backend.core.config import settings
+from backend.database import SessionLocal
+from backend.models.journal import JournalEntry, unrelated_filter
+from backend.models.neighbors import JournalEntryNeighbor
+from backend.services.plans import run_plan
+from backend.services.vector_store import get_vector_store
+
+logger = logging.getLogger(__name__)
+
+
+def select_related_entries(entry_id, limit: int, columns: list = None):
+    """
+    Select the precomputed related entries of an entry, closest first.
+
+    Args:
+        entry_id: The UUID of the entry.
+        limit (int): Maximum number of related entries.
+        columns (list, optional): Entry columns to select, from
+            journal_service.entry_columns; the whole entry by default.
+
+    Returns:
+        Select: A statement yielding rows of the ``score`` and the entry
+        columns, answered from the (source_id, score) index.
+    """
+    return (
+        select(JournalEntryNeighbor.score, *(columns or [JournalEntry]))
+        .join(JournalEntry, JournalEntry.id == JournalEntryNeighbor.neighbor_id)
+        .where(JournalEntryNeighbor.source_id == entry_id)
+        .order_by(JournalEntryNeighbor.score.desc())
+        .limit(limit)
+    )
+
+
+def related_entries(db_session, entry_id, limit: int = None, columns: list = None) -> list:
+    """
+    Return the precomputed related entries of an entry.
+
+    Args:
+        db_session: The database session used for the query.
+        entry_id: The UUID of the entry.
+        limit (int, optional): Maximum number of related entries. Defaults to
+            settings.RELATED_ENTRIES_LIMIT.
+        columns (list, optional): Entry columns to select; the whole entry by default.
+
+    Returns:
+        list: Rows with the ``score`` and the entry columns, closest first;
+        empty for unknown entries and entries not computed yet.
+    """
+    return run_plan(db_session, related_entries_plan(entry_id, limit, columns))
+
+
+def related_entries_plan(entry_id, limit: int = None, columns: list = None):
+    """Plan of related_entries."""
+    limit = limit or settings.RELATED_ENTRIES_LIMIT
+    return (yield select_related_entries(entry_id, limit, columns)).all()
+
+
+def select_pending(after=None, batch_size: int = None, full: bool = False):
+    """
+    Select the next batch of entries whose related entries need computing.
+
+    Only entries whose vectors are current are selected, since their
+    neighbours are looked up from their stored vectors.
+
+    Args:
+        after (uuid, optional): The last entry id of the previous batch.
+        batch_size (int, optional): Maximum number of entries. Defaults to settings.RELATED_BATCH_SIZE.
+        full (bool, optional): Select every indexed entry, not only stale ones. Defaults to False.
+
+    Returns:
+        Select: A statement yielding (id, content_hash) rows in id order.
+    """
+    query = select(JournalEntry.id, JournalEntry.content_hash).where(
+        JournalEntry.indexed_hash == JournalEntry.content_hash
+    )
+    if not full:
+        query = query.where(unrelated_filter())
+    if after is not None:
+        query = query.where(JournalEntry.id > after)
+    return query.order_by(JournalEntry.id).limit(batch_size or settings.RELATED_BATCH_SIZE)
+
+
+def offer_neighbors(db_session, pairs: list, limit: int):
+    """
+    Add entries to the neighbour lists of their own neighbours, if close enough.
+
+    Each list keeps its limit closest entries, so an offered entry replaces
+    the weakest neighbour of a full list only when it is closer.
+
+    Args:
+        db_session: The database session used for the writes; the caller commits.
+        pairs (list): Dicts with ``source_id``, ``neighbor_id`` and ``score``
+            of freshly computed neighbours; each source is offered to its neighbour.
+        limit (int): Maximum number of neighbours per entry.
+    """
+    offers = defaultdict(dict)
+    for pair in pairs:
+        offers[pair["neighbor_id"]][pair["source_id"]] = pair["score"]
+    if not offers:
+        return
+    current = defaultdict(dict)
+    for source_id, neighbor_id, score in db_session.execute(
+        select(JournalEntryNeighbor.source_id, JournalEntryNeighbor.neighbor_id, JournalEntryNeighbor.score)
+        .where(JournalEntryNeighbor.source_id.in_(list(offers)))
+    ):
+        current[source_id][neighbor_id] = score
+
+    dropped, added = [], []
+    for target, offered in offers.items():
+        before = current[target]
+        merged = {**offered, **before}
+        kept = dict(sorted(merged.items(), key=lambda item: -item[1])[:limit])
+        dropped += [(target, neighbor_id) for neighbor_id in before if neighbor_id not in kept]
+        added += [
+            {"source_id": target, "neighbor_id": neighbor_id, "score": score}
+            for neighbor_id, score in kept.items() if neighbor_id not in before
+        ]
+    if dropped:
+        db_session.execute(
+            delete(JournalEntryNeighbor).where(
+                tuple_(JournalEntryNeighbor.source_id, JournalEntryNeighbor.neighbor_id).in_(dropped)
+            )
+        )
+    if added:
+        db_session.execute(insert(JournalEntryNeighbor), added)
+
+
+def refresh_batch(db_session, rows: list, vector_store, limit: int, full: bool = False) -> int:
+    """
+    Recompute and store the related entries of one batch of entries.
+
+    Args:
+        db_session: The database session used for the writes; the caller commits.
+        rows (list): (id, content_hash) rows from select_pending.
+        vector_store (VectorStore): The store the neighbours are looked up in.
+        limit (int): Maximum number of neighbours per entry.
+        full (bool, optional): Skip offering entries to their neighbours'
+            lists, since every list is recomputed anyway. Defaults to False.
+
+    Returns:
+        int: The number of entries recomputed; entries missing from the
+        vector store are skipped and stay pending.
+    """
+    hashes = {str(entry_id): content_hash for entry_id, content_hash in rows}
+    found = vector_store.neighbors(list(hashes), limit=limit)
+    sources = [uuid.UUID(entry_id) for entry_id in found]
+    if not sources:
+        return 0
+    # Objects left in the vector store for deleted entries are dropped here.
+    candidates = {uuid.UUID(hit["id"]) for hits in found.values() for hit in hits}
+    existing = set(db_session.execute(
+        select(JournalEntry.id).where(JournalEntry.id.in_(list(candidates)))
+    ).scalars()) if candidates else set()
+    pairs = [
+        {"source_id": uuid.UUID(entry_id), "neighbor_id": uuid.UUID(hit["id"]), "score": hit["certainty"]}
+        for entry_id, hits in found.items()
+        for hit in hits
+        if uuid.UUID(hit["id"]) in existing
+    ]
+
+    db_session.execute(delete(JournalEntryNeighbor).where(JournalEntryNeighbor.source_id.in_(sources)))
+    if pairs:
+        db_session.execute(insert(JournalEntryNeighbor), pairs)
+    if not full:
+        recomputed = set(sources)
+        offer_neighbors(db_session, [pair for pair in pairs if pair["neighbor_id"] not in recomputed], limit)
+    # The hash read before the lookup is recorded, so an entry edited meanwhile stays pending.
+    db_session.execute(
+        update(JournalEntry),
+        [{"id": source_id, "related_hash": hashes[str(source_id)]} for source_id in sources],
+    )
+    return len(sources)
+
+
+def refresh_related_entries(db_session, full: bool = False, batch_size: int = None,
+                            limit: int = None, vector_store=None) -> int:
+    """
+    Recompute the related entries of new and changed entries.
+
+    Each batch is committed on its own, so an interrupted refresh keeps its
+    progress.
+
+    Args:
+        db_session: The database session used for the refresh.
+        full (bool, optional): Recompute every indexed entry. Defaults to False.
+        batch_size (int, optional): Entries per vector store request. Defaults to settings.RELATED_BATCH_SIZE.
+        limit (int, optional): Neighbours kept per entry. Defaults to settings.RELATED_ENTRIES_LIMIT.
+        vector_store (VectorStore, optional): Defaults to get_vector_store().
+
+    Returns:
+        int: The number of entries recomputed.
+
+    Raises:
+        WeaviateError: If the vector store cannot be queried.
+    """
+    vector_store = vector_store or get_vector_store()
+    limit = limit or settings.RELATED_ENTRIES_LIMIT
+    refreshed = 0
+    after = None
+    while True:
+        rows = db_session.execute(select_pending(after, batch_size, full)).all()
+        if not rows:
+            break
+        refreshed += refresh_batch(db_session, rows, vector_store, limit, full)
+        db_session.commit()
+        after = rows[-1].id
+        logger.info("Computed related entries of %s entries", refreshed)
+    return refreshed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute the related entries of journal entries.")
+    parser.add_argument("--full", action="store_true", help="Recompute every entry instead of new and changed ones.")
+    parser.add_argument("--batch-size", type=int, help="Entries per vector store request.")
+    args = parser.parse_args()
+    with SessionLocal() as db_session:
+        print(f"Computed related entries of {refresh_related_entries(db_session, args.full, args.batch_size)} entries")
@@ -0,0 +1,134 @@
+"""
+Retry helpers for calls to external services.
+
+This module provides the jittered exponential backoff used when indexing is
+retried, and a circuit breaker that stops calling a service that keeps
+failing. While the circuit is open, calls fail immediately instead of waiting
+on timeouts. Once ``reset_timeout`` has passed, a single call is let through
+as a probe: if it succeeds the circuit closes again, otherwise it stays open
+for another period.
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 300.0) -> float:
+    """
+    Return the delay before retry number ``attempt``, with full jitter.
+
+    The delay is drawn uniformly between 0 and ``min(cap, base * 2 ** attempt)``.
+    Retries of jobs that failed together therefore spread out over the whole
+    window instead of all arriving at the same moment.
+
+    Args:
+        attempt (int): The number of failed attempts so far, from 1.
+        base (float, optional): Delay of the first retry before jitter. Defaults to 1.0.
+        cap (float, optional): Maximum delay in seconds. Defaults to 300.0.
+
+    Returns:
+        float: The delay in seconds.
+    """
+    ceiling = min(cap, base * 2 ** min(attempt, 32))
+    return random.uniform(0, ceiling)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a service whose circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Fails calls fast while a service is unhealthy.
+
+    The circuit opens after ``failure_threshold`` consecutive failures. While
+    it is open, guard() raises CircuitOpenError without running the call. Once
+    reset_timeout seconds have passed, one call is let through as a probe; it
+    closes the circuit if it succeeds and reopens it if it fails.
+
+    Attributes:
+        name (str): Name of the guarded service, used in error messages.
+        failure_threshold (int): Consecutive failures that open the circuit.
+        reset_timeout (float): Seconds the circuit stays open before a probe.
+        is_failure (callable): Tells whether an exception counts as a service
+            failure; other exceptions, such as rejected requests, count as successes.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 is_failure=None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.is_failure = is_failure or (lambda exc: True)
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Return ``closed``, ``open`` or ``half_open`` (a probe is in flight)."""
+        with self._lock:
+            return self._state
+
+    def available(self) -> bool:
+        """Return whether a call would be let through now, as a normal call or as a probe."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            return self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout
+
+    def _acquire(self):
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+                return
+            raise CircuitOpenError(f"{self.name} circuit is open")
+
+    def record_success(self):
+        """Close the circuit and reset the failure count."""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        """Count a failure, opening the circuit at the threshold or when a probe failed."""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    @contextmanager
+    def guard(self):
+        """
+        Run the enclosed call through the breaker.
+
+        Raises:
+            CircuitOpenError: If the circuit is open and no probe is due.
+        """
+        self._acquire()
+        try:
+            yield
+        except Exception as exc:
+            if self.is_failure(exc):
+                self.record_failure()
+            else:
+                self.record_success()
+            raise
+        except BaseException:
+            # A cancelled probe proves nothing; let the next call probe instead.
+            with self._lock:
+                if self._state == self.HALF_OPEN:
+                    self._state = self.OPEN
+            raise
+        else:
+            self.record_success()
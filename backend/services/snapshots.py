@@ -0,0 +1,246 @@
+"""
+Snapshot module for saving and restoring the Weaviate index with its vectors.
+
+Weaviate does not keep its data across restarts in every deployment, and
+rebuilding it with reindex_entries means embedding the whole journal again.
+A snapshot instead stores every JournalEntry object (its passage, parent
+``entry_id``, ``chunk_index`` and vector) so that a restore only has to send
+batch imports with explicit vectors, and nothing is re-embedded.
+
+A snapshot file is a sequence of gzip members, one per chunk of
+SNAPSHOT_CHUNK_SIZE objects, each holding one JSON object per line. Vectors
+are stored as base64-encoded float32. The first chunk holds a header and the
+last one a footer with the object and entry counts, so a truncated file is
+detected. Export streams page by page and restore batch by batch, so memory
+use does not grow with the journal.
+
+Run it with:
+
+    python -m backend.services.snapshots export snapshots/weaviate.snap
+    python -m backend.services.snapshots restore snapshots/weaviate.snap
+"""
+
+import argparse
+import base64
+import gzip
+import json
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import numpy as np
+from sqlalchemy import func, select
+from backend.core.config import settings
+from backend.database import SessionLocal
+from backend.models.journal import JournalEntry
+from backend.services.weaviate_client import WeaviateClient
+
+FORMAT = "secondbrain-weaviate-snapshot"
+VERSION = 1
+
+
+def encode_vector(vector) -> str:
+    """Encode a vector as base64 float32, about a third of the size of its JSON floats."""
+    return base64.b64encode(np.asarray(vector, dtype=np.float32).tobytes()).decode("ascii")
+
+
+def decode_vector(data: str) -> list:
+    """Decode a vector written by encode_vector into a list of floats."""
+    return np.frombuffer(base64.b64decode(data), dtype=np.float32).tolist()
+
+
+def is_entry_record(record: dict) -> bool:
+    """Return whether a snapshot record is an entry's first passage, or an object stored before chunking."""
+    return not (record.get("properties") or {}).get("chunk_index")
+
+
+def write_chunk(out, records: list):
+    """Append records to a snapshot as one gzip member."""
+    lines = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+    out.write(gzip.compress(lines.encode("utf-8"), compresslevel=6))
+
+
+def export_snapshot(path: str, chunk_size: int = None) -> dict:
+    """
+    Write every JournalEntry object in Weaviate, with its vector, to a snapshot file.
+
+    The file is written next to path and moved into place once complete, so
+    an interrupted export never leaves a partial snapshot behind.
+
+    Args:
+        path (str): The snapshot file.
+        chunk_size (int, optional): Objects per export page and compressed
+            chunk. Defaults to settings.SNAPSHOT_CHUNK_SIZE.
+
+    Returns:
+        dict: The number of ``objects`` and ``entries`` written.
+
+    Raises:
+        WeaviateError: If Weaviate cannot be read.
+    """
+    chunk_size = chunk_size or settings.SNAPSHOT_CHUNK_SIZE
+    counts = {"objects": 0, "entries": 0}
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as out:
+        write_chunk(out, [{
+            "format": FORMAT,
+            "version": VERSION,
+            "class": "JournalEntry",
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }])
+        after = None
+        while True:
+            objects = WeaviateClient.export_objects(limit=chunk_size, after=after)
+            if not objects:
+                break
+            records = [
+                {
+                    "id": obj["id"],
+                    "properties": obj.get("properties") or {},
+                    "vector": encode_vector(obj["vector"]) if obj.get("vector") else None,
+                }
+                for obj in objects
+            ]
+            write_chunk(out, records)
+            counts["objects"] += len(records)
+            counts["entries"] += sum(1 for record in records if is_entry_record(record))
+            after = objects[-1]["id"]
+            print(f"Exported {counts['objects']} objects.")
+        write_chunk(out, [{"end": True, **counts}])
+    os.replace(tmp_path, path)
+    print(f"Wrote {counts['objects']} objects of {counts['entries']} entries to {path}.")
+    return counts
+
+
+@contextmanager
+def read_snapshot(path: str):
+    """
+    Open a snapshot, closing it when the context exits.
+
+    Args:
+        path (str): The snapshot file.
+
+    Yields:
+        tuple: The header dict, and an iterator over the object records that
+        ends with the footer (the record with ``"end": true``).
+
+    Raises:
+        ValueError: If the file is not a snapshot of a supported version.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as snapshot:
+        records = (json.loads(line) for line in snapshot)
+        header = next(records, None)
+        if not header or header.get("format") != FORMAT or header.get("version") != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} snapshot")
+        yield header, records
+
+
+def weaviate_object(record: dict) -> dict:
+    """Build the batch import object of a snapshot record, carrying its vector."""
+    obj = {"class": "JournalEntry", "id": record["id"], "properties": record["properties"]}
+    if record.get("vector"):
+        obj["vector"] = decode_vector(record["vector"])
+    return obj
+
+
+def journal_entry_count() -> int:
+    """Return the number of journal entries in Postgres."""
+    with SessionLocal() as db_session:
+        return db_session.execute(select(func.count()).select_from(JournalEntry)).scalar_one()
+
+
+def restore_snapshot(path: str, batch_size: int = None, concurrency: int = None) -> dict:
+    """
+    Load a snapshot into Weaviate with batch imports carrying explicit vectors.
+
+    Objects keep their UUIDs, so restoring into a non-empty Weaviate overwrites
+    rather than duplicates. Once done, the snapshot's entry count is compared
+    with the journal in Postgres; any difference is reported, and
+    ``reindex_entries --incremental --verify`` closes it.
+
+    Args:
+        path (str): The snapshot file.
+        batch_size (int, optional): Objects per batch import. Defaults to settings.REINDEX_BATCH_SIZE.
+        concurrency (int, optional): Batch imports in flight. Defaults to settings.REINDEX_CONCURRENCY.
+
+    Returns:
+        dict: Counts of ``objects`` restored, ``failed`` objects, ``entries``
+        in the snapshot and ``journal_entries`` in Postgres.
+
+    Raises:
+        ValueError: If the file is not a snapshot, or is truncated.
+        WeaviateError: If a batch import request fails.
+    """
+    batch_size = batch_size or settings.REINDEX_BATCH_SIZE
+    concurrency = concurrency or settings.REINDEX_CONCURRENCY
+    counts = {"objects": 0, "failed": 0, "entries": 0}
+    footer = None
+
+    def batches(records):
+        nonlocal footer
+        batch = []
+        try:
+            for record in records:
+                if record.get("end"):
+                    footer = record
+                    break
+                counts["entries"] += is_entry_record(record)
+                batch.append(weaviate_object(record))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        except (EOFError, OSError, json.JSONDecodeError) as exc:
+            raise ValueError(f"{path} is truncated or corrupt: {exc}") from exc
+        if batch:
+            yield batch
+
+    def complete(future):
+        results = future.result()
+        counts["objects"] += len(results)
+        for result in results:
+            if (result.get("result") or {}).get("errors"):
+                counts["failed"] += 1
+                print(f"Failed to restore object {result.get('id')}: {result['result']['errors']}")
+        print(f"Restored {counts['objects']} objects.")
+
+    in_flight = deque()
+    with read_snapshot(path) as (_, records), ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for batch in batches(records):
+            if len(in_flight) >= concurrency:
+                complete(in_flight.popleft())
+            in_flight.append(executor.submit(WeaviateClient.import_objects, batch))
+        while in_flight:
+            complete(in_flight.popleft())
+    if footer is None:
+        raise ValueError(f"{path} is truncated: it has no footer")
+
+    counts["journal_entries"] = journal_entry_count()
+    print(f"Restored {counts['objects']} objects of {counts['entries']} entries ({counts['failed']} failed).")
+    if counts["objects"] != footer["objects"]:
+        print(f"Warning: the snapshot should hold {footer['objects']} objects.")
+    if counts["entries"] != counts["journal_entries"]:
+        print(
+            f"Warning: Postgres has {counts['journal_entries']} entries but the snapshot has "
+            f"{counts['entries']}; run reindex_entries --incremental --verify to reconcile them."
+        )
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export or restore a snapshot of the Weaviate index.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_parser = commands.add_parser("export", help="Write every object and its vector to a file.")
+    export_parser.add_argument("path")
+    export_parser.add_argument("--chunk-size", type=int, help="Objects per page and compressed chunk.")
+    restore_parser = commands.add_parser("restore", help="Load a snapshot back into Weaviate.")
+    restore_parser.add_argument("path")
+    restore_parser.add_argument("--batch-size", type=int, help="Objects per batch import request.")
+    restore_parser.add_argument("--concurrency", type=int, help="Batch requests kept in flight.")
+    args = parser.parse_args()
+    if args.command == "export":
+        export_snapshot(args.path, args.chunk_size)
+    else:
+        restore_snapshot(args.path, args.batch_size, args.concurrency)
@@ -0,0 +1,277 @@
+"""
+Tagging module.
+
+This module extracts tags from journal entries and stores them in the
+``tags`` / ``entry_tags`` tables. An entry's tags are its hashtags
+(``#project-x``), followed by its keywords: words of the title and content
+that are not stop words, scored by frequency with title words counting
+double, and kept when they occur at least twice. At most TAGS_PER_ENTRY tags
+are kept. Extraction is deterministic, so it runs in any process.
+
+The outbox worker tags each batch it indexes and sends the tags along to the
+vector store, where they are a filterable property. Large batches are spread
+over a process pool in chunks of TAGGING_BATCH_SIZE entries, as embeddings are.
+
+Tag existing entries, and queue those whose tags changed for re-indexing, with:
+
+    python -m backend.services.tagging
+"""
+
+import argparse
+import os
+import re
+import threading
+from collections import Counter
+from functools import partial
+from sqlalchemy import delete, insert, select
+from backend.core.config import settings
+from backend.database import SessionLocal
+from backend.models.journal import JournalEntry
+from backend.models.outbox import IndexingOutbox
+from backend.models.tags import EntryTag, Tag, normalize_tag
+from backend.services.embeddings import new_process_pool
+from backend.services.journal_service import outbox_rows
+
+HASHTAG_PATTERN = re.compile(r"(?<![\w#&/])#([^\W_][\w-]*)")
+WORD_PATTERN = re.compile(r"[^\W\d_]+")
+MIN_KEYWORD_LENGTH = 4
+MIN_KEYWORD_SCORE = 2
+STOPWORDS = frozenset("""
+    about above after again against almost along already also although always among another anyone
+    anything around away back because been before being below between both came cannot come could
+    couldn days did didn does doesn doing done down during each either else enough even ever every
+    from further gets getting going gone good great have having here hers herself himself into itself
+    just keep know last less like little long lot lots made make many maybe might more most much must
+    myself need never next nothing now often once only other ought ours ourselves over really right
+    said same should since some something still such sure take than that thats their theirs them
+    themselves then there these they thing things think this those though through thus today together
+    tomorrow took too under until upon very want wanted was wasn week well went were weren what when
+    where whether which while will with within without won would wouldn yesterday your yours yourself
+""".split())
+
+
+def extract_tags(title: str, content: str, limit: int = None) -> list:
+    """
+    Extract the tags of a journal entry.
+
+    Args:
+        title (str): The title of the entry.
+        content (str): The content of the entry.
+        limit (int, optional): Maximum number of tags. Defaults to settings.TAGS_PER_ENTRY.
+
+    Returns:
+        list: Normalised tag names, hashtags first in order of appearance,
+        then keywords, best first.
+    """
+    limit = limit or settings.TAGS_PER_ENTRY
+    hashtags = (normalize_tag(match) for match in HASHTAG_PATTERN.findall(f"{title}\n{content}"))
+    tags = list(dict.fromkeys(tag for tag in hashtags if tag))[:limit]
+    scores = Counter()
+    first_seen = {}
+    for weight, text in ((2, title or ""), (1, content or "")):
+        for word in WORD_PATTERN.findall(text):
+            word = word.lower()
+            if len(word) >= MIN_KEYWORD_LENGTH and word not in STOPWORDS:
+                scores[word] += weight
+                first_seen.setdefault(word, len(first_seen))
+    keywords = sorted(
+        (word for word, score in scores.items() if score >= MIN_KEYWORD_SCORE and word not in tags),
+        key=lambda word: (-scores[word], first_seen[word]),
+    )
+    return tags + [normalize_tag(word) for word in keywords[:limit - len(tags)]]
+
+
+def _extract_batch(entries: list, limit: int = None) -> list:
+    """Extract the tags of (title, content) pairs; runs in a pool process."""
+    return [extract_tags(title, content, limit) for title, content in entries]
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _pool(workers: int):
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = new_process_pool(workers)
+    return _executor
+
+
+def extract_many(entries, limit: int = None, workers: int = None, batch_size: int = None) -> list:
+    """
+    Extract the tags of several entries, in parallel when there is more than one batch.
+
+    Args:
+        entries (iterable): (title, content) pairs.
+        limit (int, optional): Maximum number of tags per entry. Defaults to settings.TAGS_PER_ENTRY.
+        workers (int, optional): Pool processes. Defaults to settings.TAGGING_WORKERS, or one per CPU.
+        batch_size (int, optional): Entries per pool task. Defaults to settings.TAGGING_BATCH_SIZE.
+
+    Returns:
+        list: The tags of each entry, in input order.
+    """
+    entries = list(entries)
+    workers = workers or settings.TAGGING_WORKERS or os.cpu_count() or 1
+    batch_size = batch_size or settings.TAGGING_BATCH_SIZE
+    batches = [entries[start:start + batch_size] for start in range(0, len(entries), batch_size)]
+    if len(batches) <= 1 or workers <= 1:
+        return _extract_batch(entries, limit)
+    results = _pool(workers).map(partial(_extract_batch, limit=limit), batches)
+    return [tags for batch in results for tags in batch]
+
+
+def insert_tag_names(db_session, names: list):
+    """
+    Insert tag names that do not exist yet.
+
+    Names are inserted in sorted order, so concurrent workers take their row
+    locks in the same order.
+
+    Args:
+        db_session: The database session used for the insert.
+        names (list): Normalised tag names.
+    """
+    names = sorted(set(names))
+    dialect_name = db_session.get_bind().dialect.name
+    if dialect_name in ("postgresql", "sqlite"):
+        if dialect_name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        db_session.execute(
+            dialect_insert(Tag).on_conflict_do_nothing(index_elements=["name"]),
+            [{"name": name} for name in names],
+        )
+        return
+    existing = set(db_session.execute(select(Tag.name).where(Tag.name.in_(names))).scalars())
+    missing = [{"name": name} for name in names if name not in existing]
+    if missing:
+        db_session.execute(insert(Tag), missing)
+
+
+def store_tags(db_session, tags_by_entry: dict):
+    """
+    Replace the stored tags of entries. The caller commits.
+
+    Only the links that changed are deleted or inserted, so unchanged links
+    keep their ids and the membership version of their tags.
+
+    Args:
+        db_session: The database session used for the writes.
+        tags_by_entry (dict): Normalised tag names keyed by entry UUID.
+    """
+    if not tags_by_entry:
+        return
+    names = {name for tags in tags_by_entry.values() for name in tags}
+    tag_ids = {}
+    if names:
+        insert_tag_names(db_session, list(names))
+        tag_ids = dict(db_session.execute(select(Tag.name, Tag.id).where(Tag.name.in_(names))).all())
+    wanted = {(entry_id, tag_ids[name]) for entry_id, tags in tags_by_entry.items() for name in tags}
+    stored = {
+        (entry_id, tag_id): link_id
+        for link_id, entry_id, tag_id in db_session.execute(
+            select(EntryTag.id, EntryTag.entry_id, EntryTag.tag_id)
+            .where(EntryTag.entry_id.in_(list(tags_by_entry)))
+        )
+    }
+    stale = [link_id for link, link_id in stored.items() if link not in wanted]
+    if stale:
+        db_session.execute(delete(EntryTag).where(EntryTag.id.in_(stale)))
+    rows = [
+        {"entry_id": entry_id, "tag_id": tag_id}
+        for entry_id, tag_id in sorted(wanted - set(stored), key=lambda link: (str(link[0]), link[1]))
+    ]
+    if rows:
+        db_session.execute(insert(EntryTag), rows)
+
+
+def tag_entries(db_session, entries) -> dict:
+    """
+    Extract and store the tags of journal entries. The caller commits.
+
+    Args:
+        db_session: The database session used for the writes.
+        entries (list): JournalEntry instances, or rows with ``id``, ``title`` and ``content``.
+
+    Returns:
+        dict: The tags of each entry, keyed by its string id.
+    """
+    entries = list(entries)
+    extracted = extract_many((entry.title, entry.content) for entry in entries)
+    store_tags(db_session, {entry.id: tags for entry, tags in zip(entries, extracted)})
+    return {str(entry.id): tags for entry, tags in zip(entries, extracted)}
+
+
+def entry_tags(db_session, entry_ids) -> dict:
+    """
+    Return the stored tags of entries.
+
+    Args:
+        db_session: The database session used for the query.
+        entry_ids (iterable): Entry UUIDs.
+
+    Returns:
+        dict: Sorted tag names keyed by the string id of every given entry.
+    """
+    entry_ids = list(entry_ids)
+    tags = {str(entry_id): [] for entry_id in entry_ids}
+    if entry_ids:
+        rows = db_session.execute(
+            select(EntryTag.entry_id, Tag.name)
+            .join(Tag, Tag.id == EntryTag.tag_id)
+            .where(EntryTag.entry_id.in_(entry_ids))
+            .order_by(Tag.name)
+        )
+        for entry_id, name in rows:
+            tags[str(entry_id)].append(name)
+    return tags
+
+
+def retag_all_entries(batch_size: int = None) -> tuple:
+    """
+    Extract the tags of every journal entry again, in batches over the process pool.
+
+    Entries whose tags changed are queued in the indexing outbox, so the
+    worker writes their new tags to the vector store.
+
+    Args:
+        batch_size (int, optional): Entries read per query. Defaults to
+            TAGGING_BATCH_SIZE for each pool process.
+
+    Returns:
+        tuple: The number of entries tagged and the number whose tags changed.
+    """
+    workers = settings.TAGGING_WORKERS or os.cpu_count() or 1
+    batch_size = batch_size or settings.TAGGING_BATCH_SIZE * workers
+    tagged = changed = 0
+    last_id = None
+    with SessionLocal() as db_session:
+        while True:
+            statement = select(JournalEntry.id, JournalEntry.title, JournalEntry.content)
+            if last_id is not None:
+                statement = statement.where(JournalEntry.id > last_id)
+            entries = db_session.execute(statement.order_by(JournalEntry.id).limit(batch_size)).all()
+            if not entries:
+                break
+            before = entry_tags(db_session, [entry.id for entry in entries])
+            after = tag_entries(db_session, entries)
+            stale = [entry.id for entry in entries if sorted(after[str(entry.id)]) != before[str(entry.id)]]
+            if stale:
+                db_session.execute(insert(IndexingOutbox), outbox_rows(stale))
+            db_session.commit()
+            tagged += len(entries)
+            changed += len(stale)
+            last_id = entries[-1].id
+            print(f"Tagged {tagged} entries ({changed} changed).")
+    return tagged, changed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract the tags of every journal entry again.")
+    parser.add_argument("--batch-size", type=int, help="Entries read per query.")
+    args = parser.parse_args()
+    tagged, changed = retag_all_entries(args.batch_size)
+    print(f"Tagged {tagged} entries; {changed} were queued for re-indexing.")
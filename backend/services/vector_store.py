@@ -0,0 +1,555 @@
+"""
+Vector store module.
+
+This module defines the VectorStore interface used by every indexing and search
+path, and its two implementations:
+
+- WeaviateVectorStore delegates to the Weaviate service through WeaviateClient
+  and AsyncWeaviateClient. With settings.WEAVIATE_CLIENT_VECTORS it sends
+  vectors computed by the embedding pipeline instead of having Weaviate
+  vectorise each object.
+- LocalVectorStore keeps vectors in a memory-mapped float32 file on local disk
+  and searches it with vectorised NumPy top-k, optionally through an HNSW graph
+  (``hnswlib``) once the collection is large. It needs no separate service and
+  loads in milliseconds at startup.
+
+Both stores index entries as overlapping passages (backend.services.chunker)
+and return at most one hit per entry. Entries are stored with their tags, and
+searches can be restricted to entries carrying given tags inside the store.
+Besides searching by text, they find the nearest other entries of stored
+entries, in batches, for the precomputed related entries of
+backend.services.related.
+
+The implementation is chosen with settings.VECTOR_STORE and obtained through
+get_vector_store().
+"""
+
+import abc
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import threading
+import numpy as np
+from collections import Counter, defaultdict
+from backend.core.config import settings
+from backend.services.chunker import collapse_hits, iter_passages, search_limit
+from backend.services.embeddings import get_embedding_pipeline
+from backend.services.weaviate_client import WeaviateClient, AsyncWeaviateClient, weaviate_breaker
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class VectorStore(abc.ABC):
+    """
+    Interface for storing journal entry vectors and searching them.
+
+    Search hits are dicts with the entry ``id`` and a ``certainty`` in [0, 1],
+    best match first.
+    """
+
+    @abc.abstractmethod
+    def upsert(self, entries, tags: dict = None) -> dict:
+        """
+        Index or re-index journal entries, keyed by their UUID.
+
+        Args:
+            entries (iterable): (entry_id, content) pairs.
+            tags (dict, optional): Normalised tag names keyed by string entry
+                id, stored with the entries for filtered searches.
+
+        Returns:
+            dict: Error messages keyed by the string id of each entry that failed.
+
+        Raises:
+            Exception: If the whole request fails.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def search(self, query: str, limit: int = 10, certainty: float = None, tags: list = None) -> list:
+        """
+        Return the entries closest to a search text.
+
+        Args:
+            query (str): The search text.
+            limit (int, optional): Maximum number of hits. Defaults to 10.
+            certainty (float, optional): Minimum certainty of returned hits.
+            tags (list, optional): Only return entries carrying all of these normalised tags.
+
+        Returns:
+            list: Dicts with ``id`` and ``certainty``, best match first.
+        """
+        raise NotImplementedError
+
+    async def asearch(self, query: str, limit: int = 10, certainty: float = None,
+                      tags: list = None) -> list:
+        """Async variant of search, run in a thread so embedding and scanning never block the event loop."""
+        return await asyncio.to_thread(self.search, query, limit=limit, certainty=certainty, tags=tags)
+
+    @abc.abstractmethod
+    def neighbors(self, entry_ids, limit: int = 10) -> dict:
+        """
+        Return the entries closest to each of the given stored entries.
+
+        Args:
+            entry_ids (iterable): The entry UUIDs.
+            limit (int, optional): Maximum number of neighbours per entry. Defaults to 10.
+
+        Returns:
+            dict: Dicts with ``id`` and ``certainty``, best match first, keyed by
+            the string id of each entry; entries that are not stored are left
+            out, and no entry is its own neighbour.
+        """
+        raise NotImplementedError
+
+    def available(self) -> bool:
+        """
+        Return whether the store can be written to now.
+
+        Indexing callers check this before claiming work, so jobs are not
+        spent on a store that is known to be down.
+        """
+        return True
+
+    @abc.abstractmethod
+    def iter_ids(self, chunk_size: int = 1000):
+        """
+        Stream the ids of every stored entry in ascending order.
+
+        Args:
+            chunk_size (int, optional): Number of ids per chunk. Defaults to 1000.
+
+        Yields:
+            list: Sorted string ids; each chunk follows the previous one.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def delete(self, entry_ids):
+        """
+        Remove entries from the store; unknown ids are ignored.
+
+        Args:
+            entry_ids (iterable): The entry UUIDs to remove.
+        """
+        raise NotImplementedError
+
+
+class WeaviateVectorStore(VectorStore):
+    """
+    Vector store backed by the Weaviate service.
+
+    Attributes:
+        embedder: Object with ``embed`` and ``embed_many`` computing the vectors
+            sent to Weaviate, or None to let Weaviate vectorise objects and queries.
+    """
+
+    def __init__(self, embedder=None):
+        if embedder is None and settings.WEAVIATE_CLIENT_VECTORS:
+            embedder = get_embedding_pipeline()
+        self.embedder = embedder
+
+    def upsert(self, entries, tags: dict = None) -> dict:
+        results = WeaviateClient.send_batch_to_weaviate(entries, embedder=self.embedder, tags=tags)
+        return {
+            result.get("id"): str(result["result"]["errors"])
+            for result in results
+            if (result.get("result") or {}).get("errors")
+        }
+
+    def search(self, query: str, limit: int = 10, certainty: float = None, tags: list = None) -> list:
+        if self.embedder is not None:
+            return WeaviateClient.near_vector(
+                self.embedder.embed(query), limit=limit, certainty=certainty, tags=tags
+            )
+        return WeaviateClient.near_text(query, limit=limit, certainty=certainty, tags=tags)
+
+    async def asearch(self, query: str, limit: int = 10, certainty: float = None,
+                      tags: list = None) -> list:
+        if self.embedder is not None:
+            vector = await asyncio.to_thread(self.embedder.embed, query)
+            return await AsyncWeaviateClient.near_vector(
+                vector, limit=limit, certainty=certainty, tags=tags
+            )
+        return await AsyncWeaviateClient.near_text(query, limit=limit, certainty=certainty, tags=tags)
+
+    def neighbors(self, entry_ids, limit: int = 10) -> dict:
+        return WeaviateClient.near_objects(entry_ids, limit=limit)
+
+    def available(self) -> bool:
+        # With the circuit open, the readiness probe decides whether it closes again.
+        if weaviate_breaker.state == weaviate_breaker.CLOSED:
+            return True
+        return weaviate_breaker.available() and WeaviateClient.probe()
+
+    def iter_ids(self, chunk_size: int = 1000):
+        after = None
+        while True:
+            objects = WeaviateClient.list_objects(limit=chunk_size, after=after)
+            if not objects:
+                return
+            # An entry's first passage is stored under the entry's own UUID.
+            ids = [hit["id"] for hit in objects if hit["id"] == hit["object_id"]]
+            if ids:
+                yield ids
+            after = objects[-1]["object_id"]
+
+    def delete(self, entry_ids):
+        WeaviateClient.delete_entries(entry_ids)
+
+
+class LocalVectorStore(VectorStore):
+    """
+    Embedded vector store persisted to a local directory.
+
+    Row ``i`` of ``vectors.f32`` holds the vector of the passage on line ``i``
+    of ``ids.txt``, written as ``<entry id>`` for an entry's first passage and
+    ``<entry id>:<index>`` for the others. Vectors are L2-normalised, so the inner product is the cosine
+    similarity, reported as Weaviate-style certainty ``(1 + cosine) / 2``.
+    ``tags.jsonl`` records the tags of each entry, the last line for an entry
+    winning; tag-filtered searches only score the rows of matching entries.
+    It is rewritten with one line per entry once superseded lines outnumber
+    the live ones.
+
+    Writes from several processes (API, workers, re-index, tagging) are
+    serialised with an exclusive ``flock`` on ``write.lock``, taken before the
+    store is refreshed so each writer appends after the rows of the previous
+    one. Where ``fcntl`` is unavailable only one process may write to a store.
+    Another process's writes are picked up on the next call.
+
+    Attributes:
+        path (str): The directory holding the store files.
+        embedder: Object with ``dim``, ``embed`` and ``embed_many``.
+    """
+
+    VECTORS_FILE = "vectors.f32"
+    IDS_FILE = "ids.txt"
+    HNSW_FILE = "hnsw.bin"
+    TAGS_FILE = "tags.jsonl"
+    LOCK_FILE = "write.lock"
+
+    def __init__(self, path: str = None, embedder=None):
+        self.path = path or settings.LOCAL_VECTOR_STORE_PATH
+        self.embedder = embedder or get_embedding_pipeline()
+        self.dim = self.embedder.dim
+        self._lock = threading.RLock()
+        os.makedirs(self.path, exist_ok=True)
+        self._load()
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _signature(self):
+        """Return a cheap fingerprint of the ids file, used to detect outside writes."""
+        try:
+            stat = os.stat(self._file(self.IDS_FILE))
+        except FileNotFoundError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _load(self):
+        """Load the id list and map the vectors file read-only."""
+        ids_path = self._file(self.IDS_FILE)
+        ids = []
+        if os.path.exists(ids_path):
+            with open(ids_path, encoding="utf-8") as ids_file:
+                ids = [line.strip() for line in ids_file if line.strip()]
+        self._ids = ids
+        self._rows = {row_id: row for row, row_id in enumerate(ids)}
+        self._passages = Counter(self._entry_id(row_id) for row_id in ids)
+        self._tags = {}
+        self._tag_lines = 0
+        tags_path = self._file(self.TAGS_FILE)
+        if os.path.exists(tags_path):
+            with open(tags_path, encoding="utf-8") as tags_file:
+                for line in tags_file:
+                    if line.strip():
+                        record = json.loads(line)
+                        self._tags[record["id"]] = record["tags"]
+                        self._tag_lines += 1
+        self._tagged = defaultdict(set)
+        for entry_id, entry_tags in self._tags.items():
+            if entry_id in self._passages:
+                for tag in entry_tags:
+                    self._tagged[tag].add(entry_id)
+        if ids:
+            self._vectors = np.memmap(
+                self._file(self.VECTORS_FILE), dtype=np.float32, mode="r", shape=(len(ids), self.dim)
+            )
+        else:
+            self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+        self._hnsw = None
+        self._signature_loaded = self._signature()
+
+    def _refresh(self):
+        if self._signature() != self._signature_loaded:
+            self._load()
+
+    @contextlib.contextmanager
+    def _write_lock(self):
+        """Hold the store exclusively, across threads and processes, with its state refreshed."""
+        with self._lock, open(self._file(self.LOCK_FILE), "a") as lock_file:
+            # The flock is released when the lock file is closed.
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            self._refresh()
+            yield
+
+    @staticmethod
+    def _row_id(entry_id: str, index: int) -> str:
+        return entry_id if index == 0 else f"{entry_id}:{index}"
+
+    @staticmethod
+    def _entry_id(row_id: str) -> str:
+        return row_id.split(":", 1)[0]
+
+    def __len__(self):
+        """Return the number of stored entries."""
+        with self._lock:
+            self._refresh()
+            return len(self._passages)
+
+    def upsert(self, entries, tags: dict = None) -> dict:
+        entries = list(entries)
+        passages = [
+            (self._row_id(str(entry_id), index), passage, str(entry_id))
+            for entry_id, content in entries
+            for index, passage in enumerate(iter_passages(content))
+        ]
+        if not passages:
+            return {}
+        vectors = self.embedder.embed_many(passage for _, passage, _ in passages)
+        counts = Counter(entry_id for _, _, entry_id in passages)
+        with self._write_lock():
+            stale = [
+                self._row_id(entry_id, index)
+                for entry_id, count in counts.items()
+                for index in range(count, self._passages.get(entry_id, 0))
+            ]
+            if stale:
+                self._remove_rows(stale)
+            if tags is not None:
+                # Written before ids.txt, whose change makes readers reload both.
+                with open(self._file(self.TAGS_FILE), "a", encoding="utf-8") as tags_file:
+                    tags_file.write("".join(
+                        json.dumps({"id": str(entry_id), "tags": tags.get(str(entry_id), [])}) + "\n"
+                        for entry_id, _ in entries
+                    ))
+                self._tag_lines += len(entries)
+                for entry_id, _ in entries:
+                    self._tags[str(entry_id)] = tags.get(str(entry_id), [])
+                if self._tag_lines > 2 * len(self._tags):
+                    self._compact_tags(set(self._tags))
+            updates = {}
+            appended = {}
+            for (entry_id, _, _), vector in zip(passages, vectors):
+                if entry_id in self._rows:
+                    updates[self._rows[entry_id]] = vector
+                else:
+                    appended[entry_id] = vector
+
+            row_bytes = self.dim * np.dtype(np.float32).itemsize
+            if updates:
+                writable = np.memmap(
+                    self._file(self.VECTORS_FILE), dtype=np.float32, mode="r+",
+                    shape=(len(self._ids), self.dim),
+                )
+                rows = list(updates)
+                writable[rows] = np.vstack([updates[row] for row in rows])
+                writable.flush()
+                del writable
+                # Rewritten rows invalidate the HNSW graph; it is rebuilt on the next
+                # search. Touching ids.txt makes other processes reload as well.
+                if os.path.exists(self._file(self.HNSW_FILE)):
+                    os.remove(self._file(self.HNSW_FILE))
+                os.utime(self._file(self.IDS_FILE))
+            if appended:
+                # Vectors first, ids last: ids.txt is the commit record, and any
+                # bytes left past it by an interrupted write are truncated here.
+                with open(self._file(self.VECTORS_FILE), "ab") as vectors_file:
+                    vectors_file.truncate(len(self._ids) * row_bytes)
+                    vectors_file.write(np.vstack(list(appended.values())).astype(np.float32).tobytes())
+                with open(self._file(self.IDS_FILE), "a", encoding="utf-8") as ids_file:
+                    ids_file.write("".join(f"{entry_id}\n" for entry_id in appended))
+            self._load()
+        return {}
+
+    def _hnsw_index(self):
+        """
+        Return an HNSW graph over the stored vectors, or None to use brute force.
+
+        The graph is only used when enabled in settings, the collection is at
+        least LOCAL_VECTOR_STORE_HNSW_MIN_SIZE, and ``hnswlib`` is installed.
+        It is saved next to the vectors and extended incrementally as rows are added.
+        """
+        count = len(self._ids)
+        if not settings.LOCAL_VECTOR_STORE_HNSW or count < settings.LOCAL_VECTOR_STORE_HNSW_MIN_SIZE:
+            return None
+        try:
+            import hnswlib
+        except ImportError:
+            logger.warning("hnswlib is not installed; using exact search")
+            return None
+
+        index_path = self._file(self.HNSW_FILE)
+        if self._hnsw is None:
+            self._hnsw = hnswlib.Index(space="ip", dim=self.dim)
+            if os.path.exists(index_path):
+                self._hnsw.load_index(index_path, max_elements=count)
+            else:
+                self._hnsw.init_index(max_elements=count, ef_construction=200, M=16)
+        indexed = self._hnsw.get_current_count()
+        if indexed < count:
+            self._hnsw.resize_index(count)
+            self._hnsw.add_items(np.asarray(self._vectors[indexed:count]), np.arange(indexed, count))
+            self._hnsw.save_index(index_path)
+        return self._hnsw
+
+    def _tagged_rows(self, tags: list):
+        """Return the rows of the passages of entries carrying every given tag; call with the lock held."""
+        entry_ids = set.intersection(*(self._tagged.get(tag, set()) for tag in tags))
+        return np.array(sorted(
+            self._rows[self._row_id(entry_id, index)]
+            for entry_id in entry_ids
+            for index in range(self._passages[entry_id])
+        ), dtype=np.int64)
+
+    def search(self, query: str, limit: int = 10, certainty: float = None, tags: list = None) -> list:
+        with self._lock:
+            self._refresh()
+            rows = self._tagged_rows(tags) if tags else None
+            count = len(self._ids) if rows is None else len(rows)
+            if not count:
+                return []
+            requested, limit = limit, min(search_limit(limit), count)
+            rows, scores = self._top_rows(self.embedder.embed(query)[np.newaxis], limit, rows)[0]
+
+            hits = []
+            for row, score in zip(rows, scores):
+                hit_certainty = (1.0 + float(score)) / 2.0
+                if certainty is not None and hit_certainty < certainty:
+                    break
+                hits.append({"id": self._entry_id(self._ids[row]), "certainty": hit_certainty})
+            return collapse_hits(hits, requested)
+
+    def _top_rows(self, query_vectors, limit: int, rows=None) -> list:
+        """
+        Find the limit rows closest to each query vector; call with the lock held.
+
+        Args:
+            query_vectors (ndarray): One normalised query vector per row.
+            limit (int): Number of rows per query, at most the number of candidate rows.
+            rows (ndarray, optional): Only consider these rows, scored exactly;
+                all rows by default.
+
+        Returns:
+            list: One (rows, similarities) pair per query, best match first.
+        """
+        hnsw = self._hnsw_index() if rows is None else None
+        if hnsw is not None:
+            hnsw.set_ef(max(limit * 2, 50))
+            labels, distances = hnsw.knn_query(query_vectors, k=limit)
+            return list(zip(labels, 1.0 - distances))
+        vectors = np.asarray(self._vectors) if rows is None else np.asarray(self._vectors[rows])
+        results = []
+        for similarities in query_vectors @ vectors.T:
+            top = np.argpartition(-similarities, limit - 1)[:limit]
+            top = top[np.argsort(-similarities[top])]
+            results.append((top if rows is None else rows[top], similarities[top]))
+        return results
+
+    def neighbors(self, entry_ids, limit: int = 10) -> dict:
+        with self._lock:
+            self._refresh()
+            # An entry's first passage, stored under its own id, stands for the entry.
+            found = [str(entry_id) for entry_id in entry_ids if str(entry_id) in self._rows]
+            if not found:
+                return {}
+            query_vectors = np.asarray(self._vectors[[self._rows[entry_id] for entry_id in found]])
+            top = self._top_rows(query_vectors, min(search_limit(limit + 1), len(self._ids)))
+            neighbors = {}
+            for entry_id, (rows, scores) in zip(found, top):
+                hits = (
+                    {"id": self._entry_id(self._ids[row]), "certainty": (1.0 + float(score)) / 2.0}
+                    for row, score in zip(rows, scores)
+                )
+                neighbors[entry_id] = collapse_hits((hit for hit in hits if hit["id"] != entry_id), limit)
+            return neighbors
+
+    def iter_ids(self, chunk_size: int = 1000):
+        with self._lock:
+            self._refresh()
+            ids = sorted(self._passages)
+        for start in range(0, len(ids), chunk_size):
+            yield ids[start:start + chunk_size]
+
+    def delete(self, entry_ids):
+        with self._write_lock():
+            doomed = {str(entry_id) for entry_id in entry_ids}
+            self._remove_rows([row_id for row_id in self._ids if self._entry_id(row_id) in doomed])
+
+    def _remove_rows(self, row_ids):
+        """Compact the given passage rows out of the store files; call with the lock held."""
+        doomed = set(row_ids) & self._rows.keys()
+        if not doomed:
+            return
+        keep = [row for row, row_id in enumerate(self._ids) if row_id not in doomed]
+        # Compact into temporary files and swap them in, ids last as on append.
+        vectors_tmp = self._file(f"{self.VECTORS_FILE}.tmp")
+        ids_tmp = self._file(f"{self.IDS_FILE}.tmp")
+        with open(vectors_tmp, "wb") as vectors_file:
+            vectors_file.write(np.asarray(self._vectors[keep], dtype=np.float32).tobytes())
+        with open(ids_tmp, "w", encoding="utf-8") as ids_file:
+            ids_file.write("".join(f"{self._ids[row]}\n" for row in keep))
+        self._vectors = None
+        if os.path.exists(self._file(self.HNSW_FILE)):
+            os.remove(self._file(self.HNSW_FILE))
+        os.replace(vectors_tmp, self._file(self.VECTORS_FILE))
+        self._compact_tags({self._entry_id(self._ids[row]) for row in keep})
+        os.replace(ids_tmp, self._file(self.IDS_FILE))
+        self._load()
+
+    def _compact_tags(self, entry_ids):
+        """Rewrite the tags file with the current tags of the given entries only; call with the write lock held."""
+        tags_tmp = self._file(f"{self.TAGS_FILE}.tmp")
+        with open(tags_tmp, "w", encoding="utf-8") as tags_file:
+            tags_file.write("".join(
+                json.dumps({"id": entry_id, "tags": entry_tags}) + "\n"
+                for entry_id, entry_tags in self._tags.items() if entry_id in entry_ids
+            ))
+        os.replace(tags_tmp, self._file(self.TAGS_FILE))
+        self._tag_lines = len(entry_ids & self._tags.keys())
+
+
+_vector_store = None
+_vector_store_lock = threading.Lock()
+
+
+def get_vector_store() -> VectorStore:
+    """
+    Return the process-wide vector store selected by settings.VECTOR_STORE.
+
+    Returns:
+        VectorStore: A WeaviateVectorStore for ``weaviate`` or a LocalVectorStore for ``local``.
+
+    Raises:
+        ValueError: If settings.VECTOR_STORE names an unknown store.
+    """
+    global _vector_store
+    if _vector_store is None:
+        with _vector_store_lock:
+            if _vector_store is None:
+                if settings.VECTOR_STORE == "weaviate":
+                    _vector_store = WeaviateVectorStore()
+                elif settings.VECTOR_STORE == "local":
+                    _vector_store = LocalVectorStore()
+                else:
+                    raise ValueError(f"Unknown vector store: {settings.VECTOR_STORE}")
+    return _vector_store
@@ -1,12 +1,330 @@
 """
 Weaviate client module.
 
-This module defines a client for interacting with a Weaviate instance.
-It provides functionality to send journal entry data to Weaviate for indexing.
+This module defines clients for interacting with a Weaviate instance.
+They provide functionality to send journal entry data to Weaviate for indexing,
+either one object at a time or in batches through the batch import endpoint,
+to run nearText semantic searches, and to list and delete stored objects.
+When an embedder is passed, objects carry precomputed vectors and searches
+use nearVector with a query embedded the same way. The nearest neighbours of
+stored entries are found in batches of nearObject queries, one request each.
+
+Entries are stored as one object per passage (see backend.services.chunker),
+each carrying its parent ``entry_id``, ``chunk_index`` and the entry's
+``tags``. Searches collapse passage hits back to one hit per entry, and can be
+restricted to entries with given tags by a ``where`` filter on that property.
+The filter compares whole tags only if ``tags`` was created with ``field``
+tokenization (see the README); an auto-created property splits tags into words.
+
+WeaviateClient is synchronous and shares one pooled, keep-alive requests.Session
+across all callers and threads. AsyncWeaviateClient offers the same calls on a
+shared httpx.AsyncClient for async endpoints and workers. Every request is
+timed, and failures counted, in backend.services.metrics.
+
+Both clients share one circuit breaker. After WEAVIATE_BREAKER_FAILURES
+consecutive connection errors, timeouts or 5xx responses, calls fail
+immediately with a retryable WeaviateError until a probe succeeds, so callers
+do not queue up on a Weaviate that is down.
 """
 
+import asyncio
+import json
 import os
+import threading
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from backend.core.config import settings
+from backend.services.chunker import collapse_hits, iter_entry_chunks, search_limit
+from backend.services.metrics import track_weaviate
+from backend.services.retry import CircuitBreaker, CircuitOpenError
+
+
+class WeaviateError(Exception):
+    """
+    Raised when a Weaviate request fails.
+
+    Attributes:
+        retryable (bool): True for failures worth retrying later: Weaviate
+            unreachable, timing out, overloaded (429, 5xx) or behind an open
+            circuit. False when it rejected the request itself.
+    """
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+def _is_outage(exc: Exception) -> bool:
+    """Return whether an error means Weaviate is unavailable, rather than that it rejected a request."""
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status is None or status == 429 or status >= 500
+
+
+weaviate_breaker = CircuitBreaker(
+    "weaviate",
+    failure_threshold=settings.WEAVIATE_BREAKER_FAILURES,
+    reset_timeout=settings.WEAVIATE_BREAKER_RESET_TIMEOUT,
+    is_failure=_is_outage,
+)
+
+
+def _entry_objects(entry_id: str, content: str, tags: list = None):
+    """
+    Build the Weaviate objects for the passages of a journal entry.
+
+    Args:
+        entry_id (str): The ID of the journal entry.
+        content (str): The content of the journal entry.
+        tags (list, optional): The entry's tags, stored on every passage.
+
+    Yields:
+        dict: One Weaviate object payload per passage, in order.
+    """
+    for object_id, index, passage in iter_entry_chunks(entry_id, content):
+        yield {
+            "class": "JournalEntry",
+            "id": object_id,
+            "properties": {
+                "content": passage,
+                "entry_id": str(entry_id),
+                "chunk_index": index,
+                **({"tags": list(tags)} if tags is not None else {}),
+            }
+        }
+
+
+def _batch_payload(entries, embedder=None, tags: dict = None):
+    """
+    Build a batch import payload for journal entries.
+
+    Args:
+        entries (iterable): (entry_id, content) pairs.
+        embedder (optional): Object with ``embed_many``; when given, every
+            object carries the ``vector`` of its passage, all computed in one call.
+        tags (dict, optional): Tag names keyed by string entry id; when given,
+            every object carries its entry's ``tags``.
+
+    Returns:
+        tuple: The payload and the number of passages of each entry, keyed by string id.
+    """
+    objects = []
+    counts = {}
+    for entry_id, content in entries:
+        start = len(objects)
+        entry_tags = tags.get(str(entry_id), []) if tags is not None else None
+        objects.extend(_entry_objects(entry_id, content, entry_tags))
+        counts[str(entry_id)] = len(objects) - start
+    if embedder is not None and objects:
+        vectors = embedder.embed_many(obj["properties"]["content"] for obj in objects)
+        for obj, vector in zip(objects, vectors):
+            obj["vector"] = vector.tolist()
+    return {"objects": objects}, counts
+
+
+def _entry_filter(entry_id: str, from_index: int = 0) -> dict:
+    """Build a where filter matching an entry's passages from from_index on."""
+    operands = [{"path": ["entry_id"], "operator": "Equal", "valueText": str(entry_id)}]
+    if from_index:
+        operands.append(
+            {"path": ["chunk_index"], "operator": "GreaterThanEqual", "valueInt": from_index}
+        )
+    return operands[0] if len(operands) == 1 else {"operator": "And", "operands": operands}
+
+
+def _batch_delete_payload(filters: list) -> dict:
+    """Build a batch delete body removing the objects matching any of filters."""
+    where = filters[0] if len(filters) == 1 else {"operator": "Or", "operands": filters}
+    return {"match": {"class": "JournalEntry", "where": where}}
+
+
+def _tags_where(tags) -> str:
+    """
+    Build the GraphQL ``where`` argument matching objects that carry every given tag.
+
+    Args:
+        tags (list): Normalised tag names.
+
+    Returns:
+        str: The argument, starting with ``, where:``, or an empty string without tags.
+    """
+    operands = [
+        f'{{ path: ["tags"], operator: Equal, valueText: {json.dumps(tag)} }}' for tag in tags or []
+    ]
+    if not operands:
+        return ""
+    if len(operands) == 1:
+        return f", where: {operands[0]}"
+    return f", where: {{ operator: And, operands: [{', '.join(operands)}] }}"
+
+
+def _near_text_query(query: str, limit: int, certainty: float = None, tags: list = None) -> dict:
+    """
+    Build a nearText GraphQL request for journal entries.
+
+    The search text is embedded as a JSON string literal, so quotes and
+    backslashes in user input cannot change the shape of the query.
+
+    Args:
+        query (str): The search text.
+        limit (int): Maximum number of hits.
+        certainty (float, optional): Minimum certainty of returned hits.
+        tags (list, optional): Only match objects carrying all of these tags.
+
+    Returns:
+        dict: The GraphQL request body.
+    """
+    near_text = f"concepts: [{json.dumps(query)}]"
+    if certainty is not None:
+        near_text += f", certainty: {float(certainty)}"
+    return {
+        "query": (
+            f"{{ Get {{ JournalEntry(nearText: {{ {near_text} }}{_tags_where(tags)}, "
+            f"limit: {int(limit)}) {{ "
+            "entry_id _additional { id certainty } } } }"
+        )
+    }
+
+
+def _near_vector_query(vector, limit: int, certainty: float = None, tags: list = None) -> dict:
+    """
+    Build a nearVector GraphQL request for journal entries.
+
+    Args:
+        vector: The query vector.
+        limit (int): Maximum number of hits.
+        certainty (float, optional): Minimum certainty of returned hits.
+        tags (list, optional): Only match objects carrying all of these tags.
+
+    Returns:
+        dict: The GraphQL request body.
+    """
+    near_vector = f"vector: {json.dumps([float(value) for value in vector])}"
+    if certainty is not None:
+        near_vector += f", certainty: {float(certainty)}"
+    return {
+        "query": (
+            f"{{ Get {{ JournalEntry(nearVector: {{ {near_vector} }}{_tags_where(tags)}, "
+            f"limit: {int(limit)}) {{ "
+            "entry_id _additional { id certainty } } } }"
+        )
+    }
+
+
+def _near_objects_query(entry_ids: list, limit: int) -> dict:
+    """
+    Build one GraphQL request running a nearObject query per entry.
+
+    Each query is aliased ``n<i>`` after the entry's position in entry_ids, and
+    starts from the entry's first passage, stored under the entry's own UUID.
+
+    Args:
+        entry_ids (list): The entry UUIDs.
+        limit (int): Maximum number of hits per entry.
+
+    Returns:
+        dict: The GraphQL request body.
+    """
+    queries = " ".join(
+        f"n{index}: JournalEntry(nearObject: {{ id: {json.dumps(str(entry_id))} }}, limit: {int(limit)}) {{ "
+        "entry_id _additional { id certainty } }"
+        for index, entry_id in enumerate(entry_ids)
+    )
+    return {"query": f"{{ Get {{ {queries} }} }}"}
+
+
+def _object_ids_query(limit: int, after: str = None) -> dict:
+    """
+    Build a GraphQL request listing journal entry object ids with the cursor API.
+
+    Objects come back in UUID order, starting after the ``after`` UUID.
+
+    Args:
+        limit (int): Maximum number of ids.
+        after (str, optional): The last UUID of the previous page.
+
+    Returns:
+        dict: The GraphQL request body.
+    """
+    arguments = f"limit: {int(limit)}"
+    if after is not None:
+        arguments += f", after: {json.dumps(str(after))}"
+    return {
+        "query": f"{{ Get {{ JournalEntry({arguments}) {{ entry_id _additional {{ id }} }} }} }}"
+    }
+
+
+def _parse_near_text(data: dict) -> list:
+    """
+    Extract ranked hits from a GraphQL Get response on journal entry objects.
+
+    Args:
+        data (dict): The decoded GraphQL response.
+
+    Returns:
+        list: Dicts with the parent entry ``id``, the ``object_id`` and the
+        ``certainty`` (if requested), in response order. Objects written
+        before entries were chunked have no ``entry_id`` and map to themselves.
+
+    Raises:
+        WeaviateError: If Weaviate reported GraphQL errors.
+    """
+    if data.get("errors"):
+        raise WeaviateError(f"Error searching journal entries: {data['errors']}", retryable=False)
+    results = (data.get("data") or {}).get("Get", {}).get("JournalEntry") or []
+    return [
+        {
+            "id": result.get("entry_id") or result["_additional"]["id"],
+            "object_id": result["_additional"]["id"],
+            "certainty": result["_additional"].get("certainty"),
+        }
+        for result in results
+    ]
+
+
+def _parse_near_objects(data: dict, entry_ids: list, limit: int) -> dict:
+    """
+    Extract the neighbours of each entry from a response to _near_objects_query.
+
+    An entry whose query failed, typically because it is not stored, is left
+    out rather than failing the whole batch.
+
+    Args:
+        data (dict): The decoded GraphQL response.
+        entry_ids (list): The entry UUIDs, in query order.
+        limit (int): Maximum number of neighbours per entry.
+
+    Returns:
+        dict: Hits with the entry ``id`` and ``certainty``, best match first,
+        keyed by the string id of each entry; an entry's own passages are excluded.
+
+    Raises:
+        WeaviateError: If no query of the batch succeeded.
+    """
+    results = (data.get("data") or {}).get("Get") or {}
+    if data.get("errors") and not any(results.values()):
+        raise WeaviateError(f"Error finding related journal entries: {data['errors']}", retryable=False)
+    neighbors = {}
+    for index, entry_id in enumerate(entry_ids):
+        hits = results.get(f"n{index}")
+        if hits is None:
+            continue
+        entry_id = str(entry_id)
+        neighbors[entry_id] = collapse_hits(
+            (hit for hit in _parse_near_text({"data": {"Get": {"JournalEntry": hits}}})
+             if hit["id"] != entry_id),
+            limit,
+        )
+    return neighbors
+
+
+def _parse_batch_results(results: list) -> list:
+    """Attach the parent entry ``id`` to each per-object batch import result."""
+    for result in results:
+        result["object_id"] = result.get("id")
+        result["id"] = (result.get("properties") or {}).get("entry_id") or result.get("id")
+    return results
+
 
 class WeaviateClient:
     """
@@ -17,35 +335,544 @@ class WeaviateClient:
     """
     BASE_URL = os.getenv("WEAVIATE_URL", "http://weaviate:8080")
 
+    _session = None
+    _session_lock = threading.Lock()
+
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        """
+        Return the shared, pooled HTTP session, creating it on first use.
+
+        The session keeps connections alive between calls, with at most
+        settings.WEAVIATE_POOL_MAXSIZE connections per host.
+
+        Returns:
+            requests.Session: The shared session.
+        """
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=settings.WEAVIATE_POOL_CONNECTIONS,
+                        pool_maxsize=settings.WEAVIATE_POOL_MAXSIZE,
+                        pool_block=True,
+                    )
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    cls._session = session
+        return cls._session
+
+    @classmethod
+    def close(cls):
+        """Close the shared session and its pooled connections."""
+        with cls._session_lock:
+            if cls._session is not None:
+                cls._session.close()
+                cls._session = None
+
+    @classmethod
+    def _post(cls, path: str, payload: dict):
+        """
+        POST a JSON payload to Weaviate over the shared session.
+
+        Args:
+            path (str): The API path, starting with ``/v1``.
+            payload (dict): The JSON body.
+
+        Returns:
+            The decoded JSON response.
+
+        Raises:
+            requests.RequestException: If the request fails.
+            CircuitOpenError: If the circuit is open.
+        """
+        with weaviate_breaker.guard(), track_weaviate(f"POST {path}"):
+            response = cls.get_session().post(
+                f"{cls.BASE_URL}{path}",
+                json=payload,
+                timeout=(settings.WEAVIATE_CONNECT_TIMEOUT, settings.WEAVIATE_READ_TIMEOUT),
+            )
+            response.raise_for_status()
+            return response.json()
+
+    @classmethod
+    def _delete_where(cls, filters: list):
+        """
+        Delete every journal entry object matching any of filters in one batch request.
+
+        Args:
+            filters (list): Weaviate where filters.
+
+        Raises:
+            requests.RequestException: If the request fails.
+            CircuitOpenError: If the circuit is open.
+        """
+        with weaviate_breaker.guard(), track_weaviate("DELETE /v1/batch/objects"):
+            response = cls.get_session().delete(
+                f"{cls.BASE_URL}/v1/batch/objects",
+                json=_batch_delete_payload(filters),
+                timeout=(settings.WEAVIATE_CONNECT_TIMEOUT, settings.WEAVIATE_READ_TIMEOUT),
+            )
+            response.raise_for_status()
+
+    @classmethod
+    def probe(cls) -> bool:
+        """
+        Check whether Weaviate is ready, through the circuit breaker.
+
+        While the circuit is open and a probe is due, this readiness check is
+        the probe, so the circuit closes again without risking real work.
+
+        Returns:
+            bool: True if Weaviate answered ready, False otherwise or while the circuit is open.
+        """
+        try:
+            with weaviate_breaker.guard(), track_weaviate("GET /v1/.well-known/ready"):
+                response = cls.get_session().get(
+                    f"{cls.BASE_URL}/v1/.well-known/ready",
+                    timeout=(settings.WEAVIATE_CONNECT_TIMEOUT, settings.WEAVIATE_READ_TIMEOUT),
+                )
+                response.raise_for_status()
+        except (requests.RequestException, CircuitOpenError):
+            return False
+        return True
+
     @classmethod
     def send_entry_to_weaviate(cls, entry_id: str, content: str):
         """
         Send a journal entry to Weaviate for indexing.
 
-        Constructs a payload from the given journal entry data and sends a POST
-        request to the Weaviate instance. Raises an exception if the request fails.
+        The entry is split into passages, which are imported with one batch request.
 
         Args:
             entry_id (str): The ID of the journal entry.
             content (str): The content of the journal entry.
 
         Returns:
-            dict: The JSON response from the Weaviate instance.
+            list: Per-passage results from Weaviate.
 
         Raises:
-            Exception: If there is an error sending the entry to Weaviate.
+            WeaviateError: If there is an error sending the entry to Weaviate.
+        """
+        return cls.send_batch_to_weaviate([(entry_id, content)])
+
+    @classmethod
+    def send_batch_to_weaviate(cls, entries, embedder=None, tags: dict = None):
+        """
+        Send several journal entries to Weaviate in one batch import request.
+
+        Each entry is split into overlapping passages, stored as objects with
+        stable UUIDs, so re-importing an entry overwrites its objects instead
+        of creating duplicates. Passages left over from a longer previous
+        version of an entry are then removed with one batch delete.
+
+        Args:
+            entries (iterable): (entry_id, content) pairs to index.
+            embedder (optional): Computes the passage vectors sent with the
+                objects; without it, Weaviate vectorises them itself.
+            tags (dict, optional): Tag names keyed by string entry id, stored
+                on the objects as the filterable ``tags`` property.
+
+        Returns:
+            list: Per-object results from Weaviate, in request order, with
+            ``id`` set to the parent entry id and ``object_id`` to the object UUID.
+
+        Raises:
+            WeaviateError: If the batch request itself fails.
+        """
+        payload, counts = _batch_payload(entries, embedder, tags)
+        try:
+            results = _parse_batch_results(cls._post("/v1/batch/objects", payload))
+            if counts:
+                cls._delete_where([_entry_filter(entry_id, count) for entry_id, count in counts.items()])
+        except (requests.RequestException, CircuitOpenError) as e:
+            raise WeaviateError(
+                f"Error batch indexing journal entries: {e}", retryable=_is_outage(e)
+            ) from e
+        return results
+
+    @classmethod
+    def near_text(cls, query: str, limit: int = 10, certainty: float = None,
+                  tags: list = None) -> list:
+        """
+        Run a nearText search over journal entries.
+
+        Passage hits are over-fetched and collapsed to the best passage of each entry.
+
+        Args:
+            query (str): The search text.
+            limit (int, optional): Maximum number of entries. Defaults to 10.
+            certainty (float, optional): Minimum certainty of returned hits.
+            tags (list, optional): Only return entries carrying all of these tags.
+
+        Returns:
+            list: Dicts with the entry ``id`` and ``certainty``, best match first.
+
+        Raises:
+            WeaviateError: If the search fails.
+        """
+        try:
+            data = cls._post("/v1/graphql", _near_text_query(query, search_limit(limit), certainty, tags))
+        except (requests.RequestException, CircuitOpenError) as e:
+            raise WeaviateError(
+                f"Error searching journal entries: {e}", retryable=_is_outage(e)
+            ) from e
+        return collapse_hits(_parse_near_text(data), limit)
+
+    @classmethod
+    def near_vector(cls, vector, limit: int = 10, certainty: float = None, tags: list = None) -> list:
+        """
+        Run a nearVector search over journal entries, one hit per entry.
+
+        Args:
+            vector: The embedded search text.
+            limit (int, optional): Maximum number of entries. Defaults to 10.
+            certainty (float, optional): Minimum certainty of returned hits.
+            tags (list, optional): Only return entries carrying all of these tags.
+
+        Returns:
+            list: Dicts with the entry ``id`` and ``certainty``, best match first.
+
+        Raises:
+            WeaviateError: If the search fails.
+        """
+        try:
+            data = cls._post("/v1/graphql", _near_vector_query(vector, search_limit(limit), certainty, tags))
+        except (requests.RequestException, CircuitOpenError) as e:
+            raise WeaviateError(
+                f"Error searching journal entries: {e}", retryable=_is_outage(e)
+            ) from e
+        return collapse_hits(_parse_near_text(data), limit)
+
+    @classmethod
+    def near_objects(cls, entry_ids, limit: int = 10) -> dict:
+        """
+        Find the nearest other entries of stored entries, in one request.
+
+        Args:
+            entry_ids (iterable): The entry UUIDs.
+            limit (int, optional): Maximum number of neighbours per entry. Defaults to 10.
+
+        Returns:
+            dict: Hits with the entry ``id`` and ``certainty``, best match
+            first, keyed by the string id of each entry found in Weaviate.
+
+        Raises:
+            WeaviateError: If the request fails.
+        """
+        entry_ids = [str(entry_id) for entry_id in entry_ids]
+        if not entry_ids:
+            return {}
+        # One more entry is fetched since each query also finds the entry itself.
+        try:
+            data = cls._post("/v1/graphql", _near_objects_query(entry_ids, search_limit(limit + 1)))
+        except (requests.RequestException, CircuitOpenError) as e:
+            raise WeaviateError(
+                f"Error finding related journal entries: {e}", retryable=_is_outage(e)
+            ) from e
+        return _parse_near_objects(data, entry_ids, limit)
+
+    @classmethod
+    def list_objects(cls, limit: int = 1000, after: str = None) -> list:
+        """
+        List one page of journal entry objects, in object UUID order.
+
+        Args:
+            limit (int, optional): Maximum number of objects. Defaults to 1000.
+            after (str, optional): The last object UUID of the previous page.
+
+        Returns:
+            list: Dicts with the parent entry ``id`` and the ``object_id``;
+            empty past the last page.
+
+        Raises:
+            WeaviateError: If the request fails.
+        """
+        try:
+            data = cls._post("/v1/graphql", _object_ids_query(limit, after))
+        except (requests.RequestException, CircuitOpenError) as e:
+            raise WeaviateError(
+                f"Error listing journal entry objects: {e}", retryable=_is_outage(e)
+            ) from e
+        return _parse_near_text(data)
+
+    @classmethod
+    def export_objects(cls, limit: int = 1000, after: str = None) -> list:
+        """
+        List one page of journal entry objects with their properties and vectors.
+
+        Objects come back in UUID order through the objects API's ``after``
+        cursor, with ``include=vector``.
+
+        Args:
+            limit (int, optional): Maximum number of objects. Defaults to 1000.
+            after (str, optional): The last object UUID of the previous page.
+
+        Returns:
+            list: Weaviate objects with ``id``, ``properties`` and ``vector``;
+            empty past the last page.
+
+        Raises:
+            WeaviateError: If the request fails.
+        """
+        params = {"class": "JournalEntry", "limit": int(limit), "include": "vector"}
+        if after is not None:
+            params["after"] = str(after)
+        try:
+            with weaviate_breaker.guard(), track_weaviate("GET /v1/objects"):
+                response = cls.get_session().get(
+                    f"{cls.BASE_URL}/v1/objects",
+                    params=params,
+                    timeout=(settings.WEAVIATE_CONNECT_TIMEOUT, settings.WEAVIATE_READ_TIMEOUT),
+                )
+                response.raise_for_status()
+                return response.json().get("objects") or []
+        except (requests.RequestException, CircuitOpenError) as e:
+            raise WeaviateError(
+                f"Error exporting journal entry objects: {e}", retryable=_is_outage(e)
+            ) from e
+
+    @classmethod
+    def import_objects(cls, objects: list) -> list:
+        """
+        Import prepared objects, such as those of a snapshot, with one batch request.
+
+        Objects are sent as given, so those carrying a ``vector`` are stored
+        without being vectorised again.
+
+        Args:
+            objects (list): Weaviate objects with ``class``, ``id``, ``properties``
+                and optionally ``vector``.
+
+        Returns:
+            list: Per-object results from Weaviate, in request order.
+
+        Raises:
+            WeaviateError: If the batch request itself fails.
         """
-        url = f"{cls.BASE_URL}/v1/objects"
-        payload = {
-            "class": "JournalEntry",
-            "id": str(entry_id), # convert to str
-            "properties": {
-                "content": content
-            }
-        }
         try:
-            response = requests.post(url, json=payload)
+            return cls._post("/v1/batch/objects", {"objects": objects})
+        except (requests.RequestException, CircuitOpenError) as e:
+            raise WeaviateError(
+                f"Error importing journal entry objects: {e}", retryable=_is_outage(e)
+            ) from e
+
+    @classmethod
+    def delete_entries(cls, entry_ids):
+        """
+        Delete every object of the given journal entries.
+
+        Passages are removed with one batch delete; objects stored before
+        entries were chunked carry no ``entry_id`` and are deleted by UUID.
+        Deleting missing objects is not an error.
+
+        Args:
+            entry_ids (iterable): The IDs of the journal entries.
+
+        Raises:
+            WeaviateError: If a request fails.
+        """
+        entry_ids = [str(entry_id) for entry_id in entry_ids]
+        if not entry_ids:
+            return
+        try:
+            cls._delete_where([_entry_filter(entry_id) for entry_id in entry_ids])
+            for entry_id in entry_ids:
+                with weaviate_breaker.guard(), track_weaviate("DELETE /v1/objects"):
+                    response = cls.get_session().delete(
+                        f"{cls.BASE_URL}/v1/objects/JournalEntry/{entry_id}",
+                        timeout=(settings.WEAVIATE_CONNECT_TIMEOUT, settings.WEAVIATE_READ_TIMEOUT),
+                    )
+                    if response.status_code != 404:
+                        response.raise_for_status()
+        except (requests.RequestException, CircuitOpenError) as e:
+            raise WeaviateError(
+                f"Error deleting journal entry objects: {e}", retryable=_is_outage(e)
+            ) from e
+
+
+class AsyncWeaviateClient:
+    """
+    Async client for interacting with Weaviate without blocking the event loop.
+
+    All calls share one pooled httpx.AsyncClient. Call ``close()`` on shutdown.
+
+    Attributes:
+        BASE_URL (str): The base URL for the Weaviate instance.
+    """
+    BASE_URL = WeaviateClient.BASE_URL
+
+    _client = None
+
+    @classmethod
+    def get_client(cls) -> httpx.AsyncClient:
+        """
+        Return the shared async HTTP client, creating it on first use.
+
+        Returns:
+            httpx.AsyncClient: The shared client.
+        """
+        if cls._client is None:
+            cls._client = httpx.AsyncClient(
+                base_url=cls.BASE_URL,
+                limits=httpx.Limits(
+                    max_connections=settings.WEAVIATE_POOL_MAXSIZE,
+                    max_keepalive_connections=settings.WEAVIATE_POOL_MAXSIZE,
+                ),
+                timeout=httpx.Timeout(
+                    settings.WEAVIATE_READ_TIMEOUT, connect=settings.WEAVIATE_CONNECT_TIMEOUT
+                ),
+            )
+        return cls._client
+
+    @classmethod
+    async def close(cls):
+        """Close the shared async client and its pooled connections."""
+        if cls._client is not None:
+            await cls._client.aclose()
+            cls._client = None
+
+    @classmethod
+    async def _post(cls, path: str, payload: dict):
+        """
+        POST a JSON payload to Weaviate over the shared async client.
+
+        Args:
+            path (str): The API path, starting with ``/v1``.
+            payload (dict): The JSON body.
+
+        Returns:
+            The decoded JSON response.
+
+        Raises:
+            httpx.HTTPError: If the request fails.
+            CircuitOpenError: If the circuit is open.
+        """
+        with weaviate_breaker.guard(), track_weaviate(f"POST {path}"):
+            response = await cls.get_client().post(path, json=payload)
             response.raise_for_status()
             return response.json()
-        except requests.RequestException as e:
-            raise Exception("Error indexing journal entry: {e}")
+
+    @classmethod
+    async def _delete_where(cls, filters: list):
+        """
+        Delete every journal entry object matching any of filters in one batch request.
+
+        Args:
+            filters (list): Weaviate where filters.
+
+        Raises:
+            httpx.HTTPError: If the request fails.
+            CircuitOpenError: If the circuit is open.
+        """
+        with weaviate_breaker.guard(), track_weaviate("DELETE /v1/batch/objects"):
+            response = await cls.get_client().request(
+                "DELETE", "/v1/batch/objects", json=_batch_delete_payload(filters)
+            )
+            response.raise_for_status()
+
+    @classmethod
+    async def send_entry_to_weaviate(cls, entry_id: str, content: str):
+        """
+        Send a journal entry to Weaviate for indexing.
+
+        Args:
+            entry_id (str): The ID of the journal entry.
+            content (str): The content of the journal entry.
+
+        Returns:
+            list: Per-passage results from Weaviate.
+
+        Raises:
+            WeaviateError: If there is an error sending the entry to Weaviate.
+        """
+        return await cls.send_batch_to_weaviate([(entry_id, content)])
+
+    @classmethod
+    async def send_batch_to_weaviate(cls, entries, embedder=None, tags: dict = None):
+        """
+        Send several journal entries to Weaviate in one batch import request.
+
+        See WeaviateClient.send_batch_to_weaviate. Vectors are computed in a
+        worker thread, off the event loop.
+
+        Args:
+            entries (iterable): (entry_id, content) pairs to index.
+            embedder (optional): Computes the passage vectors sent with the objects.
+            tags (dict, optional): Tag names keyed by string entry id, stored on the objects.
+
+        Returns:
+            list: Per-object results from Weaviate, in request order.
+
+        Raises:
+            WeaviateError: If the batch request itself fails.
+        """
+        payload, counts = await asyncio.to_thread(_batch_payload, list(entries), embedder, tags)
+        try:
+            results = _parse_batch_results(await cls._post("/v1/batch/objects", payload))
+            if counts:
+                await cls._delete_where(
+                    [_entry_filter(entry_id, count) for entry_id, count in counts.items()]
+                )
+        except (httpx.HTTPError, CircuitOpenError) as e:
+            raise WeaviateError(
+                f"Error batch indexing journal entries: {e}", retryable=_is_outage(e)
+            ) from e
+        return results
+
+    @classmethod
+    async def near_text(cls, query: str, limit: int = 10, certainty: float = None,
+                        tags: list = None) -> list:
+        """
+        Run a nearText search over journal entries, one hit per entry.
+
+        Args:
+            query (str): The search text.
+            limit (int, optional): Maximum number of entries. Defaults to 10.
+            certainty (float, optional): Minimum certainty of returned hits.
+            tags (list, optional): Only return entries carrying all of these tags.
+
+        Returns:
+            list: Dicts with the entry ``id`` and ``certainty``, best match first.
+
+        Raises:
+            WeaviateError: If the search fails.
+        """
+        try:
+            data = await cls._post(
+                "/v1/graphql", _near_text_query(query, search_limit(limit), certainty, tags)
+            )
+        except (httpx.HTTPError, CircuitOpenError) as e:
+            raise WeaviateError(
+                f"Error searching journal entries: {e}", retryable=_is_outage(e)
+            ) from e
+        return collapse_hits(_parse_near_text(data), limit)
+
+    @classmethod
+    async def near_vector(cls, vector, limit: int = 10, certainty: float = None,
+                          tags: list = None) -> list:
+        """
+        Run a nearVector search over journal entries, one hit per entry.
+
+        Args:
+            vector: The embedded search text.
+            limit (int, optional): Maximum number of entries. Defaults to 10.
+            certainty (float, optional): Minimum certainty of returned hits.
+            tags (list, optional): Only return entries carrying all of these tags.
+
+        Returns:
+            list: Dicts with the entry ``id`` and ``certainty``, best match first.
+
+        Raises:
+            WeaviateError: If the search fails.
+        """
+        try:
+            data = await cls._post(
+                "/v1/graphql", _near_vector_query(vector, search_limit(limit), certainty, tags)
+            )
+        except (httpx.HTTPError, CircuitOpenError) as e:
+            raise WeaviateError(
+                f"Error searching journal entries: {e}", retryable=_is_outage(e)
+            ) from e
+        return collapse_hits(_parse_near_text(data), limit)
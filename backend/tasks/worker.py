@@ -1,31 +1,225 @@
 """
-Worker module for sending journal entries to Weaviate.
+Worker module for draining the indexing outbox into the vector store.
 
-This module defines a function to send a journal entry to a Weaviate instance.
-It uses the WeaviateClient to create an entry and logs an error if the operation fails.
+This module defines the outbox worker. Each worker thread repeatedly claims a
+batch of IndexingOutbox rows with ``SELECT ... FOR UPDATE SKIP LOCKED``, sends
+the corresponding journal entries to the vector store (Weaviate by default) in
+one batch, with the tags extracted from them (backend.services.tagging), and
+deletes the rows that were indexed. Failed rows stay in the outbox with a
+jittered exponential backoff, so they survive worker crashes and restarts.
+Rows that fail permanently, or use up their attempts, are moved to the
+dead-letter table (backend.services.dead_letters).
+While the vector store is unavailable, for example with Weaviate's circuit
+breaker open, workers claim nothing, so waiting does not use up attempts.
+
+Run it as a separate process:
+
+    python -m backend.tasks.worker
 """
 
 import logging
-from services.weaviate_client import WeaviateClient
+import threading
+from datetime import timedelta
+from sqlalchemy import func
+from backend.core.config import settings
+from backend.database import SessionLocal
+from backend.models.journal import JournalEntry
+from backend.models.outbox import IndexingOutbox
+from backend.services.cache import get_cache
+from backend.services.dead_letters import dead_letter
+from backend.services.metrics import INDEXING_RETRIES, serve_metrics
+from backend.services.retry import backoff_delay
+from backend.services.tagging import tag_entries
+from backend.services.vector_store import get_vector_store
 
 logger = logging.getLogger(__name__)
 
-def send_entry_to_weaviate(entry_id: int, content: str):
+MAX_BACKOFF_SECONDS = 300
+
+def seconds_from_now(dialect_name: str, seconds: float):
+    """
+    Build the SQL timestamp a number of seconds after the database's now().
+
+    SQLite has no interval arithmetic, so its ``datetime()`` is used instead,
+    which writes the same text format as the CURRENT_TIMESTAMP default.
+
+    Args:
+        dialect_name (str): The SQLAlchemy dialect name of the session's bind.
+        seconds (float): The delay.
+
+    Returns:
+        ColumnElement: The timestamp expression.
+    """
+    if dialect_name == "sqlite":
+        return func.datetime("now", f"+{seconds} seconds")
+    return func.now() + timedelta(seconds=seconds)
+
+def claim_outbox_batch(db_session, batch_size: int, max_attempts: int):
     """
-    Send a journal entry to Weaviate.
+    Lock a batch of due outbox rows for the current transaction.
 
-    This function attempts to create a new entry in Weaviate using the provided
-    entry_id and content. In case of an error during the process, it logs the error.
+    Rows locked by other workers are skipped rather than waited on, so any
+    number of workers can drain the outbox concurrently without overlap.
 
     Args:
-        entry_id (int): The ID of the journal entry.
-        content (str): The content of the journal entry.
+        db_session: The database session whose transaction holds the locks.
+        batch_size (int): Maximum number of rows to claim.
+        max_attempts (int): Rows with this many failed attempts are not claimed.
 
     Returns:
-        None
+        list: The claimed IndexingOutbox rows.
+    """
+    return (
+        db_session.query(IndexingOutbox)
+        .filter(IndexingOutbox.available_at <= func.now(),
+                IndexingOutbox.attempts < max_attempts)
+        .order_by(IndexingOutbox.available_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+def _reschedule(db_session, job, error: str, max_attempts: int, retryable: bool = True):
+    """
+    Record a failed attempt on an outbox row and back it off exponentially, with jitter.
+
+    A row whose error is not retryable, or that has used up max_attempts, is
+    moved to the dead-letter table instead.
+
+    Args:
+        db_session: The database session holding the row.
+        job (IndexingOutbox): The outbox row that failed.
+        error (str): The error message to keep on the row.
+        max_attempts (int): Attempts after which the row is dead-lettered.
+        retryable (bool, optional): Whether retrying may succeed. Defaults to True.
     """
+    job.attempts += 1
+    if not retryable or job.attempts >= max_attempts:
+        dead_letter(db_session, job.entry_id, job.attempts, error)
+        db_session.delete(job)
+        logger.error("Gave up indexing entry %s after %d attempts: %s",
+                     job.entry_id, job.attempts, error)
+        return
+    INDEXING_RETRIES.inc(source="outbox")
+    job.last_error = error
+    job.available_at = seconds_from_now(
+        db_session.get_bind().dialect.name, backoff_delay(job.attempts, cap=MAX_BACKOFF_SECONDS)
+    )
+    logger.warning("Indexing attempt %d for entry %s failed: %s",
+                   job.attempts, job.entry_id, error)
+
+def process_outbox_batch(db_session, batch_size: int = None, max_attempts: int = None) -> int:
+    """
+    Claim one batch of outbox rows and index their entries into the vector store.
+
+    The claimed entries are loaded with one query, tagged, and sent with
+    their tags in one batch upsert. Successfully indexed rows are deleted and
+    their entries' index state (indexed_hash, indexed_at) is recorded. Failed
+    rows get their attempt count incremented and are rescheduled with jittered
+    exponential backoff, or dead-lettered. Nothing is claimed while the
+    vector store is unavailable.
+
+    Args:
+        db_session: The database session used for the batch.
+        batch_size (int, optional): Defaults to settings.OUTBOX_BATCH_SIZE.
+        max_attempts (int, optional): Defaults to settings.OUTBOX_MAX_ATTEMPTS.
+
+    Returns:
+        int: The number of rows claimed.
+    """
+    max_attempts = max_attempts or settings.OUTBOX_MAX_ATTEMPTS
+    vector_store = get_vector_store()
+    if not vector_store.available():
+        return 0
+    jobs = claim_outbox_batch(db_session, batch_size or settings.OUTBOX_BATCH_SIZE, max_attempts)
+    if not jobs:
+        return 0
+
+    entries = {
+        entry.id: entry
+        for entry in db_session.query(JournalEntry).filter(
+            JournalEntry.id.in_([job.entry_id for job in jobs])
+        )
+    }
+    # Tagging errors are database errors; they roll the claim back instead of using up attempts.
+    tags = tag_entries(db_session, entries.values())
     try:
-        weaviate_client = WeaviateClient()
-        weaviate_client.create_entry(id=str(entry_id), content=content)
-    except Exception as excep:  # Consider catching more specific exceptions
-        logger.error("Error sending entry to Weaviate: %s", excep)
+        errors = vector_store.upsert(
+            [(entry.id, entry.content) for entry in entries.values()], tags=tags
+        ) if entries else {}
+    except Exception as excep:  # Keep the jobs whatever went wrong
+        retryable = getattr(excep, "retryable", True)
+        for job in jobs:
+            _reschedule(db_session, job, str(excep), max_attempts, retryable)
+    else:
+        for job in jobs:
+            error = errors.get(str(job.entry_id))
+            if error:
+                _reschedule(db_session, job, error, max_attempts)
+            else:
+                db_session.delete(job)
+                entry = entries.get(job.entry_id)
+                if entry is not None:
+                    entry.indexed_hash = entry.content_hash
+                    entry.indexed_at = func.now()
+        logger.info("Indexed %d of %d entries", len(entries) - len(errors), len(jobs))
+        # Newly indexed entries can change search results cached in a shared backend.
+        get_cache().bump("search")
+    db_session.commit()
+    return len(jobs)
+
+def _worker_loop(stop_event: threading.Event):
+    """
+    Drain the outbox until stop_event is set, sleeping while it is empty.
+
+    Args:
+        stop_event (threading.Event): Signals the loop to exit.
+    """
+    while not stop_event.is_set():
+        db_session = SessionLocal()
+        try:
+            claimed = process_outbox_batch(db_session)
+        except Exception as excep:  # Database errors must not kill the worker thread
+            db_session.rollback()
+            logger.error("Error draining the indexing outbox: %s", excep)
+            claimed = 0
+        finally:
+            db_session.close()
+        if not claimed:
+            stop_event.wait(settings.OUTBOX_POLL_INTERVAL)
+
+def run_worker(concurrency: int = None):
+    """
+    Start the outbox worker threads and block until interrupted.
+
+    When settings.WORKER_METRICS_PORT is set, the worker's own metrics (Weaviate
+    latency and failures, indexing retries, SQL timings) are served on that port.
+
+    Args:
+        concurrency (int, optional): Number of worker threads.
+            Defaults to settings.OUTBOX_WORKER_CONCURRENCY.
+    """
+    concurrency = concurrency or settings.OUTBOX_WORKER_CONCURRENCY
+    if settings.WORKER_METRICS_PORT:
+        serve_metrics(settings.WORKER_METRICS_PORT)
+    stop_event = threading.Event()
+    threads = [
+        threading.Thread(target=_worker_loop, args=(stop_event,), name=f"outbox-worker-{i}")
+        for i in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    logger.info("Started %d outbox worker threads", concurrency)
+    try:
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(timeout=1)
+    except KeyboardInterrupt:
+        logger.info("Stopping outbox workers")
+        stop_event.set()
+        for thread in threads:
+            thread.join()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run_worker()
@@ -0,0 +1,250 @@
+"""
+Fake Weaviate server for offline benchmarks.
+
+This module serves the subset of the Weaviate REST API that the app uses
+(batch import and delete, single-object delete, the readiness check, the
+paginated object listing used by snapshots, and GraphQL ``Get`` queries with ``nearText``, ``nearVector``, aliased
+``nearObject`` or the ``after`` cursor, and ``where`` filters on ``tags``) from an in-memory object map. Every request is delayed by a
+configurable latency, and a configurable share of requests fails with HTTP 500, so the app's behaviour under a slow or flaky
+Weaviate can be measured without the real service.
+
+Search results are drawn deterministically from the stored entries, seeded by
+the query text, so a run is reproducible for a given seed.
+
+Run it on its own with:
+
+    python -m benchmarks.fake_weaviate --port 8081 --latency-ms 20 --failure-rate 0.01
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from urllib.parse import parse_qs, urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LIMIT_PATTERN = re.compile(r"limit:\s*(\d+)")
+AFTER_PATTERN = re.compile(r'after:\s*"([^"]*)"')
+TAG_PATTERN = re.compile(r'path:\s*\["tags"\],\s*operator:\s*Equal,\s*valueText:\s*("(?:[^"\\]|\\.)*")')
+NEAR_OBJECT_PATTERN = re.compile(r'(\w+):\s*JournalEntry\(nearObject:\s*\{\s*id:\s*"([^"]*)"')
+
+
+class FakeWeaviate:
+    """
+    In-memory state and fault injection shared by the request handlers.
+
+    Attributes:
+        latency (float): Seconds added to every request.
+        jitter (float): Maximum extra seconds added at random to every request.
+        failure_rate (float): Share of requests answered with HTTP 500, in [0, 1].
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, failure_rate: float = 0.0,
+                 seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.objects = {}
+        self.payloads = {}
+        self.requests = 0
+        self.failures = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay_and_fail(self) -> bool:
+        """Sleep for the configured latency and return whether to fail this request."""
+        with self._lock:
+            self.requests += 1
+            extra = self._random.uniform(0, self.jitter) if self.jitter else 0.0
+            fail = self._random.random() < self.failure_rate
+            if fail:
+                self.failures += 1
+        time.sleep(self.latency + extra)
+        return fail
+
+    def add_entries(self, entry_ids):
+        """Register entries as already indexed, each with a single passage."""
+        with self._lock:
+            for entry_id in entry_ids:
+                self.objects[str(entry_id)] = str(entry_id)
+                self.payloads[str(entry_id)] = {
+                    "properties": {"entry_id": str(entry_id), "chunk_index": 0}, "vector": None,
+                }
+
+    def batch_import(self, objects: list) -> list:
+        with self._lock:
+            for obj in objects:
+                properties = obj.get("properties") or {}
+                self.objects[obj["id"]] = properties.get("entry_id") or obj["id"]
+                self.payloads[obj["id"]] = {"properties": properties, "vector": obj.get("vector")}
+        return [{**obj, "result": {}} for obj in objects]
+
+    def delete(self, object_ids):
+        with self._lock:
+            for object_id in object_ids:
+                self.objects.pop(object_id, None)
+                self.payloads.pop(object_id, None)
+
+    def list_objects(self, limit: int, after: str = None, include_vector: bool = False) -> dict:
+        with self._lock:
+            object_ids = sorted(object_id for object_id in self.payloads if not after or object_id > after)
+            objects = []
+            for object_id in object_ids[:limit]:
+                payload = self.payloads[object_id]
+                obj = {"class": "JournalEntry", "id": object_id, "properties": payload["properties"]}
+                if include_vector and payload["vector"] is not None:
+                    obj["vector"] = payload["vector"]
+                objects.append(obj)
+        return {"objects": objects, "totalResults": len(objects)}
+
+    def graphql(self, query: str) -> dict:
+        limit = int(LIMIT_PATTERN.search(query).group(1)) if LIMIT_PATTERN.search(query) else 10
+        tags = {json.loads(tag) for tag in TAG_PATTERN.findall(query)}
+        with self._lock:
+            objects = sorted(
+                (object_id, entry_id) for object_id, entry_id in self.objects.items()
+                if tags <= set(self.payloads.get(object_id, {}).get("properties", {}).get("tags") or [])
+            )
+        if "nearObject" in query:
+            return self.near_objects(query, objects, limit)
+        if "nearText" in query or "nearVector" in query:
+            ranked = random.Random(zlib.crc32(query.encode("utf-8"))).sample(
+                objects, min(limit, len(objects))
+            )
+            hits = [
+                {"entry_id": entry_id,
+                 "_additional": {"id": object_id, "certainty": 0.99 - 0.01 * rank}}
+                for rank, (object_id, entry_id) in enumerate(ranked)
+            ]
+        else:
+            after = AFTER_PATTERN.search(query)
+            if after:
+                objects = [item for item in objects if item[0] > after.group(1)]
+            hits = [
+                {"entry_id": entry_id, "_additional": {"id": object_id}}
+                for object_id, entry_id in objects[:limit]
+            ]
+        return {"data": {"Get": {"JournalEntry": hits}}}
+
+
+    def near_objects(self, query: str, objects: list, limit: int) -> dict:
+        """Answer aliased nearObject queries; each object is its own best match."""
+        stored = dict(objects)
+        results, errors = {}, []
+        for alias, object_id in NEAR_OBJECT_PATTERN.findall(query):
+            if object_id not in stored:
+                results[alias] = None
+                errors.append({"message": f"could not find object {object_id}", "path": ["Get", alias]})
+                continue
+            others = [item for item in objects if item[0] != object_id]
+            ranked = [(object_id, stored[object_id])] + random.Random(zlib.crc32(object_id.encode("utf-8"))).sample(
+                others, min(limit - 1, len(others))
+            )
+            results[alias] = [
+                {"entry_id": entry_id,
+                 "_additional": {"id": hit_id, "certainty": 1.0 - 0.01 * rank}}
+                for rank, (hit_id, entry_id) in enumerate(ranked)
+            ]
+        response = {"data": {"Get": results}}
+        if errors:
+            response["errors"] = errors
+        return response
+
+
+def make_handler(state: FakeWeaviate):
+    """Build a request handler class bound to state."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _body(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            return json.loads(self.rfile.read(length)) if length else {}
+
+        def _reply(self, status: int, payload=None):
+            body = json.dumps(payload if payload is not None else {}).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            payload = self._body()
+            if state.delay_and_fail():
+                return self._reply(500, {"error": [{"message": "injected failure"}]})
+            if self.path == "/v1/batch/objects":
+                return self._reply(200, state.batch_import(payload.get("objects") or []))
+            if self.path == "/v1/graphql":
+                return self._reply(200, state.graphql(payload.get("query", "")))
+            return self._reply(404)
+
+        def do_GET(self):
+            if state.delay_and_fail():
+                return self._reply(500, {"error": [{"message": "injected failure"}]})
+            url = urlsplit(self.path)
+            if url.path == "/v1/.well-known/ready":
+                return self._reply(200)
+            if url.path == "/v1/objects":
+                params = {name: values[0] for name, values in parse_qs(url.query).items()}
+                return self._reply(200, state.list_objects(
+                    int(params.get("limit", 25)), params.get("after"), params.get("include") == "vector"
+                ))
+            return self._reply(404)
+
+        def do_DELETE(self):
+            self._body()
+            if state.delay_and_fail():
+                return self._reply(500, {"error": [{"message": "injected failure"}]})
+            if self.path.startswith("/v1/objects/"):
+                state.delete([self.path.rsplit("/", 1)[-1]])
+                return self._reply(204)
+            if self.path == "/v1/batch/objects":
+                # Filter matching is not modelled; stale passages are simply kept.
+                return self._reply(200, {"results": {"matches": 0, "successful": 0, "failed": 0}})
+            return self._reply(404)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def start_fake_weaviate(port: int = 0, **options):
+    """
+    Start a fake Weaviate server in a background thread.
+
+    Args:
+        port (int, optional): The TCP port; 0 picks a free one. Defaults to 0.
+        **options: Passed to FakeWeaviate (latency, jitter, failure_rate, seed).
+
+    Returns:
+        tuple: The running ThreadingHTTPServer and its FakeWeaviate state.
+    """
+    state = FakeWeaviate(**options)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-weaviate", daemon=True).start()
+    return server, state
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a fake Weaviate for offline benchmarks.")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every request.")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Maximum random extra delay.")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of requests that fail.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    server, _ = start_fake_weaviate(
+        args.port, latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+        failure_rate=args.failure_rate, seed=args.seed,
+    )
+    print(f"Fake Weaviate listening on http://127.0.0.1:{server.server_port}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,420 @@
+"""
+Benchmark harness for the Second Brain API.
+
+This module starts the FastAPI app under uvicorn in a subprocess, against a
+scratch database (a temporary SQLite file by default, or any DATABASE_URL)
+and the fake Weaviate server from benchmarks.fake_weaviate. It seeds N
+entries through the bulk endpoint and then runs concurrent load against the
+ingest, list, single-entry and search paths, one scenario at a time.
+
+For every scenario it reports throughput and p50/p95/p99 latency, writes the
+results with the run's settings to a JSON file, and can compare them with a
+previous result file, flagging regressions beyond a threshold. Everything
+runs locally, with no network access.
+
+Run it with:
+
+    python -m benchmarks.run --entries 2000 --requests 1000 --concurrency 16
+    python -m benchmarks.run --compare benchmarks/results/<previous>.json
+
+Point ``--database-url`` at a scratch Postgres database only: the harness
+writes to it.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import requests
+
+from benchmarks.fake_weaviate import start_fake_weaviate
+
+SCENARIOS = ("ingest", "list", "get", "search")
+
+# Run settings that make two result files incomparable when they differ.
+COMPARED_SETTINGS = (
+    "database", "entries", "requests", "concurrency", "workers", "async_db", "cache",
+    "weaviate_latency_ms", "weaviate_jitter_ms", "weaviate_failure_rate", "seed",
+)
+
+WORDS = (
+    "garden morning coffee travel paris train book idea project meeting walk river "
+    "rain friend dinner recipe music guitar code python database lecture notes sleep "
+    "running mountain family weekend letter market bread cooking plan budget health"
+).split()
+
+
+def make_text(rng: random.Random, words: int) -> str:
+    """Return a random sentence of the given number of vocabulary words."""
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    """
+    Return the nearest-rank percentile of already sorted values.
+
+    Args:
+        sorted_values (list): The values, in ascending order.
+        q (float): The percentile, in [0, 100].
+
+    Returns:
+        float: The percentile, or 0.0 for no values.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(latencies: list, errors: int, elapsed: float) -> dict:
+    """
+    Summarise one scenario.
+
+    Args:
+        latencies (list): Latency of every successful request, in seconds.
+        errors (int): Number of failed requests.
+        elapsed (float): Wall time of the scenario, in seconds.
+
+    Returns:
+        dict: Request and error counts, throughput and latency statistics in milliseconds.
+    """
+    values = sorted(latency * 1000 for latency in latencies)
+    return {
+        "requests": len(values) + errors,
+        "errors": errors,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(len(values) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(values) / len(values), 3) if values else 0.0,
+            "p50": round(percentile(values, 50), 3),
+            "p95": round(percentile(values, 95), 3),
+            "p99": round(percentile(values, 99), 3),
+            "max": round(values[-1], 3) if values else 0.0,
+        },
+    }
+
+
+def run_scenario(request_fn, total: int, concurrency: int) -> dict:
+    """
+    Run request_fn total times from concurrency threads and summarise the latencies.
+
+    Args:
+        request_fn (callable): Takes a requests.Session and the request number,
+            and returns the HTTP response.
+        total (int): Number of requests.
+        concurrency (int): Number of client threads.
+
+    Returns:
+        dict: The scenario summary from summarize.
+    """
+    local = threading.local()
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def one(number: int):
+        nonlocal errors
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        start = time.perf_counter()
+        try:
+            response = request_fn(session, number)
+            ok = response.ok
+        except requests.RequestException:
+            ok = False
+        latency = time.perf_counter() - start
+        with lock:
+            if ok:
+                latencies.append(latency)
+            else:
+                errors += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, range(total)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+def free_port() -> int:
+    """Return a TCP port that is currently free on localhost."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(base_url: str, process: subprocess.Popen, timeout: float = 60.0):
+    """
+    Wait until the app answers HTTP requests.
+
+    Raises:
+        RuntimeError: If the app exits or does not answer within timeout seconds.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"The app exited with code {process.returncode}")
+        try:
+            requests.get(f"{base_url}/cache/stats", timeout=1)
+            return
+        except requests.RequestException:
+            time.sleep(0.2)
+    raise RuntimeError("The app did not start in time")
+
+
+def start_app(args, port: int, weaviate_url: str) -> subprocess.Popen:
+    """Start the API under uvicorn in a subprocess configured for the benchmark."""
+    env = {
+        **os.environ,
+        "DATABASE_URL": args.database_url,
+        "WEAVIATE_URL": weaviate_url,
+        "VECTOR_STORE": "weaviate",
+        "USE_ASYNC_DB": "true" if args.async_db else "false",
+        "CACHE_BACKEND": args.cache,
+    }
+    command = [sys.executable, "-m", "uvicorn", "backend.main:app",
+               "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+               "--workers", str(args.workers)]
+    return subprocess.Popen(command, env=env)
+
+
+def seed_entries(base_url: str, count: int, rng: random.Random, chunk_size: int = 1000) -> list:
+    """
+    Create count entries through the bulk endpoint.
+
+    Returns:
+        list: The ids of the created entries.
+
+    Raises:
+        RuntimeError: If the bulk endpoint rejects a request.
+    """
+    entry_ids = []
+    for start in range(0, count, chunk_size):
+        items = [
+            {"title": make_text(rng, 3), "content": make_text(rng, rng.randint(20, 200))}
+            for _ in range(min(chunk_size, count - start))
+        ]
+        response = requests.post(f"{base_url}/entries/bulk", json=items, timeout=300)
+        if not response.ok:
+            raise RuntimeError(f"Seeding failed: {response.status_code} {response.text[:200]}")
+        entry_ids.extend(result["id"] for result in response.json()["results"] if "id" in result)
+    return entry_ids
+
+
+def scenario_requests(name: str, base_url: str, entry_ids: list, seed: int):
+    """
+    Return the request function of a scenario.
+
+    Each request draws its data from a generator seeded with the run seed and
+    the request number, so runs with the same seed send the same requests.
+    """
+    def rng_for(number: int) -> random.Random:
+        return random.Random(f"{seed}:{name}:{number}")
+
+    if name == "ingest":
+        def request_fn(session, number):
+            rng = rng_for(number)
+            return session.post(f"{base_url}/add_entry/", timeout=60, json={
+                "title": make_text(rng, 3), "content": make_text(rng, rng.randint(20, 200)),
+            })
+    elif name == "list":
+        def request_fn(session, number):
+            return session.get(f"{base_url}/entries/", params={"limit": 100}, timeout=60)
+    elif name == "get":
+        def request_fn(session, number):
+            entry_id = rng_for(number).choice(entry_ids)
+            return session.get(f"{base_url}/entries/{entry_id}/", timeout=60)
+    elif name == "search":
+        def request_fn(session, number):
+            query = make_text(rng_for(number), 2)
+            return session.get(f"{base_url}/search", params={"q": query, "k": 10}, timeout=60)
+    else:
+        raise ValueError(f"Unknown scenario: {name}")
+    return request_fn
+
+
+def git_revision() -> str:
+    """Return the current git commit, or None outside a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(current: dict, previous: dict, threshold: float) -> list:
+    """
+    Print the change of every scenario against a previous run.
+
+    A scenario regresses when its p50, p95 or p99 latency grows, or its
+    throughput drops, by more than threshold.
+
+    Args:
+        current (dict): This run's results.
+        previous (dict): The previous run's results.
+        threshold (float): Allowed relative change, e.g. 0.1 for 10%.
+
+    Returns:
+        list: Descriptions of the regressions found.
+    """
+    regressions = []
+    print(f"\nComparison with {previous['meta'].get('started_at')} ({previous['meta'].get('git_revision')}):")
+    for key in COMPARED_SETTINGS:
+        if current["meta"].get(key) != previous["meta"].get(key):
+            print(f"  warning: {key} differs ({previous['meta'].get(key)} -> {current['meta'].get(key)})")
+    for name, stats in current["scenarios"].items():
+        before = previous["scenarios"].get(name)
+        if before is None:
+            print(f"  {name:<8} no previous result")
+            continue
+        changes = {
+            key: (stats["latency_ms"][key], before["latency_ms"][key]) for key in ("p50", "p95", "p99")
+        }
+        changes["rps"] = (stats["throughput_rps"], before["throughput_rps"])
+        parts = []
+        for key, (now, then) in changes.items():
+            delta = (now - then) / then if then else 0.0
+            worse = delta < -threshold if key == "rps" else delta > threshold
+            parts.append(f"{key} {then:.1f}->{now:.1f} ({delta:+.0%}){' !' if worse else ''}")
+            if worse:
+                regressions.append(f"{name} {key}: {then:.1f} -> {now:.1f} ({delta:+.0%})")
+        print(f"  {name:<8} " + "  ".join(parts))
+    return regressions
+
+
+def print_results(results: dict):
+    """Print a table of the scenario summaries."""
+    print(f"\n{'scenario':<8} {'reqs':>6} {'errors':>6} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, stats in results["scenarios"].items():
+        latency = stats["latency_ms"]
+        print(f"{name:<8} {stats['requests']:>6} {stats['errors']:>6} {stats['throughput_rps']:>9.1f} "
+              f"{latency['p50']:>9.2f} {latency['p95']:>9.2f} {latency['p99']:>9.2f}")
+
+
+def run_benchmark(args) -> dict:
+    """
+    Start the fake Weaviate and the app, seed entries and run the scenarios.
+
+    Args:
+        args (argparse.Namespace): The parsed command line.
+
+    Returns:
+        dict: The results, with ``meta`` (settings of the run) and ``scenarios``.
+    """
+    rng = random.Random(args.seed)
+    weaviate, fake = start_fake_weaviate(
+        latency=args.weaviate_latency_ms / 1000, jitter=args.weaviate_jitter_ms / 1000,
+        failure_rate=args.weaviate_failure_rate, seed=args.seed,
+    )
+    weaviate_url = f"http://127.0.0.1:{weaviate.server_port}"
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    process = start_app(args, port, weaviate_url)
+    started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    try:
+        wait_until_ready(base_url, process)
+        print(f"Seeding {args.entries} entries...")
+        entry_ids = seed_entries(base_url, args.entries, rng)
+        fake.add_entries(entry_ids)
+
+        scenarios = {}
+        for name in args.scenarios:
+            request_fn = scenario_requests(name, base_url, entry_ids, args.seed)
+            if args.warmup:
+                run_scenario(request_fn, args.warmup, args.concurrency)
+            print(f"Running {name} ({args.requests} requests, concurrency {args.concurrency})...")
+            scenarios[name] = run_scenario(request_fn, args.requests, args.concurrency)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+        weaviate.shutdown()
+
+    return {
+        "meta": {
+            "started_at": started_at,
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": args.database_url.split(":", 1)[0],
+            "entries": args.entries,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+            "async_db": args.async_db,
+            "cache": args.cache,
+            "weaviate_latency_ms": args.weaviate_latency_ms,
+            "weaviate_jitter_ms": args.weaviate_jitter_ms,
+            "weaviate_failure_rate": args.weaviate_failure_rate,
+            "weaviate_requests": fake.requests,
+            "weaviate_failures": fake.failures,
+            "seed": args.seed,
+        },
+        "scenarios": scenarios,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Second Brain API offline.")
+    parser.add_argument("--database-url",
+                        help="Scratch database to benchmark against. Defaults to a temporary SQLite file.")
+    parser.add_argument("--entries", type=int, default=1000, help="Entries seeded before the scenarios.")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent client threads.")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests before each scenario.")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes.")
+    parser.add_argument("--sync-db", dest="async_db", action="store_false",
+                        help="Serve the sync endpoints (USE_ASYNC_DB=false).")
+    parser.add_argument("--cache", default="memory", choices=("memory", "none"),
+                        help="CACHE_BACKEND of the app.")
+    parser.add_argument("--weaviate-latency-ms", type=float, default=5.0)
+    parser.add_argument("--weaviate-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--weaviate-failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Result file. Defaults to benchmarks/results/<timestamp>.json.")
+    parser.add_argument("--compare", help="Previous result file to compare with.")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Relative change counted as a regression. Defaults to 0.1 (10%%).")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="Exit with status 1 when a regression is found.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory(prefix="secondbrain-bench-") as tmpdir:
+        if not args.database_url:
+            args.database_url = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+        results = run_benchmark(args)
+
+    print_results(results)
+    output = args.output or os.path.join(
+        "benchmarks", "results", datetime.now().strftime("%Y%m%d-%H%M%S") + ".json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as output_file:
+        json.dump(results, output_file, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as previous_file:
+            regressions = compare_results(results, json.load(previous_file), args.threshold)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            if args.fail_on_regression:
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
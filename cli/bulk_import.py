@@ -0,0 +1,286 @@
+"""
+Bulk import helpers for the CLI ``import`` command.
+
+Entries are read lazily from a directory of Markdown or text files, or from
+an NDJSON stream of ``{"title", "content"}`` objects, and uploaded in batches
+through a pooled HTTP session by several worker threads. Batches go to the
+server's ``/entries/bulk`` endpoint; servers without it get one
+``/add_entry/`` request per entry instead.
+
+Every imported item is appended to a resume file as soon as its batch is
+acknowledged, so a rerun after an interruption skips what is already on the
+server. Resume keys include the absolute path of their source (notes are keyed
+by file path, NDJSON lines by file path and line number, and stdin lines by a
+hash of their title and content), so one resume file serves several sources.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+TEXT_SUFFIXES = (".md", ".markdown", ".txt")
+
+
+def split_front_matter(text: str):
+    """
+    Separate a leading ``---`` front-matter block from a note.
+
+    Only simple ``key: value`` lines are read, which is all the title lookup
+    needs, so no YAML parser is required.
+
+    Args:
+        text (str): The file content.
+
+    Returns:
+        tuple: The front-matter fields and the remaining body.
+    """
+    if not text.startswith("---"):
+        return {}, text
+    lines = text.splitlines(keepends=True)
+    for end in range(1, len(lines)):
+        if lines[end].strip() in ("---", "..."):
+            fields = {}
+            for line in lines[1:end]:
+                key, sep, value = line.partition(":")
+                if sep:
+                    fields[key.strip().lower()] = value.strip().strip("'\"")
+            return fields, "".join(lines[end + 1:]).lstrip("\n")
+    return {}, text
+
+
+def iter_directory(root: str):
+    """
+    Yield the notes under a directory, in path order.
+
+    Args:
+        root (str): The directory to walk.
+
+    Yields:
+        tuple: (resume key, title, content), the key being the absolute path of the note.
+    """
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(name for name in dirnames if not name.startswith("."))
+        for filename in sorted(filenames):
+            if not filename.lower().endswith(TEXT_SUFFIXES):
+                continue
+            path = os.path.join(dirpath, filename)
+            with open(path, encoding="utf-8", errors="replace") as note:
+                fields, body = split_front_matter(note.read())
+            title = fields.get("title") or os.path.splitext(filename)[0]
+            yield os.path.abspath(path), title, body
+
+
+def content_key(title: str, content: str) -> str:
+    """Return the resume key of an entry without a stable location, from a hash of its text."""
+    digest = hashlib.sha256(f"{title}\0{content}".encode("utf-8")).hexdigest()
+    return f"sha256:{digest}"
+
+
+def iter_ndjson(stream, path: str = None):
+    """
+    Yield the entries of an NDJSON stream.
+
+    Args:
+        stream: A text stream with one ``{"title", "content"}`` object per line.
+        path (str, optional): The absolute path of the file being read; None for stdin.
+
+    Yields:
+        tuple: (resume key, title, content), the key being the path and line
+        number, or a hash of the title and content when there is no path.
+    """
+    for number, line in enumerate(stream, start=1):
+        if line.strip():
+            item = json.loads(line)
+            title, content = item.get("title", ""), item.get("content", "")
+            key = f"{path}:line:{number}" if path else content_key(title, content)
+            yield key, title, content
+
+
+def iter_source(source: str):
+    """Yield the entries of a directory, an NDJSON file, or stdin when source is ``-``."""
+    if source == "-":
+        yield from iter_ndjson(sys.stdin)
+    elif os.path.isdir(source):
+        yield from iter_directory(source)
+    else:
+        with open(source, encoding="utf-8") as stream:
+            yield from iter_ndjson(stream, os.path.abspath(source))
+
+
+def load_done(path: str) -> set:
+    """Return the resume keys recorded by earlier runs."""
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as done_file:
+        return {line.rstrip("\n") for line in done_file if line.strip()}
+
+
+def iter_batches(items, done: set, batch_size: int, totals: dict):
+    """Group the items not yet imported into lists of at most batch_size, counting skipped ones in totals."""
+    batch = []
+    for key, title, content in items:
+        if key in done:
+            totals["skipped"] += 1
+            continue
+        batch.append((key, title, content))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def make_session(workers: int) -> requests.Session:
+    """Build an HTTP session keeping one pooled connection per worker."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class Uploader:
+    """
+    Sends batches of entries to the API, through the bulk endpoint when the server has one.
+
+    Attributes:
+        base_url (str): The API base URL.
+        session (requests.Session): The pooled session shared by the workers.
+        use_bulk (bool): Whether ``/entries/bulk`` is used; it is turned off
+            the first time the server answers 404 or 405.
+    """
+
+    def __init__(self, base_url: str, session: requests.Session, timeout: float = 60.0):
+        self.base_url = base_url.rstrip("/")
+        self.session = session
+        self.timeout = timeout
+        self.use_bulk = True
+
+    def upload(self, batch: list) -> tuple:
+        """
+        Upload one batch.
+
+        Args:
+            batch (list): (resume key, title, content) items.
+
+        Returns:
+            tuple: The keys that were imported, and the error messages of the
+            others; failed entries are not recorded, so a rerun retries them.
+        """
+        if self.use_bulk:
+            payload = [{"title": title, "content": content} for _, title, content in batch]
+            try:
+                response = self.session.post(
+                    f"{self.base_url}/entries/bulk", json=payload, timeout=self.timeout
+                )
+                if response.status_code not in (404, 405):
+                    response.raise_for_status()
+            except requests.RequestException as excep:
+                return [], [f"{key}: {excep}" for key, _, _ in batch]
+            if response.status_code in (404, 405):
+                self.use_bulk = False
+            else:
+                imported, errors = [], []
+                for result in response.json()["results"]:
+                    key = batch[result["index"]][0]
+                    if "error" in result:
+                        errors.append(f"{key}: {result['error']}")
+                    else:
+                        imported.append(key)
+                return imported, errors
+        return self._upload_each(batch)
+
+    def _upload_each(self, batch: list) -> tuple:
+        imported, errors = [], []
+        for key, title, content in batch:
+            try:
+                response = self.session.post(
+                    f"{self.base_url}/add_entry/", json={"title": title, "content": content},
+                    timeout=self.timeout,
+                )
+                response.raise_for_status()
+                imported.append(key)
+            except requests.RequestException as excep:
+                errors.append(f"{key}: {excep}")
+        return imported, errors
+
+
+def run_import(base_url: str, source: str, workers: int = 4, batch_size: int = 200,
+               resume_file: str = None, report=None) -> dict:
+    """
+    Import every entry of a source that is not in the resume file yet.
+
+    Up to ``workers`` batches are uploaded at once; reading the source stops
+    while they are all in flight, so memory use stays bounded.
+
+    Args:
+        base_url (str): The API base URL.
+        source (str): A directory of notes, an NDJSON file, or ``-`` for stdin.
+        workers (int, optional): Concurrent upload workers. Defaults to 4.
+        batch_size (int, optional): Entries per request. Defaults to 200.
+        resume_file (str, optional): File recording imported keys; None disables resuming.
+        report (callable, optional): Called with the running totals after each batch.
+
+    Returns:
+        dict: Counts of ``imported``, ``skipped`` and ``failed`` entries, the
+        ``errors``, and the ``seconds`` taken.
+
+    Raises:
+        ValueError: If the source holds a malformed NDJSON line; the batches
+            already uploaded are recorded in the resume file first.
+    """
+    done = load_done(resume_file)
+    totals = {"imported": 0, "skipped": 0, "failed": 0, "errors": [], "seconds": 0.0}
+    start = time.perf_counter()
+    session = make_session(workers)
+    uploader = Uploader(base_url, session)
+    done_file = open(resume_file, "a", encoding="utf-8") if resume_file else None
+
+    def collect(batch, future):
+        try:
+            imported, errors = future.result()
+        except Exception as excep:  # Count the batch as failed; a rerun retries it
+            imported, errors = [], [f"{key}: {excep}" for key, _, _ in batch]
+        if done_file:
+            done_file.writelines(f"{key}\n" for key in imported)
+            done_file.flush()
+        totals["imported"] += len(imported)
+        totals["failed"] += len(errors)
+        totals["errors"].extend(errors)
+        totals["seconds"] = time.perf_counter() - start
+        if report:
+            report(totals)
+
+    try:
+        batches = iter_batches(iter_source(source), done, batch_size, totals)
+        # Probe with one batch first, so a server without the bulk endpoint is
+        # detected before several workers try it at once.
+        first = next(batches, None)
+        in_flight = deque()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            if first is not None:
+                collect(first, executor.submit(uploader.upload, first))
+            try:
+                for batch in batches:
+                    if len(in_flight) >= workers:
+                        collect(*in_flight.popleft())
+                    in_flight.append((batch, executor.submit(uploader.upload, batch)))
+            finally:
+                # Record the uploads still in flight even when reading the
+                # source failed, so a rerun does not import them again.
+                while in_flight:
+                    collect(*in_flight.popleft())
+    finally:
+        if done_file:
+            done_file.close()
+        session.close()
+    totals["seconds"] = time.perf_counter() - start
+    return totals
+
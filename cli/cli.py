@@ -1,20 +1,14 @@
 import os
+import json
 import typer
-import requests
+
+# requests is imported by the commands that use the network, so offline
+# commands and --help do not pay for it at startup.
 
 app = typer.Typer()
 
 # Load API URLs from environment variables
 SECOND_BRAIN_API = "http://second-brain:8000"
-WEAVIATE_URL = "http://weaviate:8080"
-
-def print_response(response: requests.Response) -> None:
-    """Helper function to print HTTP response details."""
-    try:
-        typer.secho(f"Response Status Code: {response.status_code}", fg="cyan")
-        typer.echo(response.json())
-    except Exception:
-        typer.secho("Failed to decode JSON response.", fg="red")
 
 @app.command("add-entry")
 def add_entry(
@@ -22,6 +16,8 @@ def add_entry(
     content: str = typer.Argument(..., help="Content for the journal entry")
 ) -> None:
     """Add a new journal entry."""
+    import requests
+
     url = f"{SECOND_BRAIN_API}/add_entry/"
     payload = {"title": title, "content": content}
     typer.secho(f"📡 Sending entry to {url}", fg="green")
@@ -34,79 +30,205 @@ def add_entry(
     except Exception as e:
         typer.secho(f"❌ Request failed: {e}", fg="red", bold=True)
 
+def print_entry(entry: dict, content: str) -> None:
+    """Print one line of the entry listing."""
+    typer.echo(
+        f"📝 ID: {entry.get('id', 'N/A')} | Title: {entry.get('title', 'N/A')} | "
+        f"Content: {content} | Created At: {entry.get('created_at', 'N/A')}"
+    )
+
+def print_search_results(results: list) -> None:
+    """Print ranked search results."""
+    typer.secho("📖 Matching Journal Entries:", fg="blue", bold=True)
+    for result in results:
+        entry_data = result.get("entry", {})
+        typer.secho(f"#{result.get('rank')} (score: {result.get('score')})", fg="blue")
+        typer.echo(f"📝 ID: {entry_data.get('id', 'N/A')}")
+        typer.echo(f"📝 Title: {entry_data.get('title', 'N/A')}")
+        typer.echo(f"📝 Content: {entry_data.get('content', 'N/A')}")
+        typer.echo(f"📝 Created At: {entry_data.get('created_at', 'N/A')}")
+
+@app.command("sync")
+def sync_mirror(
+    full: bool = typer.Option(False, "--full", help="Rebuild the mirror from scratch"),
+) -> None:
+    """
+    Update the local mirror used by --offline.
+
+    Only entries created since the newest mirrored one are fetched, one
+    keyset page at a time, and indexed for offline keyword search.
+    """
+    import requests
+    import mirror
+
+    connection = mirror.connect()
+    typer.secho(f"📡 Syncing {mirror.mirror_path()} from {SECOND_BRAIN_API}", fg="green")
+    try:
+        stored = mirror.sync(
+            SECOND_BRAIN_API, connection, full=full,
+            report=lambda stored: typer.echo(f"\r📦 {stored} entries stored", nl=False),
+        )
+    except requests.RequestException as e:
+        typer.secho(f"\n❌ Sync failed: {e}", fg="red", bold=True)
+        raise typer.Exit(1)
+    finally:
+        connection.close()
+    typer.echo()
+    typer.secho(f"✅ Mirror up to date ({stored} entries added or changed)", fg="green", bold=True)
+
 @app.command("get-entries")
-def get_entries() -> None:
-    """Retrieve all journal entries."""
+def get_entries(
+    full: bool = typer.Option(False, "--full", help="Print the full content of every entry"),
+    excerpt_len: int = typer.Option(80, help="Characters of content previewed per entry"),
+    offline: bool = typer.Option(False, "--offline", help="Read from the local mirror instead of the server"),
+    tag: list[str] = typer.Option(None, "--tag", help="Only entries with this tag; repeat to require several"),
+) -> None:
+    """Retrieve all journal entries, streamed as NDJSON from the server."""
+    if offline and tag:
+        typer.secho("❌ --tag is not supported with --offline.", fg="red", bold=True)
+        raise typer.Exit()
+    if offline:
+        import mirror
+
+        connection = mirror.connect()
+        try:
+            found = False
+            for row in mirror.list_entries(connection, None if full else excerpt_len):
+                if not found:
+                    typer.secho("📖 Journal Entries:", fg="blue", bold=True)
+                    found = True
+                print_entry(dict(row), row["content"])
+            if not found:
+                typer.secho("No journal entries found; run sync first.", fg="yellow")
+        finally:
+            connection.close()
+        return
+
+    import requests
+
     url = f"{SECOND_BRAIN_API}/entries/"
+    params = {"format": "ndjson", "tag": tag or []}
+    if not full:
+        params.update(fields="id,title,created_at", excerpt_len=excerpt_len)
     typer.secho(f"📡 Fetching entries from {url}", fg="green")
     try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            entries = response.json()
-            if not entries:
-                typer.secho("No journal entries found.", fg="yellow")
+        with requests.get(url, params=params, stream=True) as response:
+            if response.status_code != 200:
+                typer.secho("❌ Failed to retrieve entries.", fg="red", bold=True)
                 return
-            typer.secho("📖 Journal Entries:", fg="blue", bold=True)
-            for entry in entries:
-                typer.echo(
-                    f"📝 ID: {entry.get('id', 'N/A')} | Title: {entry.get('title', 'N/A')} | "
-                    f"Content: {entry.get('content', 'N/A')} | Created At: {entry.get('created_at', 'N/A')}"
-                )
-        else:
-            typer.secho("❌ Failed to retrieve entries.", fg="red", bold=True)
+            found = False
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                if not found:
+                    typer.secho("📖 Journal Entries:", fg="blue", bold=True)
+                    found = True
+                entry = json.loads(line)
+                print_entry(entry, entry["content"] if full else entry.get("excerpt", ""))
+            if not found:
+                typer.secho("No journal entries found.", fg="yellow")
     except Exception as e:
         typer.secho(f"❌ Request failed: {e}", fg="red", bold=True)
 
-@app.command("search")
-def search(query: str = typer.Argument(..., help="Search query string")) -> None:
+@app.command("import")
+def import_entries(
+    source: str = typer.Argument(..., help="Directory of .md/.txt notes, an NDJSON file, or - for stdin"),
+    workers: int = typer.Option(4, help="Concurrent upload workers"),
+    batch_size: int = typer.Option(200, help="Entries sent per request"),
+    resume_file: str = typer.Option(".secondbrain_import", help="File recording imported items"),
+    no_resume: bool = typer.Option(False, "--no-resume", help="Import everything and record nothing"),
+) -> None:
     """
-    Perform a semantic search using Weaviate and then fetch the full entry from Second Brain.
-    
-    This command sends a GraphQL query to Weaviate to find a JournalEntry based on the query,
-    retrieves the object's _additional.id, and then calls the new endpoint `/entries/{entry_id}/`
-    to fetch the detailed journal entry from Second Brain.
+    Import many journal entries at once.
+
+    Notes take their title from a ``title:`` front-matter field, or else
+    from the filename. Entries are uploaded in batches through the bulk
+    endpoint, by several workers sharing a pooled session. Imported items
+    are recorded in the resume file, so a rerun skips them.
     """
-    # Build GraphQL query without newlines
-    graphql_query = (
-        "{ Get { JournalEntry(nearText: { concepts: [\"" + query + "\"] }, limit: 1) { "
-        "_additional { id certainty } } } }"
-    )
-    payload = {"query": graphql_query}
-    graphql_url = f"{WEAVIATE_URL}/v1/graphql"
-    typer.secho(f"🔍 Searching for '{query}' using Weaviate at {graphql_url}", fg="green")
+    from bulk_import import run_import
+
+    def report(totals):
+        rate = totals["imported"] / totals["seconds"] if totals["seconds"] else 0.0
+        typer.echo(
+            f"\r📦 {totals['imported']} imported, {totals['failed']} failed, "
+            f"{totals['skipped']} skipped | {rate:.0f} entries/s",
+            nl=False,
+        )
+
+    typer.secho(f"📡 Importing {source} into {SECOND_BRAIN_API}", fg="green")
     try:
-        response = requests.post(
-            graphql_url,
-            json=payload,
-            headers={"Content-Type": "application/json"}
+        totals = run_import(
+            SECOND_BRAIN_API, source, workers=workers, batch_size=batch_size,
+            resume_file=None if no_resume else resume_file, report=report,
         )
+    except (OSError, ValueError) as e:
+        typer.secho(f"\n❌ Import failed: {e}", fg="red", bold=True)
+        raise typer.Exit(1)
+    typer.echo()
+    for error in totals["errors"][:20]:
+        typer.secho(f"⚠️ {error}", fg="yellow")
+    color = "green" if not totals["failed"] else "yellow"
+    typer.secho(
+        f"✅ Imported {totals['imported']} entries in {totals['seconds']:.1f}s "
+        f"({totals['failed']} failed, {totals['skipped']} skipped)", fg=color, bold=True,
+    )
+
+@app.command("search")
+def search(
+    query: str = typer.Argument(..., help="Search query string"),
+    k: int = typer.Option(5, "--k", "-k", help="Number of results to return"),
+    certainty: float = typer.Option(None, help="Minimum certainty of returned results"),
+    mode: str = typer.Option("semantic", help="Search mode: semantic, keyword or hybrid"),
+    offline: bool = typer.Option(False, "--offline", help="Keyword search over the local mirror"),
+    tag: list[str] = typer.Option(None, "--tag", help="Only entries with this tag; repeat to require several"),
+) -> None:
+    """
+    Search journal entries through the Second Brain search endpoint.
+
+    In semantic mode the server runs one nearText query against Weaviate, in
+    keyword mode a full-text query in Postgres, and in hybrid mode both, fused
+    by rank. The top k journal entries come back hydrated and ranked in a single response.
+    With --offline, a keyword search runs over the local mirror instead.
+    Each --tag restricts the results to entries carrying that tag.
+    """
+    if offline and tag:
+        typer.secho("❌ --tag is not supported with --offline.", fg="red", bold=True)
+        raise typer.Exit()
+    if offline:
+        import mirror
+
+        connection = mirror.connect()
+        try:
+            results = mirror.search(connection, query, k=k)
+        finally:
+            connection.close()
+        if not results:
+            typer.secho("⚠️ No matching entries found.", fg="yellow")
+            raise typer.Exit()
+        print_search_results(results)
+        return
+
+    import requests
+
+    url = f"{SECOND_BRAIN_API}/search"
+    params = {"q": query, "k": k, "mode": mode, "tag": tag or []}
+    if certainty is not None:
+        params["certainty"] = certainty
+    typer.secho(f"🔍 Searching for '{query}' using {url}", fg="green")
+    try:
+        response = requests.get(url, params=params)
         if response.status_code != 200:
-            typer.secho(f"❌ Weaviate search failed: {response.status_code}", fg="red", bold=True)
+            typer.secho(f"❌ Search failed: {response.status_code}", fg="red", bold=True)
             typer.echo(response.text)
             raise typer.Exit()
-        data = response.json()
-        results = data.get("data", {}).get("Get", {}).get("JournalEntry", [])
+        results = response.json()
         if not results:
-            typer.secho("⚠️ No matching entries found in Weaviate.", fg="yellow")
+            typer.secho("⚠️ No matching entries found.", fg="yellow")
             raise typer.Exit()
-        # Use the first result from the search
-        entry_id = results[0].get("_additional", {}).get("id")
-        certainty = results[0].get("_additional", {}).get("certainty")
-        typer.secho(f"✅ Found entry with ID: {entry_id} (certainty: {certainty})", fg="blue")
-        # Fetch full entry details from Second Brain using the new endpoint
-        second_brain_url = f"{SECOND_BRAIN_API}/entries/{entry_id}/"
-        typer.secho(f"📡 Fetching entry details from Second Brain at {second_brain_url}", fg="green")
-        entry_response = requests.get(second_brain_url)
-        if entry_response.status_code == 200:
-            entry_data = entry_response.json()
-            typer.secho("📖 Journal Entry Details:", fg="blue", bold=True)
-            typer.echo(f"📝 ID: {entry_data.get('id', 'N/A')}")
-            typer.echo(f"📝 Title: {entry_data.get('title', 'N/A')}")
-            typer.echo(f"📝 Content: {entry_data.get('content', 'N/A')}")
-            typer.echo(f"📝 Created At: {entry_data.get('created_at', 'N/A')}")
-        else:
-            typer.secho("❌ Failed to fetch entry details from Second Brain.", fg="red", bold=True)
-            typer.echo(entry_response.text)
+        print_search_results(results)
+    except typer.Exit:
+        raise
     except Exception as e:
         typer.secho(f"❌ Request failed: {e}", fg="red", bold=True)
 
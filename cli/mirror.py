@@ -0,0 +1,227 @@
+"""
+Local SQLite mirror of the journal for the CLI.
+
+The mirror lets ``get-entries`` and keyword ``search`` run offline, without a
+network round trip. It is brought up to date by ``sync``, which only asks the
+server for entries created since the newest mirrored one, and keyword search
+runs against an FTS5 index of titles and content.
+
+The mirror lives in ``~/.secondbrain/mirror.db`` unless SECOND_BRAIN_MIRROR
+names another file. Only the standard library is imported here, so offline
+commands start quickly; ``requests`` is imported by sync alone.
+"""
+
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".secondbrain", "mirror.db")
+
+# Entries are stamped when their transaction starts, so one committed just
+# after a sync can carry an older created_at. Each sync re-reads this window
+# below the watermark; re-read entries are deduplicated by id.
+SYNC_OVERLAP = timedelta(minutes=5)
+
+PAGE_SIZE = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_entries_created_at_id ON entries (created_at, id);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    title, content, content='entries', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+    INSERT INTO entries_fts (rowid, title, content) VALUES (new.rowid, new.title, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+    INSERT INTO entries_fts (entries_fts, rowid, title, content)
+    VALUES ('delete', old.rowid, old.title, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_au AFTER UPDATE ON entries BEGIN
+    INSERT INTO entries_fts (entries_fts, rowid, title, content)
+    VALUES ('delete', old.rowid, old.title, old.content);
+    INSERT INTO entries_fts (rowid, title, content) VALUES (new.rowid, new.title, new.content);
+END;
+"""
+
+
+def mirror_path() -> str:
+    """Return the path of the mirror database."""
+    return os.environ.get("SECOND_BRAIN_MIRROR", DEFAULT_PATH)
+
+
+def connect(path: str = None) -> sqlite3.Connection:
+    """
+    Open the mirror, creating its tables on first use.
+
+    The FTS5 index is skipped if this SQLite build lacks FTS5; search then
+    falls back to substring matching.
+
+    Args:
+        path (str, optional): The database file. Defaults to mirror_path().
+
+    Returns:
+        sqlite3.Connection: The open connection, returning rows as sqlite3.Row.
+    """
+    path = path or mirror_path()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    connection = sqlite3.connect(path)
+    connection.row_factory = sqlite3.Row
+    connection.executescript(SCHEMA)
+    try:
+        connection.executescript(FTS_SCHEMA)
+    except sqlite3.OperationalError:
+        pass
+    return connection
+
+
+def has_fts(connection: sqlite3.Connection) -> bool:
+    """Return whether the mirror has its FTS5 index."""
+    return connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'entries_fts'"
+    ).fetchone() is not None
+
+
+def watermark(connection: sqlite3.Connection):
+    """Return the (created_at, id) of the newest mirrored entry, or None when empty."""
+    row = connection.execute(
+        "SELECT created_at, id FROM entries ORDER BY created_at DESC, id DESC LIMIT 1"
+    ).fetchone()
+    return (row["created_at"], row["id"]) if row else None
+
+
+def sync_since(connection: sqlite3.Connection):
+    """Return the ``since`` timestamp of the next incremental sync, or None for a full one."""
+    mark = watermark(connection)
+    if mark is None or not mark[0]:
+        return None
+    return (datetime.fromisoformat(mark[0]) - SYNC_OVERLAP).isoformat()
+
+
+def store(connection: sqlite3.Connection, entries: list) -> int:
+    """Insert or update entries in the mirror and return how many were added or changed."""
+    cursor = connection.executemany(
+        "INSERT INTO entries (id, title, content, created_at) VALUES (:id, :title, :content, :created_at) "
+        "ON CONFLICT (id) DO UPDATE SET title = excluded.title, content = excluded.content, "
+        "created_at = excluded.created_at "
+        "WHERE entries.title IS NOT excluded.title OR entries.content IS NOT excluded.content",
+        entries,
+    )
+    return cursor.rowcount
+
+
+def sync(base_url: str, connection: sqlite3.Connection, full: bool = False, report=None) -> int:
+    """
+    Fetch the entries created since the mirror's watermark.
+
+    Pages are requested with the server's keyset cursor and written one
+    transaction per page, so an interrupted sync keeps what it fetched.
+
+    Args:
+        base_url (str): The API base URL.
+        connection (sqlite3.Connection): The open mirror.
+        full (bool, optional): Drop the mirror and fetch everything. Defaults to False.
+        report (callable, optional): Called with the number of entries stored so far.
+
+    Returns:
+        int: The number of entries added or changed.
+
+    Raises:
+        requests.RequestException: If the server cannot be reached or fails.
+    """
+    import requests
+
+    if full:
+        with connection:
+            connection.execute("DELETE FROM entries")
+    params = {"limit": PAGE_SIZE, "fields": "id,title,content,created_at"}
+    since = sync_since(connection)
+    if since:
+        params["since"] = since
+    stored = 0
+    with requests.Session() as session:
+        while True:
+            response = session.get(f"{base_url}/entries/", params=params, timeout=60)
+            response.raise_for_status()
+            with connection:
+                stored += store(connection, response.json())
+                connection.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('synced_at', ?)",
+                    (datetime.now().isoformat(timespec="seconds"),),
+                )
+            if report:
+                report(stored)
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                return stored
+            params["cursor"] = cursor
+
+
+def list_entries(connection: sqlite3.Connection, excerpt_len: int = None):
+    """
+    Yield the mirrored entries in (created_at, id) order.
+
+    Args:
+        connection (sqlite3.Connection): The open mirror.
+        excerpt_len (int, optional): Return only this many leading characters of
+            the content, cut by SQLite; the full content when None.
+
+    Yields:
+        sqlite3.Row: Rows with id, title, content and created_at.
+    """
+    content = "substr(content, 1, ?)" if excerpt_len else "content"
+    params = (excerpt_len,) if excerpt_len else ()
+    yield from connection.execute(
+        f"SELECT id, title, {content} AS content, created_at FROM entries ORDER BY created_at, id",
+        params,
+    )
+
+
+def fts_query(query: str) -> str:
+    """Quote every term of a free-text query, so FTS5 matches all of them literally."""
+    return " ".join('"{}"'.format(term.replace('"', '""')) for term in query.split())
+
+
+def search(connection: sqlite3.Connection, query: str, k: int = 5) -> list:
+    """
+    Run a keyword search over the mirror.
+
+    With FTS5 every term must match, ranked by bm25 with titles weighted
+    double; without it, entries containing the query are returned newest first.
+
+    Args:
+        connection (sqlite3.Connection): The open mirror.
+        query (str): The search text.
+        k (int, optional): Maximum number of results. Defaults to 5.
+
+    Returns:
+        list: Dicts with ``rank``, ``score`` and ``entry``, as the search endpoint returns them.
+    """
+    if has_fts(connection):
+        rows = connection.execute(
+            "SELECT e.id, e.title, e.content, e.created_at, -bm25(entries_fts, 2.0, 1.0) AS score "
+            "FROM entries_fts JOIN entries e ON e.rowid = entries_fts.rowid "
+            "WHERE entries_fts MATCH ? ORDER BY bm25(entries_fts, 2.0, 1.0) LIMIT ?",
+            (fts_query(query), k),
+        ).fetchall()
+    else:
+        pattern = f"%{query}%"
+        rows = connection.execute(
+            "SELECT id, title, content, created_at, 1.0 AS score FROM entries "
+            "WHERE title LIKE ? OR content LIKE ? ORDER BY created_at DESC LIMIT ?",
+            (pattern, pattern, k),
+        ).fetchall()
+    return [
+        {"rank": rank, "score": row["score"],
+         "entry": {key: row[key] for key in ("id", "title", "content", "created_at")}}
+        for rank, row in enumerate(rows, start=1)
+    ]
@@ -0,0 +1,63 @@
+"""
+Shared fixtures for the test suite.
+
+The tests run against a throwaway SQLite database, through both the sync and
+the async engines, with the local vector store, so neither PostgreSQL nor
+Weaviate is needed. The settings are set through the environment before any
+backend module is imported, since the engines are created at import time.
+"""
+
+import os
+import shutil
+import tempfile
+
+_TMP_DIR = tempfile.mkdtemp(prefix="secondbrain-tests-")
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{os.path.join(_TMP_DIR, 'journal.db')}",
+    USE_ASYNC_DB="true",
+    VECTOR_STORE="local",
+    LOCAL_VECTOR_STORE_PATH=os.path.join(_TMP_DIR, "vector_store"),
+    EMBEDDING_DIM="64",
+    EMBEDDING_WORKERS="1",
+    TAGGING_WORKERS="1",
+    CACHE_BACKEND="memory",
+    COMPRESSION_MINIMUM_SIZE="0",
+)
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api import async_endpoints, endpoints
+from backend.database import SessionLocal, engine
+from backend.models import Base
+from backend.services import cache, vector_store
+
+
+@pytest.fixture(autouse=True)
+def database():
+    """Recreate every table, and start from an empty cache and vector store, for each test."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    shutil.rmtree(os.environ["LOCAL_VECTOR_STORE_PATH"], ignore_errors=True)
+    cache._cache = None
+    vector_store._vector_store = None
+    yield
+    cache._cache = None
+    vector_store._vector_store = None
+
+
+@pytest.fixture
+def db_session():
+    """A sync session on the test database."""
+    with SessionLocal() as db_session:
+        yield db_session
+
+
+@pytest.fixture(params=["sync", "async"])
+def client(request):
+    """A test client for the sync or the async router."""
+    app = FastAPI()
+    app.include_router(endpoints.router if request.param == "sync" else async_endpoints.router)
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,52 @@
+"""Tests for the activity counts of /stats/activity and their daily rollup."""
+
+from datetime import datetime
+
+from sqlalchemy import update
+
+from backend.models import JournalEntry
+from backend.services.activity import activity_counts, refresh_activity_rollup
+from backend.services.journal_service import bulk_create_journal_entries
+
+DAYS = [datetime(2026, 3, 2, 9), datetime(2026, 3, 2, 18), datetime(2026, 3, 4, 12),
+        datetime(2026, 3, 10, 8)]
+
+
+def create_entries(db_session):
+    entry_ids = bulk_create_journal_entries(db_session, [(f"Entry {i}", "content") for i in range(len(DAYS))])
+    for entry_id, created_at in zip(entry_ids, DAYS):
+        db_session.execute(
+            update(JournalEntry).where(JournalEntry.id == entry_id).values(created_at=created_at)
+        )
+    db_session.commit()
+
+
+def test_counts_entries_per_bucket(db_session):
+    create_entries(db_session)
+
+    assert activity_counts(db_session, "day", use_rollup=False) == [
+        {"start": "2026-03-02", "count": 2},
+        {"start": "2026-03-04", "count": 1},
+        {"start": "2026-03-10", "count": 1},
+    ]
+    assert activity_counts(db_session, "week", use_rollup=False) == [
+        {"start": "2026-03-02", "count": 3},
+        {"start": "2026-03-09", "count": 1},
+    ]
+    assert activity_counts(db_session, "month", since=datetime(2026, 3, 3), use_rollup=False) == [
+        {"start": "2026-03-01", "count": 2},
+    ]
+
+
+def test_rollup_matches_the_live_counts(db_session):
+    create_entries(db_session)
+
+    assert refresh_activity_rollup(db_session, full=True) == 3
+    for bucket in ("day", "week", "month"):
+        assert (activity_counts(db_session, bucket, use_rollup=True)
+                == activity_counts(db_session, bucket, use_rollup=False))
+    assert activity_counts(db_session, "day", since=datetime(2026, 3, 2, 12), use_rollup=True) == [
+        {"start": "2026-03-02", "count": 1},
+        {"start": "2026-03-04", "count": 1},
+        {"start": "2026-03-10", "count": 1},
+    ]
@@ -0,0 +1,82 @@
+"""Tests for bulk ingestion, search and conditional GETs on both routers."""
+
+import json
+
+from backend.services.journal_service import bulk_create_journal_entries, create_journal_entry
+from backend.tasks.worker import process_outbox_batch
+
+
+def test_bulk_reports_invalid_items_without_failing_the_rest(client):
+    items = [{"title": "One", "content": "first"}, {"title": "Two"}, {"title": "Three", "content": "third"}]
+
+    response = client.post("/entries/bulk", json=items)
+
+    body = response.json()
+    assert response.status_code == 200
+    assert (body["inserted"], body["failed"]) == (2, 1)
+    assert [result["index"] for result in body["results"]] == [0, 1, 2]
+    assert "content" in body["results"][1]["error"]
+    listed = client.get("/entries/").json()
+    assert sorted(item["title"] for item in listed) == ["One", "Three"]
+
+
+def test_bulk_accepts_ndjson(client):
+    lines = [json.dumps({"title": "One", "content": "first"}), "{not json",
+             json.dumps({"title": "Two", "content": "second"})]
+
+    response = client.post("/entries/bulk", content="\n".join(lines),
+                           headers={"Content-Type": "application/x-ndjson"})
+
+    body = response.json()
+    assert (body["inserted"], body["failed"]) == (2, 1)
+    assert "error" in body["results"][1]
+
+
+def test_bulk_rejects_a_body_that_is_not_a_list(client):
+    assert client.post("/entries/bulk", json={"title": "One"}).status_code == 400
+
+
+def test_listing_answers_304_until_the_journal_changes(client):
+    client.post("/add_entry/", json={"title": "One", "content": "first"})
+    etag = client.get("/entries/").headers["ETag"]
+
+    assert client.get("/entries/", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/entries/", params={"limit": 5},
+                      headers={"If-None-Match": etag}).status_code == 200
+
+    client.post("/add_entry/", json={"title": "Two", "content": "second"})
+    response = client.get("/entries/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_entry_answers_304_while_unchanged(client, db_session):
+    entry = create_journal_entry(db_session, "One", "first")
+
+    response = client.get(f"/entries/{entry.id}/")
+    assert response.status_code == 200
+    assert response.json()["title"] == "One"
+
+    cached = client.get(f"/entries/{entry.id}/", headers={"If-None-Match": response.headers["ETag"]})
+    assert cached.status_code == 304 and cached.content == b""
+    assert client.get(f"/entries/{entry.id}/", headers={"If-None-Match": 'W/"other"'}).status_code == 200
+
+
+def test_unknown_entries_are_not_found(client):
+    assert client.get("/entries/not-a-uuid/").status_code == 404
+    assert client.get("/entries/00000000-0000-0000-0000-000000000000/").status_code == 404
+
+
+def test_search_modes_rank_the_matching_entry_first(client, db_session):
+    garden, _ = bulk_create_journal_entries(db_session, [
+        ("Garden", "planted tomatoes in the garden #outdoors"),
+        ("Bread", "baked sourdough bread"),
+    ])
+    process_outbox_batch(db_session)
+
+    for mode in ("semantic", "keyword", "hybrid"):
+        response = client.get("/search", params={"q": "tomatoes", "k": 1, "mode": mode})
+        assert response.status_code == 200
+        assert [result["entry"]["id"] for result in response.json()] == [str(garden)]
+    tagged = client.get("/search", params={"q": "bread", "tag": "outdoors"}).json()
+    assert [result["entry"]["id"] for result in tagged] == [str(garden)]
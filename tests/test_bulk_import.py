@@ -0,0 +1,75 @@
+"""Tests for the resumable CLI import in cli/bulk_import.py."""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "cli"))
+
+import bulk_import  # noqa: E402
+
+
+@pytest.fixture
+def uploads(monkeypatch):
+    """Record uploaded batches instead of sending them to a server."""
+    uploaded = []
+
+    def upload(self, batch):
+        uploaded.extend(key for key, _, _ in batch)
+        return [key for key, _, _ in batch], []
+
+    monkeypatch.setattr(bulk_import.Uploader, "upload", upload)
+    return uploaded
+
+
+def write_ndjson(path, lines):
+    path.write_text("".join(f"{line}\n" for line in lines), encoding="utf-8")
+
+
+def test_rerun_skips_imported_entries(tmp_path, uploads):
+    source, resume = tmp_path / "entries.ndjson", tmp_path / "resume"
+    write_ndjson(source, [json.dumps({"title": f"t{i}", "content": "c"}) for i in range(5)])
+
+    first = bulk_import.run_import("http://api", str(source), workers=2, batch_size=2,
+                                   resume_file=str(resume))
+    second = bulk_import.run_import("http://api", str(source), workers=2, batch_size=2,
+                                    resume_file=str(resume))
+
+    assert first["imported"] == 5
+    assert second["imported"] == 0 and second["skipped"] == 5
+    assert len(uploads) == 5
+
+
+def test_records_uploads_in_flight_when_the_source_is_malformed(tmp_path, uploads):
+    source, resume = tmp_path / "entries.ndjson", tmp_path / "resume"
+    good = [json.dumps({"title": f"t{i}", "content": "c"}) for i in range(6)]
+    write_ndjson(source, good + ["{not json"])
+
+    with pytest.raises(ValueError):
+        bulk_import.run_import("http://api", str(source), workers=4, batch_size=1,
+                               resume_file=str(resume))
+
+    assert sorted(bulk_import.load_done(str(resume))) == sorted(uploads)
+    assert len(uploads) == 6
+
+    write_ndjson(source, good)
+    rerun = bulk_import.run_import("http://api", str(source), workers=4, batch_size=1,
+                                   resume_file=str(resume))
+    assert rerun["imported"] == 0 and rerun["skipped"] == 6
+
+
+def test_counts_a_batch_whose_upload_raised_as_failed(tmp_path, monkeypatch):
+    def upload(self, batch):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(bulk_import.Uploader, "upload", upload)
+    source, resume = tmp_path / "entries.ndjson", tmp_path / "resume"
+    write_ndjson(source, [json.dumps({"title": f"t{i}", "content": "c"}) for i in range(3)])
+
+    totals = bulk_import.run_import("http://api", str(source), workers=2, batch_size=1,
+                                    resume_file=str(resume))
+
+    assert totals["imported"] == 0 and totals["failed"] == 3
+    assert bulk_import.load_done(str(resume)) == set()
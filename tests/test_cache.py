@@ -0,0 +1,50 @@
+"""Tests for the read-through cache of entry lookups and search results."""
+
+import asyncio
+import threading
+
+from backend.services import cache
+from backend.services.cache import LRUCache, get_cache
+from backend.services.journal_service import (
+    create_journal_entry, get_entry_plan, search_journal_entries,
+)
+from backend.services.plans import arun_plan
+
+
+def test_search_results_are_cached_in_memory(db_session):
+    create_journal_entry(db_session, "Apples", "Picked apples today")
+
+    first = search_journal_entries(db_session, "apples", mode="keyword")
+    second = search_journal_entries(db_session, "apples", mode="keyword")
+
+    assert second == first
+    assert get_cache().stats()["search"] == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+
+def test_creating_an_entry_invalidates_cached_searches(db_session):
+    create_journal_entry(db_session, "Apples", "Picked apples today")
+    assert len(search_journal_entries(db_session, "apples", mode="keyword")) == 1
+
+    create_journal_entry(db_session, "More apples", "Apple pie")
+
+    assert len(search_journal_entries(db_session, "apples", mode="keyword")) == 2
+
+
+def test_async_plans_call_a_shared_cache_off_the_event_loop():
+    class SharedCache(LRUCache):
+        shared = True
+
+        def _get(self, key):
+            threads.append(threading.get_ident())
+            return {"id": "cached"}
+
+    threads = []
+    cache._cache = SharedCache()
+
+    async def lookup():
+        return threading.get_ident(), await arun_plan(None, get_entry_plan("some-id"))
+
+    loop_thread, entry = asyncio.run(lookup())
+
+    assert entry == {"id": "cached"}
+    assert threads and loop_thread not in threads
@@ -0,0 +1,33 @@
+"""Tests for splitting entries into passages and collapsing passage hits."""
+
+import pytest
+
+from backend.services.chunker import collapse_hits, iter_passages
+
+
+def test_passages_overlap_and_cover_the_content():
+    content = " ".join(f"w{i}" for i in range(10))
+
+    assert list(iter_passages(content, size=4, overlap=1)) == [
+        "w0 w1 w2 w3", "w3 w4 w5 w6", "w6 w7 w8 w9",
+    ]
+    assert list(iter_passages("short text", size=4, overlap=1)) == ["short text"]
+    assert list(iter_passages("", size=4, overlap=1)) == [""]
+
+
+def test_rejects_an_overlap_as_large_as_the_passage():
+    with pytest.raises(ValueError):
+        list(iter_passages("text", size=4, overlap=4))
+
+
+def test_collapse_hits_keeps_the_best_passage_of_each_entry():
+    hits = [
+        {"id": "a", "certainty": 0.9},
+        {"id": "a", "certainty": 0.8},
+        {"id": "b", "certainty": 0.7},
+        {"id": "a", "certainty": 0.6},
+        {"id": "c", "certainty": 0.5},
+    ]
+
+    assert collapse_hits(hits, 10) == [hits[0], hits[2], hits[4]]
+    assert collapse_hits(hits, 2) == [hits[0], hits[2]]
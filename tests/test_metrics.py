@@ -0,0 +1,37 @@
+"""Tests for the database pool metrics."""
+
+import threading
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from backend.database import engine
+from backend.services.metrics import DB_POOL_CHECKOUT_WAIT, render, timed_pool_class
+
+
+def wait_sum(name):
+    return DB_POOL_CHECKOUT_WAIT._values.get((name,), {"sum": 0.0})["sum"]
+
+
+def test_checkout_wait_includes_time_spent_on_an_exhausted_pool(tmp_path):
+    test_engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", pool_size=1, max_overflow=0,
+                                poolclass=timed_pool_class(QueuePool, "test"))
+    held = test_engine.connect()
+    threading.Timer(0.2, held.close).start()
+
+    with test_engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+    assert DB_POOL_CHECKOUT_WAIT.count(engine="test") == 2
+    assert wait_sum("test") >= 0.2
+    test_engine.dispose()
+
+
+def test_app_engines_keep_timing_checkouts_after_dispose():
+    before = DB_POOL_CHECKOUT_WAIT.count(engine="sync")
+    engine.dispose()
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+    assert DB_POOL_CHECKOUT_WAIT.count(engine="sync") == before + 1
+    assert 'db_pool_checkout_wait_seconds_count{engine="sync"}' in render()
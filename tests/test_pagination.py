@@ -0,0 +1,48 @@
+"""Tests for keyset pagination and created_at ranges of GET /entries/."""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from backend.models import JournalEntry
+from backend.services.journal_service import bulk_create_journal_entries
+
+
+def test_pages_through_entries_created_in_the_same_second(client, db_session):
+    created = bulk_create_journal_entries(db_session, [(f"Entry {i}", "content") for i in range(5)])
+
+    seen, params = [], {"limit": 2}
+    while True:
+        response = client.get("/entries/", params=params)
+        assert response.status_code == 200
+        seen += [item["id"] for item in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        params["cursor"] = cursor
+
+    assert len(seen) == 5
+    assert set(seen) == {str(entry_id) for entry_id in created}
+
+
+def test_since_and_until_bound_the_listing(client, db_session):
+    entry_ids = bulk_create_journal_entries(db_session, [(f"Entry {i}", "content") for i in range(3)])
+    start = datetime(2026, 1, 1, 12, 0, 0)
+    for day, entry_id in enumerate(entry_ids):
+        db_session.execute(
+            update(JournalEntry).where(JournalEntry.id == entry_id)
+            .values(created_at=start + timedelta(days=day))
+        )
+    db_session.commit()
+
+    response = client.get("/entries/", params={"since": "2026-01-02T12:00:00",
+                                               "until": "2026-01-03T12:00:00"})
+    assert [item["id"] for item in response.json()] == [str(entry_ids[1])]
+
+    response = client.get("/entries/", params={"since": "2026-01-02T12:00:00"})
+    assert [item["id"] for item in response.json()] == [str(entry_ids[1]), str(entry_ids[2])]
+
+
+def test_rejects_a_malformed_cursor(client):
+    response = client.get("/entries/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
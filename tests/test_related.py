@@ -0,0 +1,52 @@
+"""Tests for the precomputed related entries."""
+
+from sqlalchemy import insert, select
+
+from backend.models import JournalEntryNeighbor
+from backend.services.journal_service import bulk_create_journal_entries
+from backend.services.related import offer_neighbors, refresh_related_entries
+from backend.tasks.worker import process_outbox_batch
+
+
+def neighbor_scores(db_session, source_id):
+    rows = db_session.execute(
+        select(JournalEntryNeighbor.neighbor_id, JournalEntryNeighbor.score)
+        .where(JournalEntryNeighbor.source_id == source_id)
+    ).all()
+    return dict(rows)
+
+
+def test_offered_entries_replace_the_weakest_neighbour_only_if_closer(db_session):
+    target, close, weak, offered, far = bulk_create_journal_entries(
+        db_session, [(f"Entry {i}", "content") for i in range(5)]
+    )
+    db_session.execute(insert(JournalEntryNeighbor), [
+        {"source_id": target, "neighbor_id": close, "score": 0.9},
+        {"source_id": target, "neighbor_id": weak, "score": 0.5},
+    ])
+
+    offer_neighbors(db_session, [
+        {"source_id": offered, "neighbor_id": target, "score": 0.7},
+        {"source_id": far, "neighbor_id": target, "score": 0.1},
+        {"source_id": target, "neighbor_id": far, "score": 0.1},
+    ], limit=2)
+    db_session.commit()
+
+    assert neighbor_scores(db_session, target) == {close: 0.9, offered: 0.7}
+    assert neighbor_scores(db_session, far) == {target: 0.1}
+
+
+def test_related_entries_are_served_from_the_precomputed_table(client, db_session):
+    garden, tomatoes, bread = bulk_create_journal_entries(db_session, [
+        ("Garden", "planted tomatoes and basil in the garden"),
+        ("Tomatoes", "the garden tomatoes and basil are ripe"),
+        ("Bread", "baked sourdough bread"),
+    ])
+    process_outbox_batch(db_session)
+
+    assert refresh_related_entries(db_session, limit=1) == 3
+    assert refresh_related_entries(db_session, limit=1) == 0
+
+    response = client.get(f"/entries/{garden}/related", params={"fields": "id,title"})
+    assert response.status_code == 200
+    assert [item["entry"] for item in response.json()] == [{"id": str(tomatoes), "title": "Tomatoes"}]
@@ -0,0 +1,64 @@
+"""Tests for restoring Weaviate snapshots."""
+
+import gzip
+
+import pytest
+
+from backend.services import snapshots
+
+
+@pytest.fixture
+def restored(monkeypatch):
+    """Capture the objects a restore sends to Weaviate, and the snapshot files it opens."""
+    sent, opened = [], []
+    gzip_open = gzip.open
+
+    def import_objects(batch):
+        sent.extend(batch)
+        return [{"id": obj["id"], "result": {}} for obj in batch]
+
+    def open_snapshot(*args, **kwargs):
+        opened.append(gzip_open(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(snapshots.WeaviateClient, "import_objects", import_objects)
+    monkeypatch.setattr(snapshots, "journal_entry_count", lambda: 1)
+    monkeypatch.setattr(snapshots.gzip, "open", open_snapshot)
+    return sent, opened
+
+
+def write_snapshot(path, records, footer=True):
+    with open(path, "wb") as out:
+        snapshots.write_chunk(out, [{"format": snapshots.FORMAT, "version": snapshots.VERSION}])
+        snapshots.write_chunk(out, records)
+        if footer:
+            snapshots.write_chunk(out, [{"end": True, "objects": len(records), "entries": 1}])
+
+
+RECORDS = [
+    {"id": "a", "properties": {"entry_id": "a", "chunk_index": 0}, "vector": snapshots.encode_vector([1.0, 0.5])},
+    {"id": "b", "properties": {"entry_id": "a", "chunk_index": 1}, "vector": snapshots.encode_vector([0.0, 1.0])},
+]
+
+
+def test_restore_sends_objects_with_their_vectors_and_closes_the_file(tmp_path, restored):
+    sent, opened = restored
+    path = tmp_path / "weaviate.snap"
+    write_snapshot(path, RECORDS)
+
+    counts = snapshots.restore_snapshot(str(path), batch_size=1, concurrency=2)
+
+    assert counts == {"objects": 2, "failed": 0, "entries": 1, "journal_entries": 1}
+    assert sorted((obj["id"], obj["vector"]) for obj in sent) == [("a", [1.0, 0.5]), ("b", [0.0, 1.0])]
+    assert opened and all(snapshot.closed for snapshot in opened)
+
+
+def test_restore_rejects_a_truncated_snapshot_and_closes_the_file(tmp_path, restored):
+    _, opened = restored
+    path = tmp_path / "weaviate.snap"
+    write_snapshot(path, RECORDS, footer=False)
+
+    with pytest.raises(ValueError, match="truncated"):
+        snapshots.restore_snapshot(str(path))
+
+    assert opened and all(snapshot.closed for snapshot in opened)
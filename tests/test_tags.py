@@ -0,0 +1,27 @@
+"""Tests for tag-filtered listings."""
+
+from backend.services.journal_service import bulk_create_journal_entries
+from backend.services.tagging import store_tags
+
+
+def tagged_ids(client, tag):
+    response = client.get("/entries/", params={"tag": tag})
+    return {item["id"] for item in response.json()}, response.headers["ETag"]
+
+
+def test_retagging_changes_the_tagged_listing_etag(client, db_session):
+    a, b, c = bulk_create_journal_entries(db_session, [(f"Entry {i}", "content") for i in range(3)])
+    store_tags(db_session, {a: ["x"]})
+    store_tags(db_session, {c: ["x"]})
+    db_session.commit()
+    ids, etag = tagged_ids(client, "x")
+    assert ids == {str(a), str(c)}
+
+    # The newest link is removed and another one added, so the count of links stays the same.
+    store_tags(db_session, {b: ["x"], c: []})
+    db_session.commit()
+
+    response = client.get("/entries/", params={"tag": "x"}, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert {item["id"] for item in response.json()} == {str(a), str(b)}
+    assert response.headers["ETag"] != etag
@@ -0,0 +1,87 @@
+"""Tests for the local vector store."""
+
+import asyncio
+import threading
+import uuid
+
+from backend.services.embeddings import get_embedding_pipeline
+from backend.services.vector_store import LocalVectorStore
+
+
+class RecordingEmbedder:
+    """Embedder recording the threads it embeds queries on."""
+
+    def __init__(self):
+        self.pipeline = get_embedding_pipeline()
+        self.dim = self.pipeline.dim
+        self.threads = []
+
+    def embed(self, text):
+        self.threads.append(threading.get_ident())
+        return self.pipeline.embed(text)
+
+    def embed_many(self, texts):
+        return self.pipeline.embed_many(texts)
+
+
+def test_search_finds_the_closest_entry_and_filters_by_tag(tmp_path):
+    store = LocalVectorStore(str(tmp_path), RecordingEmbedder())
+    gardening, cooking = uuid.uuid4(), uuid.uuid4()
+    store.upsert([(gardening, "planted tomatoes in the garden"), (cooking, "baked bread for dinner")],
+                 tags={str(gardening): ["garden"], str(cooking): ["food"]})
+
+    assert store.search("tomatoes garden", limit=1)[0]["id"] == str(gardening)
+    assert [hit["id"] for hit in store.search("tomatoes garden", tags=["food"])] == [str(cooking)]
+
+
+def test_asearch_runs_off_the_event_loop(tmp_path):
+    embedder = RecordingEmbedder()
+    store = LocalVectorStore(str(tmp_path), embedder)
+    entry_id = uuid.uuid4()
+    store.upsert([(entry_id, "planted tomatoes in the garden")])
+
+    async def search():
+        return threading.get_ident(), await store.asearch("tomatoes")
+
+    loop_thread, hits = asyncio.run(search())
+
+    assert hits[0]["id"] == str(entry_id)
+    assert embedder.threads and loop_thread not in embedder.threads
+
+
+def test_concurrent_writers_keep_vectors_and_ids_aligned(tmp_path):
+    embedder = RecordingEmbedder()
+    stores = [LocalVectorStore(str(tmp_path), embedder) for _ in range(4)]
+    contents = {}
+    barrier = threading.Barrier(len(stores))
+
+    def write(store):
+        barrier.wait()
+        for _ in range(25):
+            entry_id = uuid.uuid4()
+            contents[str(entry_id)] = f"note {entry_id} about the garden"
+            store.upsert([(entry_id, contents[str(entry_id)])])
+
+    threads = [threading.Thread(target=write, args=(store,)) for store in stores]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    reader = LocalVectorStore(str(tmp_path), embedder)
+    assert sorted(reader._ids) == sorted(contents)
+    for row, entry_id in enumerate(reader._ids):
+        assert (reader._vectors[row] == embedder.embed_many([contents[entry_id]])[0]).all()
+
+
+def test_reindexing_does_not_grow_the_tags_file(tmp_path):
+    store = LocalVectorStore(str(tmp_path), RecordingEmbedder())
+    entries = [(uuid.uuid4(), f"entry {index} about the garden") for index in range(5)]
+    for _ in range(10):
+        store.upsert(entries, tags={str(entry_id): ["garden"] for entry_id, _ in entries})
+    store.upsert(entries[:1], tags={str(entries[0][0]): ["food"]})
+
+    with open(tmp_path / LocalVectorStore.TAGS_FILE, encoding="utf-8") as tags_file:
+        assert len(tags_file.readlines()) <= 2 * len(entries)
+    reader = LocalVectorStore(str(tmp_path), RecordingEmbedder())
+    assert [hit["id"] for hit in reader.search("garden", tags=["food"])] == [str(entries[0][0])]
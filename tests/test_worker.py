@@ -0,0 +1,77 @@
+"""Tests for the indexing outbox worker: claims, retries and dead letters."""
+
+import pytest
+from sqlalchemy import func, select
+
+from backend.models import IndexingDeadLetter, IndexingOutbox, JournalEntry
+from backend.services.journal_service import bulk_create_journal_entries
+from backend.services.vector_store import get_vector_store
+from backend.tasks import worker
+from backend.tasks.worker import process_outbox_batch
+
+
+class IndexingFailed(Exception):
+    def __init__(self, retryable=True):
+        super().__init__("vector store down")
+        self.retryable = retryable
+
+
+@pytest.fixture
+def failing_store(monkeypatch):
+    """Make the vector store reject every upsert with the given retryability."""
+    def fail(retryable=True):
+        def upsert(entries, tags=None):
+            raise IndexingFailed(retryable)
+        monkeypatch.setattr(get_vector_store(), "upsert", upsert)
+    return fail
+
+
+def outbox(db_session):
+    db_session.expire_all()
+    return db_session.execute(select(IndexingOutbox)).scalars().all()
+
+
+def test_indexes_claimed_entries_and_deletes_their_rows(db_session):
+    entry_ids = bulk_create_journal_entries(db_session, [("Garden", "planted tomatoes"), ("Bread", "baked bread")])
+
+    assert process_outbox_batch(db_session) == 2
+
+    assert outbox(db_session) == []
+    entries = db_session.execute(select(JournalEntry)).scalars().all()
+    assert all(entry.indexed_hash == entry.content_hash for entry in entries)
+    assert get_vector_store().search("tomatoes", limit=1)[0]["id"] == str(entry_ids[0])
+
+
+def test_failed_rows_are_retried_later(db_session, failing_store, monkeypatch):
+    monkeypatch.setattr(worker, "backoff_delay", lambda attempt, cap: 60.0)
+    bulk_create_journal_entries(db_session, [("Garden", "planted tomatoes")])
+    failing_store()
+
+    assert process_outbox_batch(db_session, max_attempts=3) == 1
+
+    [job] = outbox(db_session)
+    assert job.attempts == 1 and job.last_error == "vector store down"
+    now = db_session.execute(select(func.now())).scalar()
+    assert job.available_at > now
+    assert process_outbox_batch(db_session, max_attempts=3) == 0
+
+
+def test_rows_out_of_attempts_are_dead_lettered(db_session, failing_store):
+    [entry_id] = bulk_create_journal_entries(db_session, [("Garden", "planted tomatoes")])
+    failing_store()
+
+    process_outbox_batch(db_session, max_attempts=1)
+
+    assert outbox(db_session) == []
+    [letter] = db_session.execute(select(IndexingDeadLetter)).scalars().all()
+    assert (letter.entry_id, letter.attempts, letter.last_error) == (entry_id, 1, "vector store down")
+
+
+def test_permanent_failures_are_dead_lettered_at_once(db_session, failing_store):
+    bulk_create_journal_entries(db_session, [("Garden", "planted tomatoes")])
+    failing_store(retryable=False)
+
+    process_outbox_batch(db_session, max_attempts=5)
+
+    assert outbox(db_session) == []
+    assert db_session.execute(select(IndexingDeadLetter.attempts)).scalars().all() == [1]